@@ -6,9 +6,11 @@ from datetime import datetime
 
 try:
     import argparse
+    import concurrent.futures
     import json
     import shutil
     import tempfile
+    import threading
     import zipfile
 except (ImportError, AssertionError):
     exit()
@@ -16,24 +18,124 @@ except (ImportError, AssertionError):
 
 ACTION = "Build Read Text Extension"
 PACKAGE = "read_text"
+# Read files to check in blocks of this size.
+CHECKSUM_BLOCK_SIZE = 1024 * 1024
+# Remember the checksums of files at least this large, like `.onnx` models.
+CHECKSUM_CACHE_MIN_SIZE = 1024 * 1024
+CHECKSUM_CACHE_ENTRIES = 512
+_CHECKSUMS = None
+_CHECKSUMS_LOCK = threading.Lock()
+
+
+def _md5_of_file(file_path: str = "") -> str:
+    """Hash `file_path` in large blocks, reusing one buffer."""
+    md5 = hashlib.md5()
+    buffer = bytearray(CHECKSUM_BLOCK_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as file:
+        while True:
+            size = file.readinto(buffer)
+            if not size:
+                break
+            md5.update(view[:size])
+    return md5.hexdigest()
+
+
+def _checksum_cache_file() -> str:
+    """Return the path of the file that remembers checksums, or `""`."""
+    try:
+        import readtexttools
+
+        cache_dir = readtexttools.user_cache_dir("checksums")
+    except ImportError:
+        return ""
+    if not cache_dir:
+        return ""
+    return os.path.join(cache_dir, "md5.json")
+
+
+def _file_stamp(file_path: str = "") -> list:
+    """Return the device, inode, size and modification time of the file.
+    If any of them change, the file needs a new checksum."""
+    stat = os.stat(file_path)
+    return [stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+def _read_checksums() -> dict:
+    """Return the remembered checksums, reading them on first use."""
+    global _CHECKSUMS
+    if _CHECKSUMS is None:
+        _CHECKSUMS = {}
+        cache_file = _checksum_cache_file()
+        if cache_file and os.path.isfile(cache_file):
+            try:
+                with open(cache_file, "r", encoding="utf-8") as file:
+                    _CHECKSUMS = dict(json.load(file))
+            except (OSError, ValueError, TypeError):
+                _CHECKSUMS = {}
+    return _CHECKSUMS
+
+
+def _remember_checksum(real_path: str = "", stamp=None, digest: str = "") -> None:
+    """Save `digest` for the file, keeping the newest entries."""
+    cache_file = _checksum_cache_file()
+    with _CHECKSUMS_LOCK:
+        checksums = _read_checksums()
+        checksums.pop(real_path, None)
+        checksums[real_path] = stamp + [digest]
+        while len(checksums) > CHECKSUM_CACHE_ENTRIES:
+            del checksums[next(iter(checksums))]
+        if not cache_file:
+            return
+        try:
+            handle, temp = tempfile.mkstemp(
+                prefix=".part-", dir=os.path.dirname(cache_file)
+            )
+            with os.fdopen(handle, "w", encoding="utf-8") as file:
+                json.dump(checksums, file)
+            os.replace(temp, cache_file)
+        except (OSError, ValueError):
+            pass
 
 
 def calculate_md5(file_path: str = "") -> str:
     """Return the hexadecimal MD5 hash of `file_path`. You can verify
     downloads are complete and correct by comparing the stated md5
-    checksum to this function's output"""
+    checksum to this function's output.
+
+    The checksums of large files are remembered until the file changes, so
+    checking an unchanged model again does not read it."""
     if not os.path.isfile(file_path):
         return ""
     try:
-        with open(file_path, "rb") as file:
-            md5 = hashlib.md5()
-            for chunk in iter(lambda: file.read(4096), b""):
-                md5.update(chunk)
-            return md5.hexdigest()
+        real_path = os.path.realpath(file_path)
+        stamp = _file_stamp(real_path)
+        if stamp[2] < CHECKSUM_CACHE_MIN_SIZE:
+            return _md5_of_file(real_path)
+        with _CHECKSUMS_LOCK:
+            known = _read_checksums().get(real_path)
+        if known and known[:4] == stamp:
+            return known[4]
+        digest = _md5_of_file(real_path)
+        _remember_checksum(real_path, stamp, digest)
+        return digest
     except Exception:
         return ""
 
 
+def calculate_md5s(file_paths=None, workers: int = 0) -> dict:
+    """Return a dictionary of the MD5 hash of each file in `file_paths`.
+    Files without a remembered checksum are read at the same time by up
+    to `workers` threads (`hashlib` releases the GIL while hashing)."""
+    file_paths = list(dict.fromkeys(file_paths or []))
+    if not file_paths:
+        return {}
+    if workers < 1:
+        workers = min(len(file_paths), os.cpu_count() or 2, 8)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(file_paths, executor.map(calculate_md5, file_paths)))
+
+
 def zip_directory(
     folder_path: str = "~/project",
     zip_name: str = "~/project.zip",
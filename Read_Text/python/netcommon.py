@@ -2,9 +2,14 @@
 # -*- coding: UTF-8-*-
 """Common tools for network and neural speech synthesis clients"""
 
+import atexit
+import codecs
+import hashlib
 import io
+import json
 import math
 import os
+import tempfile
 import time
 import wave
 
@@ -27,7 +32,19 @@ try:
     import socket
 except ImportError:
     pass
+
+try:
+    import concurrent.futures
+    import http.client
+    import threading
+    import urllib.error
+    import urllib.parse
+
+    HTTP_CLIENT_OK = True
+except (ImportError, AssertionError):
+    HTTP_CLIENT_OK = False
 import sys
+import netsplit
 import readtexttools
 
 if os.name != "nt":
@@ -66,11 +83,7 @@ def which(app_name):  # -> str
     program is within one of the directories identified in the system `PATH`
     collection, otherwise returns `""`."""
     try:
-        retstr = shutil.which(app_name)
-        if retstr:
-            return str(retstr)
-        return ""
-
+        return readtexttools.TOOLS.which(app_name)
     except NameError:
         try:
             retstr = find_executable(app_name)
@@ -368,6 +381,57 @@ def get_wav_duration(path):  # -> float
         return 0.0
 
 
+def join_wav_files(wav_paths=None, out_path=""):  # -> bool
+    """
+    Join the audio frames of several WAV files in order into one WAV file.
+
+    Parameters
+    ----------
+    wav_paths : list[str]
+        Paths to `.wav` files that share the same number of channels,
+        sample width and sample rate.
+    out_path : str
+        Path of the WAV file to write.
+
+    Returns
+    -------
+    bool
+        `True` if `out_path` was written, otherwise `False` (for example,
+        if a file is missing or uses a different audio format).
+    """
+    if not wav_paths or not out_path:
+        return False
+    params = None
+    try:
+        with wave.open(out_path, "wb") as w_out:
+            for wav_path in wav_paths:
+                with wave.open(wav_path, "rb") as w_in:
+                    test_params = (
+                        w_in.getnchannels(),
+                        w_in.getsampwidth(),
+                        w_in.getframerate(),
+                    )
+                    if params is None:
+                        params = test_params
+                        w_out.setnchannels(params[0])
+                        w_out.setsampwidth(params[1])
+                        w_out.setframerate(params[2])
+                    elif test_params != params:
+                        raise wave.Error(
+                            "`{0}` does not match the audio format of `{1}`".format(
+                                os.path.basename(wav_path),
+                                os.path.basename(wav_paths[0]),
+                            )
+                        )
+                    w_out.writeframes(w_in.readframes(w_in.getnframes()))
+    except (EOFError, OSError, wave.Error) as e:
+        print("[!] Could not join WAV files: ", e)
+        if os.path.isfile(out_path):
+            os.remove(out_path)
+        return False
+    return True
+
+
 def play_with_winsound(_media_work="", lock_path=""):  # -> bool
     """    Play a WAV file asynchronously on Windows, with optional early stop control.
 
@@ -455,6 +519,992 @@ def is_voice_id_formatted_for_speechd(voice_id=""):  # -> bool
         return all(char in allowed for char in voice_id)
 
 
+class HttpConnectionPool(object):
+    """Keep persistent HTTP/1.1 connections to speech servers so that a
+    document with hundreds of chunks does not open and close a new TCP
+    connection for every chunk.
+
+    Idle connections are kept per `(scheme, host, port)`. A thread takes
+    an idle connection or opens a new one, so several threads can talk to
+    the same server at once. If a reused connection turns out to be stale
+    (the server closed it while it was idle), the pool reconnects and
+    sends the request again once.
+
+    Each request sets its own timeout on its own socket, so the pool does
+    not change the process-wide `socket.setdefaulttimeout` value.
+
+    Errors use the `urllib` exception types that the engine adapters
+    already handle: `urllib.error.HTTPError` for an HTTP status of 400 or
+    more and `urllib.error.URLError` if the server cannot be reached. A
+    timeout raises `TimeoutError` (`socket.timeout`)."""
+
+    def __init__(self, default_timeout=4, max_idle=4):  # -> None
+        self.default_timeout = default_timeout
+        self.max_idle = max_idle
+        self.idle = {}
+        self.lock = threading.Lock()
+        self.stale_errors = (
+            http.client.RemoteDisconnected,
+            http.client.BadStatusLine,
+            http.client.CannotSendRequest,
+            http.client.ResponseNotReady,
+            BrokenPipeError,
+            ConnectionResetError,
+            ConnectionAbortedError,
+        )
+
+    def _checkout(self, key, timeout):  # -> tuple[http.client.HTTPConnection, bool]
+        """Return `(connection, reused)` for `key`."""
+        with self.lock:
+            _list = self.idle.get(key)
+            if _list:
+                conn = _list.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _checkin(self, key, conn):  # -> None
+        """Keep `conn` for the next request to the same server."""
+        with self.lock:
+            _list = self.idle.setdefault(key, [])
+            if len(_list) < self.max_idle:
+                _list.append(conn)
+                return
+        conn.close()
+
+    def close(self):  # -> None
+        """Close every idle connection."""
+        with self.lock:
+            for _list in self.idle.values():
+                for conn in _list:
+                    conn.close()
+            self.idle = {}
+
+    def request(
+        self,
+        url="",
+        data=None,
+        headers=None,
+        method=None,
+        timeout=None,
+        _redirects=3,
+        info=None,
+    ):  # -> bytes
+        """Send a request to `url` and return the response body. Use `GET`
+        if `data` is `None`, otherwise `POST`, unless `method` says
+        otherwise. If `info` is a dictionary, it receives the `status` and
+        the lower case response `headers`."""
+        if timeout is None:
+            timeout = self.default_timeout
+        if method is None:
+            method = "GET" if data is None else "POST"
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        _parts = urllib.parse.urlsplit(url)
+        scheme = _parts.scheme.lower() or "http"
+        if scheme not in ["http", "https"] or not _parts.hostname:
+            raise urllib.error.URLError("unsupported url: {0}".format(url))
+        port = _parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, _parts.hostname, port)
+        target = _parts.path or "/"
+        if _parts.query:
+            target = "?".join([target, _parts.query])
+        _headers = {"Connection": "keep-alive"}
+        if headers:
+            _headers.update(headers)
+        if data is not None:
+            _headers["Content-Length"] = str(len(data))
+
+        for _attempt in range(2):
+            conn, reused = self._checkout(key, timeout)
+            try:
+                conn.request(method, target, body=data, headers=_headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except self.stale_errors as e:
+                conn.close()
+                if reused and _attempt == 0:
+                    continue
+                raise urllib.error.URLError(e)
+            except socket.timeout:
+                conn.close()
+                raise
+            except OSError as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+            except http.client.HTTPException as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            if resp.status in [301, 302, 303, 307, 308] and _redirects > 0:
+                location = resp.getheader("Location")
+                if location:
+                    if resp.status == 303:
+                        method, data = "GET", None
+                    return self.request(
+                        urllib.parse.urljoin(url, location),
+                        data,
+                        headers,
+                        method,
+                        timeout,
+                        _redirects - 1,
+                        info,
+                    )
+            if info is not None:
+                info["status"] = resp.status
+                info["headers"] = dict(
+                    (_name.lower(), _value) for _name, _value in resp.getheaders()
+                )
+            if resp.status >= 400:
+                raise urllib.error.HTTPError(
+                    url, resp.status, resp.reason, resp.msg, io.BytesIO(body)
+                )
+            return body
+        raise urllib.error.URLError("connection failed: {0}".format(url))
+
+
+if HTTP_CLIENT_OK:
+    HTTP_POOL = HttpConnectionPool()
+else:
+    HTTP_POOL = None
+
+
+class CapabilityCache(object):
+    """Keep the voice and language lists that local speech servers publish
+    (like `/voices` or `/api/voices`) on disk, so a new process can use
+    them without waiting for an HTTP round trip.
+
+    A saved list is used at once if the server port accepts a connection,
+    and a background thread asks the server for it again, using the saved
+    `ETag` or `Last-Modified` value so an unchanged list is not sent again.
+    A SHA-256 fingerprint of the server name and the list tells whether the
+    list changed. A list older than `ttl` seconds is not used until the
+    server sends it again. When a voice is not in a saved list, `recheck`
+    asks the server at once in case the voice was installed since then.
+
+    Set the `READTEXTVOICESTTL` environment variable to the time to live in
+    seconds, or to `0` to always ask the server."""
+
+    def __init__(self, cache_dir="", ttl=None):  # -> None
+        self._cache_dir = cache_dir
+        if ttl is None:
+            try:
+                ttl = float(os.getenv("READTEXTVOICESTTL", "86400"))
+            except ValueError:
+                ttl = 86400.0
+        self.ttl = ttl
+        # Lists used by this process as `(time, body, checked)`, so asking
+        # twice in one reading does not even open a socket. `checked` is
+        # `True` if the body came from the server, not from the disk.
+        self.memory = {}
+        self.memory_seconds = 10
+        # Seconds that the server took to answer each url in this process.
+        self.latency = {}
+        self.refreshing = set()
+        self.lock = threading.Lock() if HTTP_CLIENT_OK else None
+
+    def cache_dir(self):  # -> str
+        """Return the cache directory, creating it on first use."""
+        if not self._cache_dir:
+            self._cache_dir = readtexttools.user_cache_dir("voices")
+        return self._cache_dir
+
+    def enabled(self):  # -> bool
+        """Is the cache turned on and writable?"""
+        return self.ttl > 0 and HTTP_CLIENT_OK and bool(self.cache_dir())
+
+    def path(self, url=""):  # -> str
+        """Return the cache file path for `url`."""
+        _name = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir(), "".join([_name, ".json"]))
+
+    def load(self, url=""):  # -> dict
+        """Return the saved entry for `url`, or `{}`."""
+        try:
+            with codecs.open(self.path(url), mode="r", encoding="utf-8") as _file:
+                _entry = json.load(_file)
+            if _entry.get("url") == url and "body" in _entry:
+                return _entry
+        except (IOError, OSError, ValueError, AttributeError):
+            pass
+        return {}
+
+    def save(self, url="", body=b"", headers=None):  # -> dict
+        """Save `body` with the validators in `headers` and return the entry.
+        The file is replaced in one step."""
+        headers = headers or {}
+        _text = body.decode("utf-8", "surrogateescape")
+        _entry = {
+            "url": url,
+            "fetched": time.time(),
+            "etag": headers.get("etag", ""),
+            "last_modified": headers.get("last-modified", ""),
+            "fingerprint": self.fingerprint(body, headers),
+            "body": _text,
+        }
+        _path = self.path(url)
+        try:
+            _handle, _temp = tempfile.mkstemp(
+                prefix=".part-", dir=os.path.dirname(_path)
+            )
+            with os.fdopen(_handle, "w", encoding="utf-8") as _file:
+                json.dump(_entry, _file)
+            os.replace(_temp, _path)
+        except (IOError, OSError, ValueError):
+            pass
+        return _entry
+
+    def fingerprint(self, body=b"", headers=None):  # -> str
+        """Return a digest of the server name and the response body."""
+        _hash = hashlib.sha256((headers or {}).get("server", "").encode("utf-8"))
+        _hash.update(b"\0")
+        _hash.update(body)
+        return _hash.hexdigest()
+
+    def server_listening(self, url="", timeout=0.5):  # -> bool
+        """Does something accept connections on the host and port of `url`?"""
+        try:
+            _parts = urllib.parse.urlsplit(url)
+            _port = _parts.port or (443 if _parts.scheme == "https" else 80)
+            with socket.create_connection((_parts.hostname, _port), timeout):
+                return True
+        except (OSError, TypeError, ValueError):
+            return False
+
+    def refresh(self, url="", entry=None, timeout=4):  # -> bytes
+        """Ask the server for `url`, save the answer and return the body.
+        Errors are the same as `LocalCommons.http_request`."""
+        _headers = {}
+        if entry and entry.get("etag"):
+            _headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            _headers["If-Modified-Since"] = entry["last_modified"]
+        _info = {}
+        _start = time.perf_counter()
+        _body = HTTP_POOL.request(url, None, _headers, "GET", timeout, info=_info)
+        self.latency[url] = time.perf_counter() - _start
+        if entry and _info.get("status") == 304:
+            _body = entry["body"].encode("utf-8", "surrogateescape")
+            _info["headers"] = dict(
+                [("etag", entry["etag"]), ("last-modified", entry["last_modified"])]
+                + list(_info.get("headers", {}).items())
+            )
+        elif entry and entry.get("fingerprint") == self.fingerprint(
+            _body, _info.get("headers")
+        ):
+            if self.ttl and time.time() - entry.get("fetched", 0) < self.ttl:
+                return _body
+        self.save(url, _body, _info.get("headers"))
+        return _body
+
+    def _refresh_quietly(self, url="", entry=None, timeout=4):  # -> None
+        """Refresh `url` in the background, ignoring errors."""
+        try:
+            self.refresh(url, entry, timeout)
+        except (OSError, TimeoutError, urllib.error.URLError, ValueError):
+            pass
+        finally:
+            with self.lock:
+                self.refreshing.discard(url)
+
+    def refresh_later(self, url="", entry=None, timeout=4):  # -> None
+        """Start a thread that refreshes `url`. The thread is not a daemon,
+        so a short-lived process finishes saving the list before it exits."""
+        with self.lock:
+            if url in self.refreshing:
+                return
+            self.refreshing.add(url)
+        threading.Thread(
+            target=self._refresh_quietly, args=(url, entry, timeout)
+        ).start()
+
+    def get(self, url="", timeout=4):  # -> bytes
+        """Return the body of `url` from the cache if the server is up and
+        refresh the saved copy in the background, otherwise ask the server
+        for it."""
+        if not self.enabled():
+            _start = time.perf_counter()
+            _body = HTTP_POOL.request(url, None, None, "GET", timeout)
+            self.latency[url] = time.perf_counter() - _start
+            return _body
+        _now = time.time()
+        _seen = self.memory.get(url)
+        if _seen and _now - _seen[0] < self.memory_seconds:
+            return _seen[1]
+        _entry = self.load(url)
+        if (
+            _entry
+            and _now - _entry.get("fetched", 0) < self.ttl
+            and self.server_listening(url, min(timeout, 0.5))
+        ):
+            _body = _entry["body"].encode("utf-8", "surrogateescape")
+            self.memory[url] = (_now, _body, False)
+            self.refresh_later(url, _entry, timeout)
+        else:
+            _body = self.refresh(url, _entry, timeout)
+            self.memory[url] = (_now, _body, True)
+        return _body
+
+    def recheck(self, url="", timeout=4):  # -> bytes
+        """Ask the server for `url` at once after a lookup in the saved list
+        found nothing. Return the new body if the list changed, or `b""` if
+        this process already has the list that the server sends. Errors are
+        the same as `LocalCommons.http_request`."""
+        if not self.enabled():
+            return b""
+        _seen = self.memory.get(url)
+        if _seen and _seen[2]:
+            return b""
+        _body = self.refresh(url, self.load(url), timeout)
+        self.memory[url] = (time.time(), _body, True)
+        if _seen and _seen[1] == _body:
+            return b""
+        return _body
+
+
+CAPABILITY_CACHE = CapabilityCache()
+
+
+class ServerBalancer(object):
+    """Send requests to several servers that offer the same voice, choosing
+    the server that should finish soonest.
+
+    For each server, keep a moving average of the time to first response
+    (`latency`) and of the characters synthesized per second (`speed`),
+    and count the requests in progress. A server that fails or times out
+    rests for a while (`backoff` seconds, doubling after each failure)
+    and the request goes to the next server."""
+
+    def __init__(self, urls=None, alpha=0.3, backoff=5.0):  # -> None
+        self.urls = []
+        for _url in urls or []:
+            if _url and _url not in self.urls:
+                self.urls.append(_url)
+        self.alpha = alpha
+        self.backoff = backoff
+        self.lock = threading.Lock()
+        self.stats = {}
+        for _url in self.urls:
+            self.stats[_url] = {
+                "latency": 0.0,
+                "speed": 0.0,
+                "active": 0,
+                "failures": 0,
+                "resting_until": 0.0,
+            }
+
+    def __len__(self):  # -> int
+        return len(self.urls)
+
+    def estimate(self, url="", size=0):  # -> float
+        """Return the seconds that `url` should take to synthesize `size`
+        characters after its requests in progress. An idle server without
+        measurements is estimated at zero so that it gets tried."""
+        _stat = self.stats[url]
+        if _stat["speed"] == 0:
+            return float(_stat["active"])
+        _seconds = _stat["latency"] + size / _stat["speed"]
+        return _seconds * (_stat["active"] + 1)
+
+    def ranked(self, size=0):  # -> list
+        """Return the server urls from the best to the worst choice for a
+        request of `size` characters. Resting servers come last."""
+        _now = time.time()
+        with self.lock:
+            return sorted(
+                self.urls,
+                key=lambda _url: (
+                    self.stats[_url]["resting_until"] > _now,
+                    self.estimate(_url, size),
+                    self.urls.index(_url),
+                ),
+            )
+
+    def record(self, url="", size=0, seconds=0.0, ok=True):  # -> None
+        """Update the estimates for `url` after a request ends."""
+        with self.lock:
+            _stat = self.stats[url]
+            _stat["active"] = max(0, _stat["active"] - 1)
+            if not ok:
+                _stat["failures"] += 1
+                _stat["resting_until"] = time.time() + self.backoff * (
+                    2 ** min(_stat["failures"] - 1, 5)
+                )
+                return
+            _stat["failures"] = 0
+            _stat["resting_until"] = 0.0
+            _seconds = max(seconds, 0.001)
+            _speed = size / _seconds
+            if _stat["speed"] == 0:
+                _stat["latency"] = _seconds
+                _stat["speed"] = _speed
+                return
+            # Split the time into a fixed part and a part that grows with
+            # the text, using the current speed estimate.
+            _latency = max(0.0, _seconds - size / _stat["speed"])
+            _stat["latency"] += self.alpha * (_latency - _stat["latency"])
+            _stat["speed"] += self.alpha * (_speed - _stat["speed"])
+
+    def request(self, size=0, send=None):  # -> Any
+        """Call `send(url)` for the best server for `size` characters and
+        return its result. If it raises an exception, try the next server.
+        If every server fails, raise the last exception."""
+        _error = OSError("No server is available")
+        for _url in self.ranked(size):
+            with self.lock:
+                self.stats[_url]["active"] += 1
+            _start = time.perf_counter()
+            try:
+                _result = send(_url)
+            except (OSError, TimeoutError, urllib.error.URLError) as e:
+                self.record(_url, size, 0.0, False)
+                _error = e
+                continue
+            except Exception:
+                self.record(_url, size, 0.0, False)
+                raise
+            self.record(_url, size, time.perf_counter() - _start, True)
+            return _result
+        raise _error
+
+
+class SegmentedDownloader(object):
+    """Download a large file, like a piper `.onnx` model or a release
+    archive, as several HTTP `Range` segments at the same time.
+
+    + Each segment goes to its own `.partN` file, so an interrupted download
+      resumes each segment where it stopped.
+    + The finished segments are joined in order and hashed while the later
+      segments are still downloading.
+    + The result must match the server size, and the published size and
+      MD5 digest if they are known, before it replaces `file_path`.
+
+    Servers that do not accept `Range` requests get one connection."""
+
+    def __init__(
+        self, segments=4, min_segment=8 * 1024 * 1024, timeout=20, retries=3
+    ):  # -> None
+        self.segments = max(1, segments)
+        self.min_segment = min_segment
+        self.timeout = timeout
+        self.retries = retries
+        self.block_size = 256 * 1024
+        self.quiet = False
+
+    def _open(self, url="", headers=None, redirects=5):  # -> tuple
+        """Send a `GET` request for `url`, following redirects, and return
+        `(connection, response, final_url)`."""
+        for _try in range(redirects + 1):
+            _parts = urllib.parse.urlsplit(url)
+            _path = urllib.parse.urlunsplit(
+                ("", "", _parts.path or "/", _parts.query, "")
+            )
+            if _parts.scheme == "https":
+                _conn = http.client.HTTPSConnection(
+                    _parts.hostname, _parts.port, timeout=self.timeout
+                )
+            elif _parts.scheme == "http":
+                _conn = http.client.HTTPConnection(
+                    _parts.hostname, _parts.port, timeout=self.timeout
+                )
+            else:
+                raise ValueError("Unsupported url: {0}".format(url))
+            _conn.request("GET", _path, headers=headers or {})
+            _resp = _conn.getresponse()
+            if _resp.status in (301, 302, 303, 307, 308):
+                _location = _resp.getheader("Location")
+                _resp.read()
+                _conn.close()
+                if not _location:
+                    break
+                url = urllib.parse.urljoin(url, _location)
+                continue
+            if _resp.status >= 400:
+                _conn.close()
+                raise urllib.error.HTTPError(
+                    url, _resp.status, _resp.reason, _resp.msg, None
+                )
+            return _conn, _resp, url
+        raise urllib.error.URLError("Too many redirects: {0}".format(url))
+
+    def probe(self, url=""):  # -> dict
+        """Return the final `url`, the `size`, the `etag` and whether the
+        server accepts `ranges`."""
+        _conn, _resp, url = self._open(url, {"Range": "bytes=0-0"})
+        try:
+            _info = {"url": url, "size": 0, "etag": _resp.getheader("ETag", "")}
+            _range = _resp.getheader("Content-Range", "")
+            if _resp.status == 206 and "/" in _range:
+                _total = _range.rsplit("/", 1)[1].strip()
+                _info["size"] = int(_total) if _total.isdigit() else 0
+                _info["ranges"] = _info["size"] > 0
+                _resp.read()
+            else:
+                _info["size"] = int(_resp.getheader("Content-Length", "0") or 0)
+                _info["ranges"] = False
+            return _info
+        finally:
+            _conn.close()
+
+    def plan(self, size=0, ranges=True):  # -> list
+        """Return the `[start, end]` byte ranges (end included) to get."""
+        if not ranges or size <= 0:
+            return [[0, size - 1]]
+        _count = max(1, min(self.segments, size // max(1, self.min_segment)))
+        _step = -(-size // _count)
+        return [
+            [_start, min(size, _start + _step) - 1] for _start in range(0, size, _step)
+        ]
+
+    def _fetch_segment(self, url="", part="", start=0, end=-1, ranges=True):
+        """Download bytes `start` to `end` into `part`, continuing after the
+        bytes that `part` already has. Returns `True` if it is complete."""
+        for _try in range(self.retries + 1):
+            _have = os.path.getsize(part) if os.path.isfile(part) else 0
+            if not ranges:
+                _have = 0
+            if end >= 0 and start + _have > end:
+                return True
+            _headers = {}
+            if ranges:
+                _headers["Range"] = "bytes={0}-{1}".format(start + _have, end)
+            try:
+                _conn, _resp, _url = self._open(url, _headers)
+                try:
+                    with open(part, "ab" if _have else "wb") as _file:
+                        while True:
+                            _block = _resp.read(self.block_size)
+                            if not _block:
+                                break
+                            _file.write(_block)
+                finally:
+                    _conn.close()
+                if end < 0 or start + os.path.getsize(part) > end:
+                    return True
+            except (OSError, http.client.HTTPException, urllib.error.URLError) as e:
+                if _try >= self.retries:
+                    print("Download error ({0}): {1}".format(os.path.basename(part), e))
+                    return False
+                time.sleep(min(8, 2 ** _try))
+        return os.path.isfile(part) and start + os.path.getsize(part) > end
+
+    def _remove(self, paths=None):  # -> None
+        for _path in paths or []:
+            if os.path.isfile(_path):
+                os.remove(_path)
+
+    def _forget(self, file_path=""):  # -> None
+        """Remove the saved segment plan for `file_path` if no segment has
+        any bytes to resume."""
+        _prefix = "{0}.part".format(os.path.basename(file_path))
+        try:
+            for _name in os.listdir(os.path.dirname(os.path.abspath(file_path))):
+                if _name.startswith(_prefix) and _name[len(_prefix) :].isdigit():
+                    return
+        except OSError:
+            return
+        self._remove([file_path + ".parts.json"])
+
+    def download(self, url="", file_path="", expected_size=0, expected_md5=""):
+        """Download `url` to `file_path`. Returns `True` if the file is
+        complete and matches `expected_size` and `expected_md5` when they
+        are given. A failed check removes the download."""
+        if not HTTP_CLIENT_OK or not url or not file_path:
+            return False
+        try:
+            _info = self.probe(url)
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            self._forget(file_path)
+            if isinstance(e, http.client.HTTPException):
+                raise OSError("Bad response from {0}: {1!r}".format(url, e))
+            raise
+        _size = _info["size"] or expected_size
+        if expected_size and _info["size"] and expected_size != _info["size"]:
+            print("Download error: the server size does not match the catalogue.")
+            self._forget(file_path)
+            return False
+        try:
+            _stat = os.statvfs(os.path.dirname(os.path.abspath(file_path)))
+            if _stat.f_frsize * _stat.f_bavail < _size:
+                raise OSError("Insufficient disk space.")
+        except AttributeError:
+            pass
+        _ranges = _info["ranges"]
+        _plan = self.plan(_size, _ranges)
+        _state_file = file_path + ".parts.json"
+        _state = {"url": url, "size": _size, "etag": _info["etag"], "plan": _plan}
+        _parts = [
+            "{0}.part{1}".format(file_path, _index) for _index in range(len(_plan))
+        ]
+        try:
+            with open(_state_file, "r", encoding="utf-8") as _file:
+                if json.load(_file) != _state:
+                    raise ValueError("The remote file changed.")
+        except (OSError, ValueError):
+            # Start again.
+            self._remove(_parts)
+            with open(_state_file, "w", encoding="utf-8") as _file:
+                json.dump(_state, _file)
+        _temp = file_path + ".download"
+        _md5 = hashlib.md5()
+        _done = 0
+        _ok = True
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(_plan))
+        try:
+            _futures = [
+                executor.submit(
+                    self._fetch_segment, _info["url"], _part, _start, _end, _ranges
+                )
+                for _part, (_start, _end) in zip(_parts, _plan)
+            ]
+            with open(_temp, "wb") as _out:
+                for _future, _part in zip(_futures, _parts):
+                    if not _future.result():
+                        _ok = False
+                        break
+                    with open(_part, "rb") as _file:
+                        while True:
+                            _block = _file.read(self.block_size)
+                            if not _block:
+                                break
+                            _md5.update(_block)
+                            _out.write(_block)
+                            _done += len(_block)
+                    if not self.quiet:
+                        print(
+                            "Downloaded: {0:.2f} MB / {1:.2f} MB".format(
+                                _done / 1024**2, _size / 1024**2
+                            )
+                        )
+        finally:
+            executor.shutdown(wait=True)
+        if not _ok:
+            # Keep the parts to resume later.
+            self._remove([_temp])
+            self._forget(file_path)
+            return False
+        _problem = ""
+        if _size and _done != _size:
+            _problem = "size {0} != {1}".format(_done, _size)
+        elif expected_md5 and _md5.hexdigest() != expected_md5.lower():
+            _problem = "md5 {0} != {1}".format(_md5.hexdigest(), expected_md5)
+        self._remove(_parts + [_state_file])
+        if _problem:
+            print(
+                "Download error ({0}): {1}".format(
+                    os.path.basename(file_path), _problem
+                )
+            )
+            self._remove([_temp])
+            return False
+        os.replace(_temp, file_path)
+        if not self.quiet:
+            print("Download complete: {0}".format(file_path))
+        return True
+
+
+class AudioCache(object):
+    """Keep synthesized speech on disk so that reading the same chunk of
+    text with the same voice again does not ask the speech engine for it
+    again.
+
+    Each file is named with a SHA-256 digest of the engine, server url,
+    voice, rate and the exact text after any lexicon substitutions, so an
+    edited lexicon produces new entries. Files are written to a temporary
+    name and renamed, so another process never reads half a file. When
+    the cache grows past `max_bytes`, the least recently used files are
+    removed.
+
+    Set the `READTEXTCACHEMB` environment variable to the size of the
+    cache in megabytes, or to `0` to turn the cache off."""
+
+    def __init__(self, cache_dir="", max_bytes=None):  # -> None
+        self._cache_dir = cache_dir
+        if max_bytes is None:
+            try:
+                max_bytes = int(float(os.getenv("READTEXTCACHEMB", "256")) * 2**20)
+            except ValueError:
+                max_bytes = 256 * 2**20
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.ext = ".wav"
+        # `evict` walks the whole cache, so only run it on the first store
+        # and then after every `evict_every` stores.
+        self.evict_every = 32
+        self._stores = 0
+
+    def cache_dir(self):  # -> str
+        """Return the cache directory, creating it on first use."""
+        if not self._cache_dir:
+            self._cache_dir = readtexttools.user_cache_dir("audio")
+        return self._cache_dir
+
+    def enabled(self):  # -> bool
+        """Is the cache turned on and writable?"""
+        return self.max_bytes > 0 and bool(self.cache_dir())
+
+    def key(self, *key_parts):  # -> str
+        """Return a hex digest for `key_parts`, for example
+        `key("piper", url, "en_GB-jenny_dioco-medium#0", 1.0, text)`."""
+        _hash = hashlib.sha256()
+        for _part in key_parts:
+            _hash.update(str(_part).encode("utf-8", "surrogatepass"))
+            _hash.update(b"\0")
+        return _hash.hexdigest()
+
+    def path(self, key=""):  # -> str
+        """Return the cache file path for `key`."""
+        return os.path.join(self.cache_dir(), key[:2], "".join([key, self.ext]))
+
+    def _copy_atomic(self, src="", dst=""):  # -> bool
+        """Copy `src` to a temporary file beside `dst`, then rename it."""
+        _dir = os.path.dirname(dst) or "."
+        if not os.path.isdir(_dir):
+            os.makedirs(_dir, exist_ok=True)
+        _handle, _temp = tempfile.mkstemp(prefix=".part-", dir=_dir)
+        try:
+            with os.fdopen(_handle, "wb") as _out, open(src, "rb") as _in:
+                shutil.copyfileobj(_in, _out, 2**20)
+            os.replace(_temp, dst)
+            return True
+        except (IOError, OSError):
+            if os.path.isfile(_temp):
+                os.remove(_temp)
+            return False
+
+    def fetch(self, key="", media_work=""):  # -> bool
+        """If the cache has audio for `key`, copy it to `media_work` and
+        return `True`, otherwise return `False`."""
+        if not key or not self.enabled():
+            return False
+        _path = self.path(key)
+        try:
+            if os.path.isfile(_path) and self._copy_atomic(_path, media_work):
+                # Update the time stamp that `evict` uses to find the least
+                # recently used files.
+                os.utime(_path, None)
+                self.hits += 1
+                return True
+        except (IOError, OSError):
+            pass
+        self.misses += 1
+        return False
+
+    def store(self, key="", media_work=""):  # -> bool
+        """Save a copy of the audio file `media_work` for `key`."""
+        if not key or not self.enabled():
+            return False
+        if not os.path.isfile(media_work):
+            return False
+        _size = os.path.getsize(media_work)
+        if _size == 0 or _size > self.max_bytes:
+            return False
+        if not self._copy_atomic(media_work, self.path(key)):
+            return False
+        if self._stores % self.evict_every == 0:
+            self.evict()
+        self._stores += 1
+        return True
+
+    def evict(self):  # -> int
+        """Remove the least recently used files until the cache fits in
+        `max_bytes`. Returns the number of files removed."""
+        _entries = []
+        _total = 0
+        _cache_dir = self.cache_dir()
+        if not _cache_dir:
+            return 0
+        for _root, _dirs, _files in os.walk(_cache_dir):
+            for _name in _files:
+                if not _name.endswith(self.ext):
+                    continue
+                _path = os.path.join(_root, _name)
+                try:
+                    _stat = os.stat(_path)
+                except OSError:
+                    continue
+                _entries.append((_stat.st_mtime, _stat.st_size, _path))
+                _total += _stat.st_size
+        _removed = 0
+        if _total <= self.max_bytes:
+            return _removed
+        for _mtime, _size, _path in sorted(_entries):
+            try:
+                os.remove(_path)
+            except OSError:
+                # Another process is reading or already removed it.
+                continue
+            _removed += 1
+            _total -= _size
+            if _total <= self.max_bytes:
+                break
+        return _removed
+
+    def report(self):  # -> str
+        """Return a one line summary of cache hits and misses."""
+        return "[>] Audio cache: {0} hits, {1} misses".format(self.hits, self.misses)
+
+
+AUDIO_CACHE = AudioCache()
+
+# One player process for every chunk that the network engines speak. See
+# `playback_sink()`.
+PLAYBACK_SINK = None
+
+
+def playback_sink():  # -> readtexttools.PcmPlaybackSink
+    """Return the shared player for network engine audio. It is made on
+    first use, so importing the module does not look for a player."""
+    global PLAYBACK_SINK
+    if PLAYBACK_SINK is None:
+        PLAYBACK_SINK = readtexttools.PcmPlaybackSink()
+        atexit.register(PLAYBACK_SINK.close)
+    return PLAYBACK_SINK
+
+
+# Characters that get a short pause (`;`) in speech, and their replacements.
+PAUSE_MARKS = {
+    "\n": ";\n",
+    "\r": ";\r",
+    "(": " ( ",
+    "\u201c": "\u201c;",
+    "\u2026": "\u2026;",
+    "\u2014": "\u2014;",
+    "\u2013": "\u2013;",
+    "\u00a0": " ",
+}
+
+
+class TextPipeline(object):
+    """Prepare text for a speech engine with a list of `steps` that run in
+    order. Each step gives the same result as the function it replaces, but
+    the tables it needs are set up once for each language, and steps skip
+    the work when the text has nothing for them to change.
+
+    The steps are short-circuited, not fused into one pass. `xml` needs a
+    parser, `mojibake` decodes bytes again for Swahili, `pause` looks at the
+    character before a line end, and `lexicon` is a regular expression, so
+    one character table cannot give the same result.
+
+    + `xml`: `readtexttools.strip_xml`
+    + `mojibake`: `readtexttools.strip_mojibake`
+    + `pause`: `text.translate(LocalCommons().add_pause).replace(".;", ".")`
+      when the text includes a pause mark
+    + `lexicon`: `readtexttools.local_pronunciation`
+    + `caps`: `Mimic3Class.fix_all_caps`
+    + `edges`: `netsplit.normalize_edge_punct`
+
+    Use `text_pipeline()` to share one pipeline for each set of settings."""
+
+    MOJIBAKE_STRIP = "\n\t ;\\{\\}()[]"
+    CAPS_CHECKLIST = " AEIOUYÀÂÄÁÉÈÊËÍÎÏÓÔÖÚÛÜŸÅÆØŮĄĘ"
+
+    def __init__(
+        self, iso_lang="en-US", steps=None, lexicon_dir="default", lexicon_env=""
+    ):  # -> None
+        self.iso_lang = iso_lang
+        self.lexicon_dir = lexicon_dir
+        self.lexicon_env = lexicon_env
+        try:
+            _concise_lang = iso_lang[:2].lower()
+        except (AttributeError, TypeError):
+            _concise_lang = "en"
+        # `strip_mojibake` only changes valid UTF-8 text for Swahili.
+        self.mojibake_coding = "latin-1" if _concise_lang == "sw" else "utf-8"
+        # Replace the marks one at a time; no replacement adds another mark.
+        self.pause_marks = list(PAUSE_MARKS.items())
+        self.caps_checklist = frozenset(self.CAPS_CHECKLIST)
+        _actions = {
+            "xml": self.strip_xml,
+            "mojibake": self.strip_mojibake,
+            "pause": self.add_pause,
+            "lexicon": self.pronounce,
+            "caps": self.fix_all_caps,
+            "edges": netsplit.normalize_edge_punct,
+        }
+        self.steps = list(steps or ["xml", "mojibake", "pause", "lexicon"])
+        for _step in self.steps:
+            if _step not in _actions:
+                raise ValueError("Unknown text pipeline step `{0}`".format(_step))
+        self.actions = [_actions[_step] for _step in self.steps]
+
+    def strip_xml(self, _text=""):  # -> str
+        """Remove XML markup. Text without tags or entities stays the same."""
+        if "<" in _text or "&" in _text:
+            return readtexttools.strip_xml(_text)
+        return _text
+
+    def strip_mojibake(self, _text=""):  # -> str
+        """Remove characters that the speech engine cannot pronounce."""
+        if not _text:
+            return ""
+        if self.mojibake_coding == "utf-8":
+            try:
+                _text.encode("utf-8")
+                return _text.strip(self.MOJIBAKE_STRIP)
+            except UnicodeEncodeError:
+                pass
+        return (
+            _text.encode(self.mojibake_coding, "ignore")
+            .decode("utf-8", "ignore")
+            .strip(self.MOJIBAKE_STRIP)
+        )
+
+    def add_pause(self, _text=""):  # -> str
+        """Add a short pause after line endings, dashes and other marks."""
+        _found = False
+        for _mark, _replacement in self.pause_marks:
+            if _mark in _text:
+                _text = _text.replace(_mark, _replacement)
+                _found = True
+        if _found:
+            return _text.replace(".;", ".")
+        return _text
+
+    def pronounce(self, _text=""):  # -> str
+        """Apply the local pronunciation lexicon."""
+        return readtexttools.local_pronunciation(
+            self.iso_lang, _text, self.lexicon_dir, self.lexicon_env, False
+        )[0]
+
+    def fix_all_caps(self, _text=""):  # -> str
+        """Change a word in capitals that includes a vowel to a capitalized
+        word, so that the speech engine does not spell it out."""
+        if _text.isupper() and not self.caps_checklist.isdisjoint(_text):
+            return _text.lower().capitalize()
+        return _text
+
+    def run(self, _text=""):  # -> str
+        """Return `_text` after every step."""
+        for _action in self.actions:
+            _text = _action(_text)
+        return _text
+
+
+_TEXT_PIPELINES = {}
+
+
+def text_pipeline(
+    iso_lang="en-US", steps=None, lexicon_dir="default", lexicon_env=""
+):  # -> TextPipeline
+    """Return a shared `TextPipeline` for the language and steps."""
+    _key = (iso_lang, tuple(steps or []), lexicon_dir, lexicon_env)
+    _pipeline = _TEXT_PIPELINES.get(_key)
+    if _pipeline is None:
+        _pipeline = TextPipeline(iso_lang, steps, lexicon_dir, lexicon_env)
+        _TEXT_PIPELINES[_key] = _pipeline
+    return _pipeline
+
+
 class LocalCommons(object):
     """Shared items for local speech servers"""
 
@@ -564,18 +1614,7 @@ class LocalCommons(object):
             "preempt_dynamic",
         ]
         try:
-            self.add_pause = str.maketrans(
-                {
-                    "\n": ";\n",
-                    "\r": ";\r",
-                    "(": " ( ",
-                    "\u201c": "\u201c;",
-                    "\u2026": "\u2026;",
-                    "\u2014": "\u2014;",
-                    "\u2013": "\u2013;",
-                    "\u00a0": " ",
-                }
-            )
+            self.add_pause = str.maketrans(PAUSE_MARKS)
         except AttributeError:
             self.add_pause = None
         try:
@@ -602,6 +1641,14 @@ a sound file. It might be missing a required library or an operation might
 have taken too long."""
         self.last_lang = None
         self.patterns = None
+        self.audio_cache = AUDIO_CACHE
+        # Number of chunks to synthesize at the same time when exporting
+        # to a file. Local servers usually run on the same computer, so
+        # follow the processor count. Use `1` to request one chunk at a time.
+        try:
+            self.export_workers = max(2, min(8, os.cpu_count() or 2))
+        except AttributeError:
+            self.export_workers = 2
 
     def is_ai_developer_platform(self):  # -> bool
         """Does the platform include options for docker, podman, system
@@ -628,7 +1675,9 @@ have taken too long."""
 
     def set_urllib_timeout(self, _ok_wait=4):  # -> bool
         """Try to set sockets timeout before transfering a file using
-        `urllib`.
+        `urllib`. This changes the timeout for the whole process, so the
+        speech server clients use `http_request` with a `timeout` for each
+        request instead.
         https://docs.python.org/3/howto/urllib2.html#sockets-and-layers"""
         try:
             socket.setdefaulttimeout(_ok_wait)
@@ -636,6 +1685,36 @@ have taken too long."""
             return False
         return True
 
+    def http_request(
+        self, url="", data=None, headers=None, method=None, timeout=None
+    ):  # -> bytes
+        """Return the body of the response to a request to a speech server,
+        reusing a persistent connection to the server when possible. See
+        `HttpConnectionPool.request`."""
+        if not HTTP_POOL:
+            raise OSError("`http.client` is not available")
+        return HTTP_POOL.request(url, data, headers, method, timeout)
+
+    def capability_request(self, url="", timeout=4):  # -> bytes
+        """Return the voice or language list at `url`, using the saved copy
+        in the capability cache when the server is up. Errors are the same
+        as `http_request`. See `CapabilityCache`."""
+        if not HTTP_POOL:
+            raise OSError("`http.client` is not available")
+        return CAPABILITY_CACHE.get(url, timeout)
+
+    def capability_recheck(self, url="", timeout=4):  # -> bytes
+        """Return the voice or language list at `url` from the server if it
+        differs from the saved copy that `capability_request` returned, or
+        `b""`. Use it when a voice is not in the list. See
+        `CapabilityCache.recheck`."""
+        if not HTTP_POOL:
+            return b""
+        try:
+            return CAPABILITY_CACHE.recheck(url, timeout)
+        except (OSError, TimeoutError, urllib.error.URLError, ValueError):
+            return b""
+
     def rate_to_rhasspy_length_scale(self, _speech_rate=160):  # -> list
         """Look up a Rhasspy or Mimic3 length scale appropriate for requested
         `_speech rate`. Rates have discreet steps. In English, a common speech
@@ -713,6 +1792,8 @@ xml:lang="{0}">
             #     if play_with_winsound(_media_work, readtexttools.get_my_lock()):
             #         return True
 
+            if self.play_with_sink(_media_work, _media_out, _visible):
+                return True
             readtexttools.process_wav_media(
                 _info,
                 _media_work,
@@ -726,6 +1807,103 @@ xml:lang="{0}">
             return True
         return False
 
+    def play_with_sink(self, _media_work="", _media_out="", _visible="false"):
+        # -> bool
+        """If there is no output file and no player window, send the
+        `.wav` audio to the shared playback sink. The sink keeps one player
+        running, so chunks play without gaps. Returns `False` if the caller
+        should use `process_wav_media` instead."""
+        if readtexttools.lax_bool(_visible):
+            return False
+        if readtexttools.ExtensionTable().audio_extension_ok(_media_out):
+            return False
+        _lock = readtexttools.get_my_lock("lock")
+        if os.path.isfile(_lock):
+            return False
+        readtexttools.lock_my_lock()
+        _done = playback_sink().play_wav(_media_work, _lock)
+        if _done:
+            readtexttools.unlock_my_lock()
+        return _done
+
+    def finish_playback(self):  # -> None
+        """Wait for the playback sink to play the audio that it has."""
+        playback_sink().close()
+
+    def cached_synthesis(self, media_work="", synthesize=None, *key_parts):  # -> bool
+        """If the audio cache has audio for `key_parts`, copy it to
+        `media_work`, otherwise call `synthesize()` to write `media_work`
+        and save a copy in the cache. Returns `True` if `media_work` holds
+        the audio.
+
+        Example:
+            `self.common.cached_synthesis(_work, _do_it, "mimic3", _url, _voice, _text)`
+        """
+        _key = ""
+        if self.audio_cache.enabled():
+            _key = self.audio_cache.key(*key_parts)
+            if self.audio_cache.fetch(_key, media_work):
+                return True
+        if not synthesize():
+            return False
+        if _key:
+            self.audio_cache.store(_key, media_work)
+        return True
+
+    def export_chunks(
+        self, synthesize=None, items=None, media_work="", workers=0, locker=""
+    ):  # -> bool
+        """Synthesize several chunks of text at the same time and join the
+        audio in the original order into `media_work`.
+
+        + `synthesize` is a function like `synthesize(text, chunk_work)`
+           that writes the audio for `text` to the WAV file `chunk_work` and
+           returns `True` if it worked.
+        + `items` is the list of text chunks.
+        + `workers` is the largest number of requests to send at once.
+           The default is `self.export_workers`.
+        + `locker` is the lock that the user removes to stop.
+
+        Returns `True` if `media_work` contains the audio for every chunk.
+        If the user stops, or if a chunk fails, `media_work` is not
+        written and the function returns `False`."""
+        if not synthesize or not items or not media_work or not HTTP_CLIENT_OK:
+            return False
+        if workers < 1:
+            workers = self.export_workers
+        lock_path = readtexttools.get_my_lock(locker) if locker else ""
+        stem, ext = os.path.splitext(media_work)
+        chunk_works = [
+            "{0}_{1:06d}{2}".format(stem, _index, ext) for _index in range(len(items))
+        ]
+
+        def _one(_index):  # -> bool
+            if lock_path and not os.path.isfile(lock_path):
+                return False
+            return synthesize(items[_index], chunk_works[_index])
+
+        _done = True
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        try:
+            for _ok in executor.map(_one, range(len(items))):
+                if not _ok or (lock_path and not os.path.isfile(lock_path)):
+                    _done = False
+                    break
+        except Exception as e:
+            print("Exception:  ", e)
+            _done = False
+        finally:
+            try:
+                executor.shutdown(wait=True, cancel_futures=True)
+            except TypeError:
+                executor.shutdown(wait=True)
+        if _done:
+            _done = join_wav_files(chunk_works, media_work)
+        for chunk_work in chunk_works:
+            if os.path.isfile(chunk_work):
+                os.remove(chunk_work)
+        return _done
+
     def flatpak_package_play_command(
         self, app_signature="com.mikeasoft.pied"
     ):  # -> str
@@ -763,22 +1941,129 @@ xml:lang="{0}">
 def get_host_ip():  # -> str
     """Connect to a public IP (Google DNS) without sending data
     to reliably determine the machine's IP address."""
-    _local_commons = LocalCommons()
-    _local_commons.set_urllib_timeout(2)
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.settimeout(2)
         s.connect(("8.8.8.8", 80))
         ip = s.getsockname()[0]
         s.close()
-        _local_commons.set_urllib_timeout(4)
         return ip
     except Exception:
-        _local_commons.set_urllib_timeout(4)
         return "127.0.0.1"  # Fallback if offline
 
 
+def _baseline_prepare_text(iso_lang="en-US", text="", json_file=""):  # -> str
+    """A frozen copy of `strip_xml`, `strip_mojibake`, the `add_pause`
+    translation and the `local_pronunciation` text loop as they were before
+    `TextPipeline`, so `text_pipeline_benchmark` compares with them."""
+    from html.parser import HTMLParser
+
+    class _RemoveXML(HTMLParser):
+        def __init__(self):
+            self.reset()
+            self.fed = []
+            self.convert_charrefs = []
+
+        def handle_data(self, d):
+            self.fed.append(d)
+
+    try:
+        _parser = _RemoveXML()
+        _parser.feed(text)
+        text = "".join(_parser.fed)
+    except Exception:
+        pass
+    if not text:
+        text = ""
+    else:
+        rare_chars = "ĿŀǾǿĲĳŠšŽžŠšŽžŒœŸÿẞŐőŰűḂḃĊċḊḋḞḟĠġṀṁṖṗṠṡṪṫẀẁẂẃŴŵẄẅỲỳŶŷŸ"
+        safe_chars = "".join((chr(i) for i in range(1, 255)))
+        _concise_lang = iso_lang[:2].lower()
+        _coding = "utf-8"
+        _western = "af br co cy de en es et eu fi fo fr ga gd gl gv hu id is it lb"
+        if _concise_lang in (_western + " nl oc pt rm sq sv tl wa").split():
+            if len(set(text).intersection(rare_chars)) == 0:
+                try:
+                    returnval = set(text).intersection(safe_chars)
+                    returnval = returnval.strip("\n\t ;\\{\\}()[]")
+                except AttributeError:
+                    pass
+        elif _concise_lang in ["haw", "roo", "sw"]:
+            _coding = "latin-1"
+        _code = text.encode(_coding, "ignore")
+        text = _code.decode("utf-8", "ignore").strip("\n\t ;\\{\\}()[]")
+    if any(_symbol in text for _symbol in LocalCommons().pause_list):
+        text = text.translate(str.maketrans(PAUSE_MARKS)).replace(".;", ".")
+    if not json_file:
+        return text
+    with io.open(json_file, mode="r", encoding="utf-8", errors="replace") as _file:
+        data = json.loads(_file.read())
+    l_text = text.lower()
+    for _item in data:
+        if len(data[_item]["g"]) == 0:
+            continue
+        elif len(text) == 0:
+            break
+        for _skip in ["$[LOCALE]", "$[REVISION]", "\\u0024[LOCALE]"]:
+            if _skip in data[_item]["g"]:
+                continue
+        grapheme = data[_item]["g"].lower()
+        if l_text.count(grapheme) != 0 or "]" in grapheme:
+            text = text.replace(data[_item]["g"], data[_item]["p"]).replace(
+                grapheme, data[_item]["p"]
+            )
+    return text.strip()
+
+
+def text_pipeline_benchmark(size=1048576, runs=3):  # -> bool
+    """Compare `TextPipeline` with a frozen copy of the step by step
+    functions on about `size` characters of text in several languages.
+    Prints the times and returns `True` if every result is the same."""
+    _samples = {
+        "en-US": "The <b>XML</b> fox (Vulpes) jumps at 5 AM \u2014 50 Hz.\n",
+        "fr-FR": "L\u2019\u00e9l\u00e8ve dit \u201cbonjour\u201d \u2026 Lun. av. Foch, 5 \u20ac.\n",
+        "de-DE": "Dr. M\u00fcller &amp; Co. \u2013 5 \u20ac im Apr.\r\n",
+        "sw-KE": "Habari ya asubuhi; karibu sana (rafiki).\n",
+        "ru-RU": "\u041f\u0440\u0438\u0432\u0435\u0442, \u043c\u0438\u0440!\u00a0\u0414\u0430.\n",
+        "zh-CN": "\u4f60\u597d\uff0c\u4e16\u754c\u3002\u4eca\u5929\u5f88\u597d\u3002\n",
+    }
+    _steps = ["xml", "mojibake", "pause", "lexicon"]
+    _same = True
+    _old_total = 0.0
+    _new_total = 0.0
+    for _iso_lang, _sample in _samples.items():
+        _text = _sample * max(1, size // len(_samples) // len(_sample))
+        _pipeline = text_pipeline(_iso_lang, _steps, "default", "")
+        _json_file = readtexttools.LEXICONS.find(_iso_lang, "default", "")[0]
+        _old_time = 0.0
+        _new_time = 0.0
+        for _run in range(runs):
+            _start = time.perf_counter()
+            _old = _baseline_prepare_text(_iso_lang, _text, _json_file)
+            _old_time += time.perf_counter() - _start
+            _start = time.perf_counter()
+            _new = _pipeline.run(_text)
+            _new_time += time.perf_counter() - _start
+            _same = _same and _old == _new
+        _old_total += _old_time / runs
+        _new_total += _new_time / runs
+        print(
+            "{0:6} {1:8d} chars: {2:8.1f} ms -> {3:8.1f} ms".format(
+                _iso_lang, len(_text), 1000 * _old_time / runs, 1000 * _new_time / runs
+            )
+        )
+    print(
+        "Total: {0:.1f} ms -> {1:.1f} ms, same output: {2}".format(
+            1000 * _old_total, 1000 * _new_total, _same
+        )
+    )
+    return _same
+
+
 def main():  # -> None
-    """Print Info"""
+    """Print Info. Use `--benchmark` to time the text pipeline."""
+    if "--benchmark" in sys.argv[1:]:
+        sys.exit(0 if text_pipeline_benchmark() else 1)
     print(
         """Common Network Tools
 ====================
@@ -71,6 +71,9 @@ class MaryTtsClass(object):
         _common = netcommon.LocalCommons()
         self.locker = _common.locker
         self.common = _common
+        # A `netsplit.ChunkPlanner` to shorten the first chunks when speaking
+        # aloud, or `None` to use the splitter chunks as they are.
+        self.chunk_planner = None
         self.debug = _common.debug
         self.local_dir = "mary_tts"
         self.ok = True
@@ -155,21 +158,20 @@ xmlns="http://mary.dfki.de/2002/MaryXML" version="0.4" xml:lang="en-US"><p>
         # concise language
         _lang2 = _lang1.split("_")[0]
         _locales = ""
-        self.common.set_urllib_timeout(1)
         for dir_search in ["/locales", "/voices"]:
             try:
-                response = urllib.request.urlopen("".join([self.url, dir_search]))
-                _locales = str(response.read(), "utf-8")
+                _locales = str(
+                    self.common.capability_request(
+                        "".join([self.url, dir_search]), timeout=1
+                    ),
+                    "utf-8",
+                )
             except TimeoutError:
                 continue
             except urllib.error.URLError:
                 self.ok = False
-            except AttributeError:
-                try:
-                    response = urllib.urlopen("".join([self.url, dir_search]))
-                    _locales = str(response.read(), "utf-8")
-                except AttributeError:
-                    self.ok = False
+            except (AttributeError, OSError):
+                self.ok = False
         if len(_locales) == 0:
             self.ok = False
             return False
@@ -208,6 +210,13 @@ xmlns="http://mary.dfki.de/2002/MaryXML" version="0.4" xml:lang="en-US"><p>
             else:
                 self.voice_locale = _lang2.lower()
                 self.voice_mimic_locale = _lang2
+        if not self.ok and any(
+            [
+                self.common.capability_recheck("".join([self.url, _dir]), 1)
+                for _dir in ["/locales", "/voices"]
+            ]
+        ):
+            return self.language_supported(iso_lang, alt_local_url)
         return self.ok
 
     def _what_gender(self, _voice="male1") -> str:
@@ -230,8 +239,12 @@ xmlns="http://mary.dfki.de/2002/MaryXML" version="0.4" xml:lang="en-US"><p>
         if len(_voice) == 0:
             return ""
         try:
-            response = urllib.request.urlopen("".join([self.url, "/voices"]))
-            _voices = str(response.read(), "utf-8")
+            _voices = str(
+                self.common.capability_request(
+                    "".join([self.url, "/voices"]), timeout=4
+                ),
+                "utf-8",
+            )
         except urllib.error.URLError:
             help_site = (
                 "[docker-marytts](https://github.com/synesthesiam/docker-marytts)"
@@ -241,14 +254,8 @@ xmlns="http://mary.dfki.de/2002/MaryXML" version="0.4" xml:lang="en-US"><p>
 It did not respond correctly."""
             )
             return ""
-        except AttributeError:
-            try:
-                # catching classes that do not inherit from BaseExceptions
-                # is not allowed.
-                response = urllib.urlopen("".join([self.url, "/voices"]))
-                _voices = str(response.read(), "utf-8")
-            except AttributeError:
-                return ""
+        except (AttributeError, OSError):
+            return ""
         if len(_voices) == 0:
             return ""
         _locale = _iso_lang.replace("-", "_")
@@ -265,6 +272,9 @@ It did not respond correctly."""
                 return _row[0]
         last_match = ""
         if _voice not in self.accept_voice:
+            # The voice might be new since the server sent the saved list.
+            if self.common.capability_recheck("".join([self.url, "/voices"]), 4):
+                return self.marytts_voice(_voice, _iso_lang, _prefer_gendered_fallback)
             return last_match
         good_rows = []
         match_found = []
@@ -376,7 +386,6 @@ It did not respond correctly."""
         _done = False
         if not BASICS_OK:
             return False
-        self.common.set_urllib_timeout(_ok_wait)
         q_text = urllib.parse.quote(_text.strip(";\n"))
         if len(_mary_vox) == 0:
             vcommand = ""
@@ -391,10 +400,10 @@ It did not respond correctly."""
             # `requests` library.
             _strips = "\n .;"
             _text = "\n".join(["", _text.strip(_strips), ""])
-            data = {}  # The API uses an `INPUT_TEXT` argument for text
-            req = urllib.request.Request(my_url, data)
-            resp = urllib.request.urlopen(req)
-            response_content = resp.read()
+            data = b""  # The API uses an `INPUT_TEXT` argument for text
+            response_content = self.common.http_request(
+                my_url, data, None, "POST", _end_wait
+            )
             with open(_media_work, "wb") as f:
                 f.write(response_content)
             if os.path.isfile(_media_work):
@@ -407,6 +416,21 @@ It did not respond correctly."""
             self.ok = False
         return self.ok
 
+    def _try_cached(self, *args) -> bool:
+        """Try getting a sound file from the audio cache, then using
+        requests, then using url_lib. `args` are the arguments of
+        `_try_requests`."""
+        _media_work = args[-1]
+
+        def _do_synthesis() -> bool:
+            return self._try_requests(*args) or self._try_url_lib(*args)
+
+        # Every argument except `_ok_wait`, `_end_wait` and `_media_work`
+        # changes the audio.
+        return self.common.cached_synthesis(
+            _media_work, _do_synthesis, "marytts", *args[:-3]
+        )
+
     def read(
         self,
         _text="",
@@ -451,8 +475,7 @@ It did not respond correctly."""
                 readtexttools.unlock_my_lock(self.locker)
                 return True
         if bool(self.add_pause) and not ssml:
-            if any(_symbol in _text for _symbol in self.pause_list):
-                _text = _text.translate(self.add_pause).replace(".;", ".")
+            _text = netcommon.text_pipeline(_iso_lang, ["pause"]).run(_text)
         _view_json = self.debug and 1
         _mary_vox = self.marytts_voice(_vox, _iso_lang)
         response = readtexttools.local_pronunciation(
@@ -511,9 +534,64 @@ NOTE: Setting a MaryTTS speech rate requires the python `request` library."""
         else:
             _netsplitlocal = netsplit.LocalHandler()
             _items = _netsplitlocal.create_play_list(_text, _iso_lang.split("-")[0])
+            if self.chunk_planner and not _out_path:
+                _items = list(self.chunk_planner.plan(_items))
         _tries = 0
         readtexttools.lock_my_lock(self.locker)
         _no = "0" * 10
+        if _out_path and self.common.export_workers > 1 and len(_items) > 1:
+            # Exporting to a file: request several chunks at once, join
+            # the audio in order and encode it once.
+            def _synthesize(_item="", _work=""):  # -> bool
+                """Request one chunk, using `requests` if it is available."""
+                _args = [
+                    _mary_vox,
+                    _audio_format,
+                    _output_type,
+                    _input_type,
+                    _found_locale,
+                    _item,
+                    _ssml,
+                    _length_scale,
+                    _url,
+                    _ok_wait,
+                    _end_wait,
+                    _work,
+                ]
+                return self._try_cached(*_args)
+
+            _done = self.common.export_chunks(
+                _synthesize,
+                [
+                    _item.strip()
+                    for _item in _items
+                    if len(_item.strip(" ;.!?\n")) != 0
+                ],
+                _media_work,
+                self.common.export_workers,
+                self.locker,
+            )
+            if not os.path.isfile(readtexttools.get_my_lock(self.locker)):
+                print("[>] Stop")
+                return True
+            if _done:
+                self.common.do_net_sound(
+                    _info,
+                    _media_work,
+                    _icon,
+                    _media_out,
+                    _audible,
+                    _visible,
+                    _writer,
+                    _size,
+                    _post_process,
+                    False,
+                )
+            self.ok = _done
+            if not _done:
+                print(self.common.generic_problem)
+            readtexttools.unlock_my_lock(self.locker)
+            return _done
         for _item in _items:
             if not self.ok:
                 return False
@@ -528,7 +606,7 @@ NOTE: Setting a MaryTTS speech rate requires the python `request` library."""
                 _no = readtexttools.prefix_ohs(_tries, 10, "0")
                 _media_out = _media_out.replace(f".{_ext}", f"_{_no}.{_ext}")
             _tries += 1
-            _done = self._try_requests(
+            _done = self._try_cached(
                 _mary_vox,
                 _audio_format,
                 _output_type,
@@ -542,21 +620,6 @@ NOTE: Setting a MaryTTS speech rate requires the python `request` library."""
                 _end_wait,
                 _media_work,
             )
-            if not _done:
-                _done = self._try_url_lib(
-                    _mary_vox,
-                    _audio_format,
-                    _output_type,
-                    _input_type,
-                    _found_locale,
-                    _item.strip(),
-                    _ssml,
-                    _length_scale,
-                    _url,
-                    _ok_wait,
-                    _end_wait,
-                    _media_work,
-                )
             if not os.path.isfile(readtexttools.get_my_lock(self.locker)):
                 print("[>] Stop")
                 return True
@@ -578,5 +641,6 @@ NOTE: Setting a MaryTTS speech rate requires the python `request` library."""
         self.ok = _done
         if not _done:
             print(self.common.generic_problem)
+        self.common.finish_playback()
         readtexttools.unlock_my_lock(self.locker)
         return _done
@@ -57,6 +57,9 @@ To automatically start the daemon, set the Docker container restart policy to
         _common = netcommon.LocalCommons()
         self.locker = _common.locker
         self.common = _common
+        # A `netsplit.ChunkPlanner` to shorten the first chunks when speaking
+        # aloud, or `None` to use the splitter chunks as they are.
+        self.chunk_planner = None
         self.debug = _common.debug
         self.default_extension = _common.default_extension
         self.ok = False
@@ -587,11 +590,10 @@ Mimic 3
         )
         # concise language
         _lang2 = iso_lang.lower().split("-")[0].split("_")[0]
-        _commons = netcommon.LocalCommons()
-        _commons.set_urllib_timeout(4)
         try:
-            response = urllib.request.urlopen("".join([self.url, "/api/voices"]))
-            data_response = response.read()
+            data_response = self.common.capability_request(
+                "".join([self.url, "/api/voices"]), timeout=4
+            )
             self.data = json.loads(data_response)
         except urllib.error.URLError:
             _eurl = self.url
@@ -680,6 +682,11 @@ a local URL that you specify.
                                     self.male_names.insert(0, full_name)
                                     self.female_names.insert(0, full_name)
                                 self.ok = True
+        if not self.ok and self.common.capability_recheck(
+            "".join([self.url, "/api/voices"]), 4
+        ):
+            # A voice might be new since the server sent the saved list.
+            return self.language_supported(iso_lang, alt_local_url, vox)
         if len(self.male_names) == 0:
             self.male_names = self.full_names
         if len(self.female_names) == 0:
@@ -697,12 +704,10 @@ a local URL that you specify.
         _end_wait=10,
         _media_work="",
     ) -> bool:
-        """Try getting a sound file using url_lib."""
-        _done = False
+        """Try getting a sound file from the audio cache or using url_lib."""
         if not BASICS_OK:
             return False
-        _common = netcommon.LocalCommons()
-        _common.set_urllib_timeout(_ok_wait)
+        _common = self.common
         my_url = "".join(
             [
                 _url,
@@ -718,16 +723,22 @@ a local URL that you specify.
         )
         if _common.debug:
             print(my_url)
-        try:
-            # GET
-            response = urllib.request.urlopen(my_url, timeout=(_end_wait))
-            with open(_media_work, "wb") as f:
-                f.write(response.read())
-            if os.path.isfile(_media_work):
-                _done = os.path.getsize(os.path.realpath(_media_work)) != 0
-        except (TimeoutError, urllib.error.HTTPError):
+
+        def _do_synthesis():  # -> bool
             _done = False
-        return _done
+            try:
+                # GET
+                response_content = _common.http_request(my_url, timeout=_end_wait)
+                with open(_media_work, "wb") as f:
+                    f.write(response_content)
+                if os.path.isfile(_media_work):
+                    _done = os.path.getsize(os.path.realpath(_media_work)) != 0
+            except (TimeoutError, urllib.error.URLError):
+                _done = False
+            return _done
+
+        # The url includes the voice, length scale, ssml flag and text.
+        return _common.cached_synthesis(_media_work, _do_synthesis, "mimic3", my_url)
 
     def read(
         self,
@@ -801,6 +812,58 @@ a local URL that you specify.
         else:
             _netsplitlocal = netsplit.LocalHandler()
             _items = _netsplitlocal.create_play_list(_text, _iso_lang.split("-")[0])
+            if self.chunk_planner and not _out_path:
+                _items = list(self.chunk_planner.plan(_items))
+
+        if _out_path and self.common.export_workers > 1 and len(_items) > 1:
+            # Exporting to a file: request several chunks at once, join
+            # the audio in order and encode it once.
+            _ssml = "false"
+            if readtexttools.lax_bool(ssml):
+                _ssml = "true"
+            _texts = [
+                self.fix_all_caps(_item).strip()
+                for _item in _items
+                if len(_item.strip().strip(""" ;:-,*+=_[]()'".!?\n""")) != 0
+            ]
+            _done = self.common.export_chunks(
+                lambda _item, _work: self.try_url_lib(
+                    _voice,
+                    _item,
+                    _url,
+                    _length_scale,
+                    _ssml,
+                    _ok_wait,
+                    _end_wait,
+                    _work,
+                ),
+                _texts,
+                _media_work,
+                self.common.export_workers,
+                self.locker,
+            )
+            if not os.path.isfile(readtexttools.get_my_lock(self.locker)):
+                print("[>] Stop")
+                self.ok = False
+                return True
+            if _done:
+                self.common.do_net_sound(
+                    _info,
+                    _media_work,
+                    _icon,
+                    _media_out,
+                    _audible,
+                    _visible,
+                    _writer,
+                    _size,
+                    _post_process,
+                    False,
+                )
+            self.ok = _done
+            if not _done:
+                print(self.common.generic_problem)
+            readtexttools.unlock_my_lock(self.locker)
+            return _done
 
         for _item in _items:
             if not os.path.isfile(readtexttools.get_my_lock(self.locker)):
@@ -850,5 +913,6 @@ a local URL that you specify.
         self.ok = _done
         if not _done:
             print(self.common.generic_problem)
+        self.common.finish_playback()
         readtexttools.unlock_my_lock(self.locker)
         return _done
@@ -64,6 +64,9 @@ class OpenTTSClass(object):
         """Initialize data."""
         _common = netcommon.LocalCommons()
         self.common = _common
+        # A `netsplit.ChunkPlanner` to shorten the first chunks when speaking
+        # aloud, or `None` to use the splitter chunks as they are.
+        self.chunk_planner = None
         self.locker = _common.locker
         self.debug = _common.debug
         self.default_extension = _common.default_extension
@@ -191,10 +194,9 @@ OpenTTS
             # Test a specific model
             self.vmodels = [vox]
         try:
-            response = urllib.request.urlopen(
-                "".join([self.url, "/api/voices?language=", _lang2])
+            data_response = self.common.capability_request(
+                "".join([self.url, "/api/voices?language=", _lang2]), timeout=4
             )
-            data_response = response.read()
             self.data = json.loads(data_response)
         except urllib.error.URLError:
             _eurl = self.url
@@ -273,6 +275,11 @@ or a local URL that you specify.
                                     self.female_names.insert(0, full_name)
 
                                 self.ok = True
+        if not self.ok and self.common.capability_recheck(
+            "".join([self.url, "/api/voices?language=", _lang2]), 4
+        ):
+            # A voice might be new since the server sent the saved list.
+            return self.language_supported(iso_lang, alt_local_url, vox)
         if len(self.male_names) == 0:
             self.male_names = self.full_names
         if len(self.female_names) == 0:
@@ -291,12 +298,10 @@ or a local URL that you specify.
         _end_wait=10,
         _media_work="",
     ) -> bool:
-        """Try getting a sound file using url_lib."""
-        _done = False
+        """Try getting a sound file from the audio cache or using url_lib."""
         if not BASICS_OK:
             return False
-        _common = netcommon.LocalCommons()
-        _common.set_urllib_timeout(_ok_wait)
+        _common = self.common
         my_url = "".join(
             [
                 _url,
@@ -312,22 +317,28 @@ or a local URL that you specify.
                 urllib.parse.quote(_text),
             ]
         )
-        try:
-            # GET
-            response = urllib.request.urlopen(my_url, timeout=_end_wait)
-            with open(_media_work, "wb") as _handle:
-                _handle.write(response.read())
-            if os.path.isfile(_media_work):
-                _done = os.path.getsize(os.path.realpath(_media_work)) != 0
-        except (TimeoutError, urllib.error.HTTPError):
-            print(
-                f"""
+
+        def _do_synthesis():  # -> bool
+            _done = False
+            try:
+                # GET
+                response_content = _common.http_request(my_url, timeout=_end_wait)
+                with open(_media_work, "wb") as _handle:
+                    _handle.write(response_content)
+                if os.path.isfile(_media_work):
+                    _done = os.path.getsize(os.path.realpath(_media_work)) != 0
+            except (TimeoutError, urllib.error.URLError):
+                print(
+                    f"""
 OpenTTS cannot provide speech for `{_voice}`.
 Check the server settings or use a different voice.
     """
-            )
-            _done = False
-        return _done
+                )
+                _done = False
+            return _done
+
+        # The url includes the voice, vocoder, denoiser, ssml flag and text.
+        return _common.cached_synthesis(_media_work, _do_synthesis, "opentts", my_url)
 
     def read(
         self,
@@ -371,10 +382,7 @@ Check the server settings or use a different voice.
         if self.debug and 1:
             print(["`OpenTTSClass` > ` `read`", "Request `_voice`: ", _voice])
         if bool(self.add_pause) and not ssml:
-            for _symbol in self.pause_list:
-                if _symbol in _text:
-                    _text = _text.translate(self.add_pause).replace(".;", ".")
-                    break
+            _text = netcommon.text_pipeline(_iso_lang, ["pause"]).run(_text)
         _vocoder = "low"
         if self.is_x86_64:
             _vocoder = "medium"
@@ -394,6 +402,53 @@ Check the server settings or use a different voice.
         else:
             _netsplitlocal = netsplit.LocalHandler()
             _items = _netsplitlocal.create_play_list(_text, _iso_lang.split("-")[0])
+            if self.chunk_planner and not _out_path:
+                _items = list(self.chunk_planner.plan(_items))
+        if _out_path and self.common.export_workers > 1 and len(_items) > 1:
+            # Exporting to a file: request several chunks at once, join
+            # the audio in order and encode it once.
+            _done = self.common.export_chunks(
+                lambda _item, _work: self.try_url_lib(
+                    _voice,
+                    _item,
+                    _url,
+                    _vocoder,
+                    _denoiser_strength,
+                    _ssml,
+                    _ok_wait,
+                    _end_wait,
+                    _work,
+                ),
+                [
+                    _item.strip()
+                    for _item in _items
+                    if len(_item.strip(" ;.!?\n")) != 0
+                ],
+                _media_work,
+                self.common.export_workers,
+                self.locker,
+            )
+            if not os.path.isfile(readtexttools.get_my_lock(self.locker)):
+                print("[>] Stop")
+                return True
+            if _done:
+                self.common.do_net_sound(
+                    _info,
+                    _media_work,
+                    _icon,
+                    _media_out,
+                    _audible,
+                    _visible,
+                    _writer,
+                    _size,
+                    _post_process,
+                    False,
+                )
+            self.ok = _done
+            if not _done:
+                print(self.common.generic_problem)
+            readtexttools.unlock_my_lock(self.locker)
+            return _done
         for _item in _items:
             if not self.ok:
                 return False
@@ -440,5 +495,6 @@ Check the server settings or use a different voice.
         self.ok = _done
         if not _done:
             print(self.common.generic_problem)
+        self.common.finish_playback()
         readtexttools.unlock_my_lock(self.locker)
         return _done
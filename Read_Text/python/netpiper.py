@@ -367,12 +367,13 @@ If the browser shows a JSON data string, the server is working.
 import os
 
 try:
+    import concurrent.futures
     import json
+    import queue
     import re
     import tempfile
+    import threading
     import time
-    import urllib
-    import urllib.request
 
     # import subprocess
     BASICS_OK = True
@@ -424,12 +425,20 @@ class GPLPiperClass(object):
         _common = netcommon.LocalCommons()
         self.locker = _common.locker
         self.common = _common
+        # A `netsplit.ChunkPlanner` to shorten the first chunks when speaking
+        # aloud, or `None` to use the splitter chunks as they are.
+        self.chunk_planner = None
         self.add_pause = _common.add_pause
         self.pause_list = _common.pause_list
         self.debug = _common.debug
         self.url = "http://127.0.0.1:5000"  # Default URL port 5000
         self.workgroup_url = None
         self.workgroup_urls = []
+        # Every server url that `ping_local_server` could try, and a
+        # `netcommon.ServerBalancer` for the ones that offer the voice
+        # (`None` until checked, `False` if no other server has it).
+        self.server_candidates = []
+        self.balancer = None
         self.help_heading = "OHF-Voice Piper Server"
         self.wave = "GPL-Piper.wav"
         self.help_url = (
@@ -461,6 +470,11 @@ class GPLPiperClass(object):
         self.lengthscale = 1
         self.home_network_scan_disabled = False
         self.host_latency = float(0.0)
+        # Seconds to wait for each request to the server
+        self.request_timeout = 4
+        # Number of chunks to synthesize ahead of the chunk that is playing.
+        # Use `0` to request each chunk only after the previous one ends.
+        self.prefetch_depth = 2
 
     def _piper_server_script_path(self) -> str:
         """Find a `site-packages/http_server.py` piper-server script path if
@@ -495,12 +509,14 @@ class GPLPiperClass(object):
         """
         Fetch JSON from `url` and return a tuple of
         (parsed_data, latency_seconds).
+
+        The latency is the time that the server took to answer `url` in
+        this process. If the body came from the capability cache and the
+        server has not answered yet, `host_latency` stays the same.
         """
-        start = time.perf_counter()
         try:
-            with urllib.request.urlopen(url) as resp:
-                body = resp.read()
-            latency = time.perf_counter() - start
+            body = self.common.capability_request(url, timeout=self.request_timeout)
+            latency = netcommon.CAPABILITY_CACHE.latency.get(url, self.host_latency)
             self.host_latency = latency
         except Exception as e:
             print("Exception:  ", e)
@@ -522,7 +538,7 @@ class GPLPiperClass(object):
         _success = False
         last_uri = ""
         error_found = ""
-        self.common.set_urllib_timeout(2)  # Load locally hosted json code using GET
+        self.request_timeout = 2  # Load locally hosted json code using GET
         if net_servers:
             if not self.home_network_scan_disabled:
                 test_list = net_servers
@@ -530,6 +546,11 @@ class GPLPiperClass(object):
                     test_list.append(local_server)
         else:
             test_list = [local_server, self.url] + self.workgroup_urls
+        for json_uri in test_list:
+            if ":" in json_uri:
+                json_url = json_uri.split("?")[0].rstrip("/ \n")
+                if json_url not in self.server_candidates:
+                    self.server_candidates.append(json_url)
         for json_uri in test_list:
             if ":" not in json_uri:
                 continue
@@ -549,7 +570,7 @@ class GPLPiperClass(object):
                 break
 
             except Exception as e:
-                self.common.set_urllib_timeout(2)
+                self.request_timeout = 2
                 _success = False
                 error_found = e
         if not _success:
@@ -588,7 +609,7 @@ Exception: """,
                 )
             return False
         if self.piper_json:
-            self.common.set_urllib_timeout(
+            self.request_timeout = (
                 7.0 + latency
             )  # 7 seconds allows time to load a model
             return True
@@ -605,7 +626,7 @@ Exception: """,
             return False
         _pinglocal = ping_local_network.PingLocals()
         _custom_ignore = None
-        host_list = _pinglocal.valid_local_machine_addresses(_custom_ignore)
+        host_list = _pinglocal.serving_hosts(5000, _custom_ignore)
         test_list = []
         for home_test in host_list:
             test_list.append(f"http://{home_test}:5000")
@@ -613,6 +634,54 @@ Exception: """,
             return self.ping_local_server("http://127.0.0.1:5000", test_list)
         return False
 
+    def _serves_voice(self, data, voice_model: str = "") -> bool:
+        """Does the piper json `data` include `voice_model`?"""
+        try:
+            for item in data:
+                if voice_model == "-".join(
+                    [
+                        data[item]["language"]["code"],
+                        data[item]["dataset"],
+                        data[item]["audio"]["quality"],
+                    ]
+                ):
+                    return True
+        except (KeyError, TypeError, AttributeError):
+            pass
+        return False
+
+    def find_voice_servers(self):  # -> netcommon.ServerBalancer | None
+        """Check the other servers that `ping_local_server` knows about at
+        the same time, and return a `netcommon.ServerBalancer` for the
+        servers with the same voice model, or `None` if only `self.url`
+        has it."""
+        if not self.piper_json or not self.piper_voice_resource:
+            return None
+        _others = [_url for _url in self.server_candidates if _url != self.url]
+        if not _others:
+            return None
+
+        def _check(_url: str) -> bool:
+            try:
+                return self._serves_voice(
+                    json.loads(
+                        self.common.capability_request(f"{_url}/voices", timeout=2)
+                    ),
+                    self.piper_voice_resource,
+                )
+            except Exception:
+                return False
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(8, len(_others))
+        ) as executor:
+            _found = [
+                _url for _url, _ok in zip(_others, executor.map(_check, _others)) if _ok
+            ]
+        if not _found:
+            return None
+        return netcommon.ServerBalancer([self.url] + _found)
+
     def speaker_count(self, voice_model: str = "") -> int:
         """Use piper json data to determine the number of speakers. Note that
         the `speaker_id` begins at `0`, so the upper bound of the speaker list
@@ -707,6 +776,11 @@ Exception: """,
                         self.ok = True
                         self.wave = "OHF-Voice.wav"
                         return self.ok
+            if self.common.capability_recheck(
+                f"{self.url}/voices", self.request_timeout
+            ):
+                # A voice might be new since the server sent the saved list.
+                return self.language_supported(_iso_lang, alt_local_url, _vox)
 
         elif base_locale == base_lang:
             self.ok = test_ping
@@ -768,6 +842,234 @@ Exception: """,
 
         return (speaker_id or 0, speaker_name)
 
+    def _chunk_work_path(self, index: int = 0) -> str:
+        """Return a temporary work file name for chunk number `index`, so
+        that a chunk synthesized ahead of time does not overwrite the chunk
+        that is playing."""
+        stem, ext = os.path.splitext(self.wave)
+        return os.path.join(tempfile.gettempdir(), f"{stem}_{index:06d}{ext}")
+
+    def _synthesize(
+        self, eitem: str = "", speaker_id: int = 0, length_scale: float = 1
+    ) -> bytes:
+        """POST one chunk of text to the server and return the audio data."""
+        if self.piper_json:
+            payload = {
+                "text": eitem,
+                "voice": self.piper_voice_resource,
+                "speaker_id": speaker_id,
+                "length_scale": length_scale,
+            }
+            data = json.dumps(payload).encode("utf-8")
+            if self.balancer:
+                return self.balancer.request(
+                    len(eitem),
+                    lambda _url: self.common.http_request(
+                        _url,
+                        data,
+                        {"Content-Type": "application/json"},
+                        "POST",
+                        self.request_timeout,
+                    ),
+                )
+            return self.common.http_request(
+                self.url,
+                data,
+                {"Content-Type": "application/json"},
+                "POST",
+                self.request_timeout,
+            )
+        # Your piper server was updated December 21, 2023,
+        # and you are limited to one voice model and speaker.
+        try:
+            return self.common.http_request(
+                self.url,
+                eitem.encode("utf-8"),
+                {"Content-Type": "text/plain"},
+                "POST",
+                self.request_timeout,
+            )
+        except Exception as e:
+            print(
+                f"Exception: [{self.help_heading}]({self.help_url}) :",
+                e,
+            )
+            self.ok = False
+        return b""
+
+    def _write_chunk(
+        self,
+        eitem: str = "",
+        media_work: str = "",
+        speaker_id: int = 0,
+        length_scale: float = 1,
+    ) -> bool:
+        """Synthesize `eitem` into `media_work`, or copy it from the audio
+        cache. Returns `True` if the file has content."""
+
+        def _do_synthesis() -> bool:
+            try:
+                response_content = self._synthesize(eitem, speaker_id, length_scale)
+                if response_content:
+                    with open(media_work, "wb") as _handle:
+                        _handle.write(response_content)
+                if os.path.isfile(media_work):
+                    return os.path.getsize(os.path.realpath(media_work)) != 0
+            except Exception as e:
+                print(
+                    f"""{self._piper_server_script_path()}
+Exception:  {e}""",
+                )
+            return False
+
+        return self.common.cached_synthesis(
+            media_work,
+            _do_synthesis,
+            "piper-server",
+            self.url,
+            self.piper_voice_resource,
+            speaker_id,
+            length_scale,
+            eitem,
+        )
+
+    def _make_chunk(
+        self,
+        index: int = 0,
+        eitem: str = "",
+        speaker_id: int = 0,
+        length_scale: float = 1,
+    ):  # -> tuple[bool, str]
+        """Synthesize `eitem` into the work file for chunk `index`.
+        Returns `(done, media_work)`."""
+        media_work = self._chunk_work_path(index)
+        return (
+            self._write_chunk(eitem, media_work, speaker_id, length_scale),
+            media_work,
+        )
+
+    def _iter_jobs(self, items, media_out: str = "", strips: str = "\n .;"):
+        """Yield a `(text, media_out)` job for each chunk of text in
+        `items` that has something to say."""
+        for item in items:
+            if self.debug:
+                print([item, len(item)])
+            if len(item.strip(strips)) == 0:
+                continue
+            item = "\n".join(["", item.strip(strips), ""])
+            # The 2025 GPL version of Piper Server supports switches
+            # like the command line version. It defaults to a preset
+            # language if the requested language is not installed.
+            yield netsplit.normalize_edge_punct(item), media_out
+
+    def _serial_chunks(self, jobs, speaker_id: int = 0, length_scale: float = 1):
+        """Synthesize each `(text, media_out)` job only when the caller asks
+        for it. Yields `(done, media_work, media_out)`."""
+        for index, (eitem, media_out) in enumerate(jobs):
+            done, media_work = self._make_chunk(index, eitem, speaker_id, length_scale)
+            yield done, media_work, media_out
+            if not done:
+                return
+
+    def _prefetched_chunks(
+        self,
+        jobs,
+        speaker_id: int = 0,
+        length_scale: float = 1,
+        depth: int = 2,
+        workers: int = 1,
+    ):
+        """Synthesize up to `depth` chunks ahead in a worker thread while
+        the caller plays the current chunk. Yields the same
+        `(done, media_work, media_out)` tuples in the same order as
+        `_serial_chunks`. The worker stops when the caller closes the
+        generator or when the user removes the lock file.
+
+        With more than one of `workers`, several chunks are requested at
+        once, so that a `netcommon.ServerBalancer` can spread them over
+        its servers."""
+        workers = max(1, workers)
+        ready = queue.Queue(maxsize=max(1, depth, workers))
+        halt = threading.Event()
+        lock_path = readtexttools.get_my_lock(self.locker)
+        executor = None
+        if workers > 1:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+        def offer(item) -> bool:
+            """Wait for room in the queue unless the reader has stopped."""
+            while not halt.is_set():
+                try:
+                    ready.put(item, timeout=0.2)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def producer() -> None:
+            """Request each chunk in order and queue the result."""
+            for index, (eitem, media_out) in enumerate(jobs):
+                if halt.is_set() or not os.path.isfile(lock_path):
+                    break
+                if executor:
+                    future = executor.submit(
+                        self._make_chunk, index, eitem, speaker_id, length_scale
+                    )
+                    if not offer((future, media_out)):
+                        future.cancel()
+                        future.add_done_callback(discard)
+                        return
+                    continue
+                done, media_work = self._make_chunk(
+                    index, eitem, speaker_id, length_scale
+                )
+                if not offer((done, media_work, media_out)):
+                    if os.path.isfile(media_work):
+                        os.remove(media_work)
+                    return
+                if not done:
+                    break
+            offer(None)
+
+        def discard(future) -> None:
+            """Remove the work file of a chunk that will not play."""
+            if future.cancelled() or future.exception():
+                return
+            media_work = future.result()[1]
+            if os.path.isfile(media_work):
+                os.remove(media_work)
+
+        def resolve(item):  # -> tuple
+            """Wait for a chunk that the executor is synthesizing."""
+            if executor and item:
+                done, media_work = item[0].result()
+                return done, media_work, item[1]
+            return item
+
+        worker = threading.Thread(target=producer, daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = resolve(ready.get())
+                if item is None:
+                    return
+                yield item
+        finally:
+            halt.set()
+            while True:
+                try:
+                    item = ready.get_nowait()
+                except queue.Empty:
+                    break
+                if item and executor:
+                    item[0].cancel()
+                    item[0].add_done_callback(discard)
+                    continue
+                if item and os.path.isfile(item[1]):
+                    os.remove(item[1])
+            if executor:
+                executor.shutdown(wait=False)
+
     def read(
         self,
         _text: str = "",
@@ -792,6 +1094,7 @@ Exception: """,
         _media_out = ""
         speaker_id, speaker_name = self.determine_speaker_id(_vox)
         _done = False
+        retval = False
         # Determine the output file name
         _media_out = readtexttools.get_work_file_path(_out_path, _icon, "OUT")
         # Determine the temporary file name
@@ -811,8 +1114,7 @@ Exception: """,
                 return True
 
         if bool(self.add_pause):
-            if any(_symbol in _text for _symbol in self.pause_list):
-                _text = _text.translate(self.add_pause).replace(".;", ".")
+            _text = netcommon.text_pipeline(_iso_lang, ["pause"]).run(_text)
         if os.path.isfile(_media_work):
             os.remove(_media_work)
 
@@ -856,12 +1158,15 @@ Exception: """,
         if BASICS_OK:
             # _method = "GET"
             _strips = "\n .;"
-            self.common.set_urllib_timeout(_ok_wait)
-            _tries = 0
+            self.request_timeout = max(_ok_wait, self.request_timeout)
+            if self.balancer is None:
+                # Share the chunks with other servers that have the voice.
+                self.balancer = self.find_voice_servers() or False
             readtexttools.lock_my_lock(self.locker)
-            _no = "0" * 10
             _netsplitlocal = netsplit.LocalHandler()
-            _items = _netsplitlocal.create_play_list(_text, _iso_lang.split("-")[0])
+            # Split lazily so the first chunk can play while the rest of a
+            # long selection is still being split.
+            _items = _netsplitlocal.iter_play_list(_text, _iso_lang.split("-")[0])
             help_heading = self.help_heading
             help_underscore = len(help_heading) * "="
             help_voice = self.piper_voice_resource
@@ -885,102 +1190,81 @@ Exception: """,
 [{help_heading}]({self.help_url})
 """
             )
-            for _item in _items:
-                if self.debug:
-                    print([_item, len(_item)])
-                if not self.ok:
-                    return False
-                if not os.path.isfile(readtexttools.get_my_lock(self.locker)):
-                    print("[>] Stop!")
-                    self.ok = False
-                    return True
-                if len(_item.strip(_strips)) == 0:
-                    continue
-                if "." in _media_out and _tries != 0:
-                    _, _ext = os.path.splitext(_media_out)
-                    _no = readtexttools.prefix_ohs(_tries, 10, "0")
-                    _media_out = _media_out.replace(f".{_ext}", f"_{_no}.{_ext}")
-                _item = "\n".join(["", _item.strip(_strips), ""])
-                # The 2025 GPL version of Piper Server supports switches
-                # like the command line version. It defaults to a preset
-                # language if the requested language is not installed.
-
-                try:
-                    my_url = self.url
-                    response_content = None
-                    eitem = netsplit.normalize_edge_punct(_item)
-                    if self.piper_json:
-                        payload = {
-                            "text": eitem,
-                            "voice": self.piper_voice_resource,
-                            "speaker_id": speaker_id,
-                            "length_scale": length_scale,
-                        }
-                        data = json.dumps(payload).encode("utf-8")
-                        
-                        req = urllib.request.Request(
-                            my_url,
-                            data=data,
-                            headers={"Content-Type": "application/json"},
-                            method="POST",
-                        )
-                    
-                        with urllib.request.urlopen(req) as resp:
-                            response_content = resp.read()
-                    else:
-                        # Your piper server was updated December 21, 2023,
-                        # and you are limited to one voice model and speaker.
-                        try:
-                            legacy_req = urllib.request.Request(
-                                my_url,
-                                data=eitem.encode("utf-8"),
-                                headers={"Content-Type": "text/plain"},
-                                method="POST",
-                            )
-                            with urllib.request.urlopen(legacy_req) as legacy_resp:
-                                response_content = legacy_resp.read()
-
-                        except Exception as e:
-                            print(
-                                f"Exception: [{self.help_heading}]({self.help_url}) :",
-                                e,
-                            )
-                            self.ok = False
-                            return False
-                    if response_content:
-                        with open(_media_work, "wb") as _handle:
-                            _handle.write(response_content)
-                    if os.path.isfile(_media_work):
-                        _done = os.path.getsize(os.path.realpath(_media_work)) != 0
-                except Exception as e:
-                    print(
-                        f"""{self._piper_server_script_path()}
-Exception:  {e}""",
-                    )
-                    # bare-except because qualifying it causes an error on some
-                    # platforms.
-                    retval = False
-                    _done = False
-                    break
-                if not _done:
-                    readtexttools.unlock_my_lock(self.locker)
-                    return False
-
+            if self.chunk_planner and not _out_path:
+                _items = self.chunk_planner.plan(_items)
+            _jobs = self._iter_jobs(_items, _media_out, _strips)
+            if _out_path and self.common.export_workers > 1:
+                _jobs = list(_jobs)
+            if isinstance(_jobs, list) and len(_jobs) > 1:
+                # Exporting to a file: request several chunks at once, join
+                # the audio in order and encode it once.
+                _done = self.common.export_chunks(
+                    lambda _eitem, _work: self._write_chunk(
+                        _eitem, _work, speaker_id, length_scale
+                    ),
+                    [_job[0] for _job in _jobs],
+                    _media_work,
+                    self.common.export_workers,
+                    self.locker,
+                )
                 if not os.path.isfile(readtexttools.get_my_lock(self.locker)):
                     print("[>] Stop")
                     return True
-                retval = self.common.do_net_sound(
-                    _info,
-                    _media_work,
-                    _icon,
-                    _media_out,
-                    _audible,
-                    _visible,
-                    _writer,
-                    _size,
-                    _post_process,
-                    False,
+                if _done:
+                    retval = self.common.do_net_sound(
+                        _info,
+                        _media_work,
+                        _icon,
+                        _jobs[0][1],
+                        _audible,
+                        _visible,
+                        _writer,
+                        _size,
+                        _post_process,
+                        False,
+                    )
+                readtexttools.unlock_my_lock(self.locker)
+                return retval
+            if self.prefetch_depth > 0:
+                _workers = 1
+                if self.balancer:
+                    _workers = len(self.balancer)
+                _chunks = self._prefetched_chunks(
+                    _jobs, speaker_id, length_scale, self.prefetch_depth, _workers
                 )
+            else:
+                _chunks = self._serial_chunks(_jobs, speaker_id, length_scale)
+            try:
+                for _done, _media_work, _media_out in _chunks:
+                    if not self.ok:
+                        return False
+                    if not _done:
+                        readtexttools.unlock_my_lock(self.locker)
+                        return False
+                    if not os.path.isfile(readtexttools.get_my_lock(self.locker)):
+                        print("[>] Stop")
+                        return True
+                    retval = self.common.do_net_sound(
+                        _info,
+                        _media_work,
+                        _icon,
+                        _media_out,
+                        _audible,
+                        _visible,
+                        _writer,
+                        _size,
+                        _post_process,
+                        False,
+                    )
+                    if os.path.isfile(_media_work):
+                        os.remove(_media_work)
+            finally:
+                _chunks.close()
+            if not os.path.isfile(readtexttools.get_my_lock(self.locker)):
+                print("[>] Stop!")
+                self.ok = False
+                return True
+        self.common.finish_playback()
         readtexttools.unlock_my_lock(self.locker)
         return retval
 
@@ -116,6 +116,9 @@ class RhvoiceLocalHost(object):
         _common = netcommon.LocalCommons()
         self.locker = _common.locker
         self.common = _common
+        # A `netsplit.ChunkPlanner` to shorten the first chunks when speaking
+        # aloud, or `None` to use the splitter chunks as they are.
+        self.chunk_planner = None
         self.add_pause = _common.add_pause
         self.pause_list = _common.pause_list
         self.base_curl = _common.base_curl
@@ -179,20 +182,11 @@ class RhvoiceLocalHost(object):
         _url = "".join([self.url, "/info"])
         _default_list = self.checklist
         try:
-            response = urllib.request.urlopen(_url)
-            data_response = response.read()
+            data_response = self.common.capability_request(_url, timeout=4)
             data = json.loads(data_response)
         except urllib.error.URLError:
             self.ok = False
             return _default_list
-        except AttributeError:
-            try:
-                response = urllib.urlopen(_url)
-                data_response = response.read()
-                data = json.loads(data_response)
-            except [AttributeError, urllib.error.URLError]:
-                self.ok = False
-                return _default_list
         except:
             return _default_list
         voice_lib = data["rhvoice_wrapper_voices_info"]
@@ -318,6 +312,30 @@ Checking {help_heading} voices for `{_iso_lang}`
                 return gendered_fallback
         return last_match
 
+    def _try_url_lib(self, my_url="", _media_work="", _end_wait=30) -> bool:
+        """Try getting a sound file for `my_url` from the audio cache or
+        using url_lib."""
+
+        def _do_synthesis():  # -> bool
+            try:
+                # See: <https://docs.python.org/3/library/urllib.request.html>
+                # See also: `/usr/lib/python3.xx/urllib/request.py
+                response_content = self.common.http_request(
+                    my_url, timeout=_end_wait
+                )
+                with open(_media_work, "wb") as _handle:
+                    _handle.write(response_content)
+                if os.path.isfile(_media_work):
+                    return os.path.getsize(os.path.realpath(_media_work)) != 0
+            except:
+                pass
+            return False
+
+        # The url includes the format, rate, voice and text.
+        return self.common.cached_synthesis(
+            _media_work, _do_synthesis, "rhvoice", my_url
+        )
+
     def read(
         self,
         _text="",
@@ -352,8 +370,7 @@ Checking {help_heading} voices for `{_iso_lang}`
                 readtexttools.unlock_my_lock(self.locker)
                 return True
         if bool(self.add_pause):
-            if any(_symbol in _text for _symbol in self.pause_list):
-                _text = _text.translate(self.add_pause).replace(".;", ".")
+            _text = netcommon.text_pipeline(_iso_lang, ["pause"]).run(_text)
         if os.path.isfile(_media_work):
             os.remove(_media_work)
         _view_json = self.debug and 1
@@ -380,15 +397,53 @@ Checking {help_heading} voices for `{_iso_lang}`
             _body_data = f"format={_audio_format}&rate={_length_scale}&pitch=50&volume=50&voice={q_voice}&text="
             # _method = "GET"
             _strips = "\n .;"
-            self.common.set_urllib_timeout(_ok_wait)
             _tries = 0
             readtexttools.lock_my_lock(self.locker)
             _no = "0" * 10
             if self.machine[-2:] == "64":
                 _netsplitlocal = netsplit.LocalHandler()
                 _items = _netsplitlocal.create_play_list(_text, _iso_lang, False)
+                if self.chunk_planner and not _out_path:
+                    _items = list(self.chunk_planner.plan(_items))
             else:
                 _items = _text.splitlines()
+            if _out_path and self.common.export_workers > 1 and len(_items) > 1:
+                # Exporting to a file: request several chunks at once, join
+                # the audio in order and encode it once.
+                _done = self.common.export_chunks(
+                    lambda _item, _work: self._try_url_lib(
+                        f'{_url}?{_body_data}"{urllib.parse.quote(_item)}"',
+                        _work,
+                        _end_wait,
+                    ),
+                    [
+                        _item.strip(_strips).strip()
+                        for _item in _items
+                        if len(_item.strip(_strips)) != 0
+                    ],
+                    _media_work,
+                    self.common.export_workers,
+                    self.locker,
+                )
+                if not os.path.isfile(readtexttools.get_my_lock(self.locker)):
+                    print("[>] Stop")
+                    return True
+                retval = False
+                if _done:
+                    retval = self.common.do_net_sound(
+                        _info,
+                        _media_work,
+                        _icon,
+                        _media_out,
+                        _audible,
+                        _visible,
+                        _writer,
+                        _size,
+                        _post_process,
+                        False,
+                    )
+                readtexttools.unlock_my_lock(self.locker)
+                return retval
             for _item in _items:
                 if not self.ok:
                     return False
@@ -407,19 +462,7 @@ Checking {help_heading} voices for `{_iso_lang}`
 
                 q_text = urllib.parse.quote(_item.strip())
                 my_url = f'{_url}?{_body_data}"{q_text}"'
-                try:
-                    # See: <https://docs.python.org/3/library/urllib.request.html>
-                    # See also: `/usr/lib/python3.xx/urllib/request.py
-                    req = urllib.request.Request(my_url)
-                    resp = urllib.request.urlopen(req)
-                    response_content = resp.read()
-                    with open(_media_work, "wb") as _handle:
-                        _handle.write(response_content)
-                    if os.path.isfile(_media_work):
-                        _done = os.path.getsize(os.path.realpath(_media_work)) != 0
-                except:
-                    _done = False
-                    break
+                _done = self._try_url_lib(my_url, _media_work, _end_wait)
                 if not _done:
                     readtexttools.unlock_my_lock(self.locker)
                     return False
@@ -439,5 +482,6 @@ Checking {help_heading} voices for `{_iso_lang}`
                     _post_process,
                     False,
                 )
+        self.common.finish_playback()
         readtexttools.unlock_my_lock(self.locker)
         return retval
@@ -8,15 +8,37 @@ Use
 
 import netsplit
 _netsplitlocal = netsplit.LocalHandler()
-_items = _netsplitlocal.create_play_list(_text, _iso_lang.split("-")[0])"""
+_items = _netsplitlocal.create_play_list(_text, _iso_lang.split("-")[0])
 
+To start speaking before the whole text is split, use the generator:
 
+for _item in _netsplitlocal.iter_play_list(_text, _iso_lang.split("-")[0]):
+    ..."""
+
+
+import bisect
+import collections
 import io
+import json
 import os
 import re
 import string
+import tempfile
 import unicodedata
 
+# Line breaks that do not follow a sentence ending become a period.
+LINE_BREAK_REGEX = re.compile(r"(?<![.!?])\n+")
+# Sentence endings when no `symbols.dic` patterns are available.
+FALLBACK_REGEX = re.compile(r"([.?!`—;:．！？—–。︁︒…])\s+")
+
+# Parsed `symbols.dic` patterns and compiled delimiter regexes, shared by
+# every `LocalHandler` and `SentenceSplitter` in the process.
+PATTERN_CACHE_SIZE = 8
+_PATTERN_CACHE = collections.OrderedDict()
+_REGEX_CACHE = collections.OrderedDict()
+# Set `READTEXTSYMBOLSCACHE=0` to skip the on-disk copy of the patterns.
+DISK_CACHE_OK = os.getenv("READTEXTSYMBOLSCACHE", "1") != "0"
+
 
 class LocalHandler(object):
     """Use data specific to Read Text Extension"""
@@ -38,6 +60,64 @@ class LocalHandler(object):
             return _text.splitlines()
         return []
 
+    def _symbols_files(self, _lang="en"):  # -> tuple
+        """Return the `symbols.dic` files to try for `_lang`, in order."""
+        # Specify a fallback location for systems that do not have a
+        # directory with speech-dispatcher locale resources.
+        local_dic = ""
+        l10n_dir = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "po", "_l10n"
+        )
+        if os.path.join(l10n_dir, "en", "symbols.dic"):
+            local_dic = os.path.join(l10n_dir, "en", "symbols.dic")
+        return (
+            "/usr/share/speech-dispatcher/locale/{0}/symbols.dic".format(_lang),
+            "/usr/share/speech-dispatcher/locale/en/symbols.dic",
+            local_dic,
+        )
+
+    def iter_play_list(self, _text="", _lang_str="en", _verbose=True):
+        """
+        Like `create_play_list`, but yields each chunk as soon as it is
+        ready, so a speech engine can start on the first chunk while the
+        rest of the text is split.
+
+        Example:
+            - `for _item in iter_play_list(open("book.txt"), "en"): ...`
+
+        Args:
+            _text (str or file object): The text to split, or an open text
+                file or other iterable of strings.
+            _lang_str (str): A short ISO language code, e.g., 'en'.
+            _verbose (bool): Print the exception if it occurs.
+
+        Yields:
+            str
+        """
+        if not _lang_str:
+            _lang_str = "es"
+        _lang = _lang_str.split("-")[0].split("_")[0].lower()
+        dic_file = ""
+        for _test in self._symbols_files(_lang):
+            if os.path.isfile(_test):
+                dic_file = _test
+                break
+        _count = 0
+        try:
+            for _item in split_text_iter(_text, dic_file, 250, 85, 4, False, True):
+                _count += 1
+                yield _item
+        except Exception as e:
+            if _count or not isinstance(_text, str):
+                raise
+            if _verbose:
+                print(
+                    "Exception in `iter_play_list`: {0}".format(e),
+                    "\nFalling back to a simple `split_sentence` method.",
+                )
+            for _item in self._split_sentence(_text.strip()):
+                yield _item
+
     def create_play_list(self, _text="", _lang_str="en", _verbose=True):  # -> list
         """
         Splits a long string of sentences or paragraphs into a list
@@ -75,23 +155,9 @@ class LocalHandler(object):
                 self.last_lang = _lang
 
             if not self.patterns:
-                # Specify a fallback location for systems that do not have a
-                # directory with speech-dispatcher locale resources.
-                local_dic = ""
-                l10n_dir = os.path.join(
-                    os.path.dirname(os.path.dirname(__file__)), "po", "_l10n"
-                )
-                if os.path.join(l10n_dir, "en", "symbols.dic"):
-                    local_dic = os.path.join(l10n_dir, "en", "symbols.dic")
-
-                for dic_file in (
-                    "/usr/share/speech-dispatcher/locale/{0}/symbols.dic".format(_lang),
-                    "/usr/share/speech-dispatcher/locale/en/symbols.dic",
-                    local_dic,
-                ):
+                for dic_file in self._symbols_files(_lang):
                     if os.path.isfile(dic_file):
                         self.patterns = extract_sentence_patterns(dic_file)
-                        _sentence_splitter = SentenceSplitter(self.patterns)
                         split_list = split_text_for_tts(
                             _text, dic_file, 250, 85, 4, False
                         )
@@ -125,9 +191,7 @@ class SentenceSplitter(object):
         """
         self.patterns = patterns
         if patterns:
-            self.delimiter_regex = re.compile(
-                "|".join("({})".format(p) for p in patterns)
-            )
+            self.delimiter_regex = compiled_delimiters(patterns)
         else:
             self.delimiter_regex = None
 
@@ -141,16 +205,14 @@ class SentenceSplitter(object):
         Returns:
             list: List of sentence strings.
         """
-        text = re.sub(r"(?<![.!?])\n+", ". ", text)
-        if not self.delimiter_regex:
+        return self._sentences(LINE_BREAK_REGEX.sub(". ", text))
 
-            def fallback_sentences(_text=""):
-                if _text:
-                    _text = re.sub(r"([.?!`—;:．！？—–。︁︒…])\s+", r"\1\n", _text)
-                    return _text.splitlines()
-                return []
-
-            return fallback_sentences(text)
+    def _sentences(self, text):
+        """Split text that already has its line breaks joined."""
+        if not self.delimiter_regex:
+            if text:
+                return FALLBACK_REGEX.sub(r"\1\n", text).splitlines()
+            return []
 
         sentences = []
         start = 0
@@ -166,6 +228,80 @@ class SentenceSplitter(object):
                 sentences.append(tail)
         return sentences
 
+    def _safe_cut(self, text):
+        """
+        Return the end of the last sentence in `text` that is followed by
+        white space and more text, or `0`. Splitting `text[:cut]` and
+        `text[cut:]` separately gives the same sentences as splitting
+        `text`, because no delimiter can start on white space.
+        """
+        cut = 0
+        if self.delimiter_regex:
+            for match in self.delimiter_regex.finditer(text):
+                end = match.end()
+                if text[end : end + 1].isspace() and text[end:].strip():
+                    cut = end
+        else:
+            for match in FALLBACK_REGEX.finditer(text):
+                if match.end() < len(text):
+                    cut = match.end()
+        return cut
+
+    def iter_regsplit(self, stream, strip=False, block_size=4096):
+        """
+        Yield the sentences of a text stream in the same order and with
+        the same content as `regsplit` gives for the whole text.
+
+        Args:
+            stream (str, file object or iterable of str): Input text.
+            strip (bool): Ignore white space at the start and end of the
+                text, like `regsplit(text.strip())`.
+            block_size (int): Characters to read from a file at a time.
+
+        Yields:
+            str: Each sentence.
+        """
+        raw = ""  # text with line breaks that are not joined yet
+        prev = ""  # last character that was joined
+        text = ""  # joined text that is not split yet
+        for block in _iter_text_blocks(stream, block_size):
+            if strip and not prev and not raw:
+                block = block.lstrip()
+            raw += block
+            # Keep trailing white space back until we know where it ends.
+            keep = len(raw.rstrip())
+            if keep == 0:
+                continue
+            text += LINE_BREAK_REGEX.sub(". ", prev + raw[:keep])[len(prev) :]
+            prev = raw[keep - 1]
+            raw = raw[keep:]
+            cut = self._safe_cut(text)
+            if cut:
+                for sentence in self._sentences(text[:cut]):
+                    yield sentence
+                text = text[cut:]
+        if raw and not strip:
+            text += LINE_BREAK_REGEX.sub(". ", prev + raw)[len(prev) :]
+        for sentence in self._sentences(text):
+            yield sentence
+
+
+def _iter_text_blocks(stream, block_size=4096):
+    """Yield pieces of `stream`, which can be a string, an open text file
+    or another iterable of strings, such as a list of lines."""
+    if isinstance(stream, str):
+        for start in range(0, len(stream), block_size):
+            yield stream[start : start + block_size]
+    elif hasattr(stream, "read"):
+        while True:
+            block = stream.read(block_size)
+            if not block:
+                break
+            yield block
+    else:
+        for block in stream:
+            yield block
+
 
 def is_punctuation(ch=""):  # -> bool:
     """Return `True` if the character at the end of the string uses
@@ -354,10 +490,83 @@ def _analyse_sentence_patterns(patterns, filestream=None, keys=None):
     return None
 
 
+def _lru_get(cache, key):
+    """Return the cached value for `key` and mark it as recently used, or
+    return `None`."""
+    value = cache.get(key)
+    if value is not None:
+        try:
+            cache.move_to_end(key)
+        except KeyError:
+            # Another thread dropped it; the value is still good.
+            pass
+    return value
+
+
+def _lru_put(cache, key, value):
+    """Cache `value` for `key`, dropping the least recently used entry if
+    the cache is full."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > PATTERN_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _disk_cache_file():  # -> str
+    """Return the path of the on-disk pattern cache, or `""`."""
+    if not DISK_CACHE_OK:
+        return ""
+    try:
+        import readtexttools
+
+        _dir = readtexttools.user_cache_dir("symbols")
+    except (ImportError, AttributeError, TypeError):
+        return ""
+    if not _dir:
+        return ""
+    return os.path.join(_dir, "sentence_patterns.json")
+
+
+def _read_disk_cache(cache_file=""):  # -> dict
+    """Read the on-disk pattern cache, ignoring a missing or broken file."""
+    try:
+        with io.open(cache_file, mode="r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data
+    except (IOError, OSError, ValueError):
+        pass
+    return {}
+
+
+def _write_disk_cache(cache_file="", disk_key="", patterns=None):  # -> bool
+    """Add `patterns` to the on-disk cache. The new file replaces the old
+    one in one step, so other processes never read a partial file."""
+    data = _read_disk_cache(cache_file)
+    data[disk_key] = list(patterns)
+    # Keep only the newest entries.
+    for old_key in list(data)[:-PATTERN_CACHE_SIZE]:
+        del data[old_key]
+    try:
+        handle, temp = tempfile.mkstemp(
+            prefix=".part-", dir=os.path.dirname(cache_file)
+        )
+        with os.fdopen(handle, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp, cache_file)
+        return True
+    except (IOError, OSError, ValueError):
+        return False
+
+
 def extract_sentence_patterns(file_path="", keys=None):
     """
     Extract regex patterns for sentence and phrase endings from a symbols.dic file.
 
+    The patterns are cached by file path, modification time and `keys`, in
+    memory and in the user cache directory, so repeated calls and new
+    processes do not parse the same file again.
+
     Args:
         file_path (str): Path to the symbols.dic file.
         keys (list or None): Keys to match (default: ["sentence ending", "phrase ending"]).
@@ -373,11 +582,53 @@ def extract_sentence_patterns(file_path="", keys=None):
         _analyse_sentence_patterns(patterns, None, keys)
         return patterns
 
+    try:
+        file_path = os.path.realpath(file_path)
+        stat = os.stat(file_path)
+        cache_key = (file_path, stat.st_mtime_ns, stat.st_size, tuple(keys))
+    except (OSError, TypeError):
+        cache_key = None
+    if cache_key:
+        cached = _lru_get(_PATTERN_CACHE, cache_key)
+        if cached is not None:
+            return list(cached)
+        cache_file = _disk_cache_file()
+        disk_key = "\t".join(str(part) for part in cache_key[:3] + cache_key[3])
+        if cache_file:
+            cached = _read_disk_cache(cache_file).get(disk_key)
+            if isinstance(cached, list):
+                _lru_put(_PATTERN_CACHE, cache_key, tuple(cached))
+                return list(cached)
+
     with io.open(file_path, mode="r", encoding="utf-8") as f:
         _analyse_sentence_patterns(patterns, f, keys)
+    if cache_key:
+        _lru_put(_PATTERN_CACHE, cache_key, tuple(patterns))
+        if cache_file:
+            _write_disk_cache(cache_file, disk_key, patterns)
     return patterns
 
 
+def compiled_delimiters(patterns):
+    """
+    Return one compiled regex that matches any of the sentence or phrase
+    ending `patterns`, reusing the regex from an earlier call with the
+    same patterns.
+
+    Args:
+        patterns (list): List of regex pattern strings.
+
+    Returns:
+        re.Pattern
+    """
+    cache_key = tuple(patterns)
+    regex = _lru_get(_REGEX_CACHE, cache_key)
+    if regex is None:
+        regex = re.compile("|".join("({})".format(p) for p in patterns))
+        _lru_put(_REGEX_CACHE, cache_key, regex)
+    return regex
+
+
 def enforce_length_per_sentence(
     sentences,
     default_max_chars=250,
@@ -413,6 +664,31 @@ def enforce_length_per_sentence(
         list of str: A list of sentences or sentence fragments that meet the
         character and byte constraints.
     """
+    return list(
+        iter_enforce_length(
+            sentences,
+            default_max_chars,
+            cjk_max_chars,
+            max_bytes,
+            phrase_delims,
+            debug,
+        )
+    )
+
+
+def iter_enforce_length(
+    sentences,
+    default_max_chars=250,
+    cjk_max_chars=85,
+    max_bytes=250,
+    phrase_delims=None,
+    debug=False,
+):
+    """
+    Generator version of `enforce_length_per_sentence`. Yields each
+    sentence or sentence fragment as soon as it is ready, so `sentences`
+    can be a generator too.
+    """
     if phrase_delims is None:
         phrase_delims = {",", "(", "…"}  # U+2026 is Unicode ellipsis
 
@@ -420,31 +696,15 @@ def enforce_length_per_sentence(
         """Check if string fits within max_bytes when UTF-8 encoded."""
         return len(s.encode("utf-8")) <= max_bytes
 
-    result = []
     for sentence in sentences:
         # Pick char limit based on script
         max_chars = cjk_max_chars if contains_cjk(sentence) else default_max_chars
 
         # First enforce character limit
         while len(sentence) > max_chars:
-            split_point = -1
-            split_reason = "fallback"
-
-            for delim in phrase_delims:
-                idx = sentence.rfind(delim, 0, max_chars)
-                if idx > split_point:
-                    split_point = idx + len(delim)
-                    split_reason = "phrase delimiter '{}'".format(delim)
-
-            if split_point == -1:
-                idx = sentence.rfind(" ", 0, max_chars)
-                if idx != -1:
-                    split_point = idx
-                    split_reason = "space fallback"
-
-            if split_point == -1:
-                split_point = max_chars
-                split_reason = "hard length cut"
+            split_point, split_reason = phrase_split_point(
+                sentence, max_chars, phrase_delims
+            )
 
             if debug:
                 print(
@@ -453,29 +713,120 @@ def enforce_length_per_sentence(
                     )
                 )
 
-            result.append(sentence[:split_point].strip())
+            yield sentence[:split_point].strip()
             sentence = sentence[split_point:].lstrip()
 
         # Then enforce byte limit
-        while not within_byte_limit(sentence):
-            # Find largest substring that fits
-            for i in range(len(sentence), 0, -1):
-                if within_byte_limit(sentence[:i]):
-                    if debug:
-                        print("[DEBUG] Byte-limit split at {0} bytes".format(i))
-                    result.append(sentence[:i].strip())
-                    sentence = sentence[i:].lstrip()
-                    break
+        if not within_byte_limit(sentence):
+            for piece in split_at_byte_limit(sentence, max_bytes, debug):
+                yield piece
+            continue
 
         if sentence:
-            result.append(sentence)
+            yield sentence
 
-    return result
+
+def phrase_split_point(sentence="", max_chars=250, phrase_delims=None):
+    """
+    Find where to cut `sentence` so the first part has at most `max_chars`
+    characters: after the last phrase delimiter, else at the last space,
+    else at `max_chars`.
+
+    Args:
+        sentence (str): A sentence that is longer than `max_chars`.
+        max_chars (int): Largest number of characters in the first part.
+        phrase_delims (set of str, optional): Delimiters to break on.
+            Defaults to {",", "(", "…"}.
+
+    Returns:
+        tuple: The split point and a short description of the reason.
+    """
+    if phrase_delims is None:
+        phrase_delims = {",", "(", "…"}  # U+2026 is Unicode ellipsis
+    split_point = -1
+    split_reason = "fallback"
+
+    for delim in phrase_delims:
+        idx = sentence.rfind(delim, 0, max_chars)
+        if idx > split_point:
+            split_point = idx + len(delim)
+            split_reason = "phrase delimiter '{}'".format(delim)
+
+    if split_point == -1:
+        idx = sentence.rfind(" ", 0, max_chars)
+        if idx != -1:
+            split_point = idx
+            split_reason = "space fallback"
+
+    if split_point == -1:
+        split_point = max_chars
+        split_reason = "hard length cut"
+    return split_point, split_reason
+
+
+def utf8_offsets(text=""):  # -> list
+    """Return the UTF-8 byte offset of each character boundary in `text`,
+    so `offsets[i]` is `len(text[:i].encode("utf-8"))`."""
+    offsets = [0]
+    total = 0
+    for ch in text:
+        code = ord(ch)
+        if code < 0x80:
+            total += 1
+        elif code < 0x800:
+            total += 2
+        elif code < 0x10000:
+            total += 3
+        else:
+            total += 4
+        offsets.append(total)
+    return offsets
+
+
+def split_at_byte_limit(sentence="", max_bytes=250, debug=False):
+    """
+    Yield the longest pieces of `sentence` that fit in `max_bytes` when
+    UTF-8 encoded, stripping white space at each cut.
+
+    The byte offsets are computed once, and each cut is a binary search,
+    so long runs of CJK characters or emoji without delimiters split in
+    linear time.
+
+    Args:
+        sentence (str): A sentence that might be too long.
+        max_bytes (int): Hard limit of bytes per piece.
+        debug (bool): If True, print each split.
+
+    Yields:
+        str: The pieces of `sentence`, in order.
+    """
+    offsets = utf8_offsets(sentence)
+    start = 0
+    end = len(sentence)
+    while offsets[end] - offsets[start] > max_bytes:
+        # Largest `cut` where `sentence[start:cut]` fits in `max_bytes`
+        cut = bisect.bisect_right(offsets, offsets[start] + max_bytes, start) - 1
+        if cut <= start:
+            # One character is larger than `max_bytes`.
+            cut = start + 1
+        if debug:
+            print("[DEBUG] Byte-limit split at {0} bytes".format(cut - start))
+        yield sentence[start:cut].strip()
+        start = cut
+        while start < end and sentence[start].isspace():
+            start += 1
+    if start < end:
+        yield sentence[start:]
 
 
 def merge_short_chunks(chunks, min_len=3, debug=False):
     """Merge chunks shorter than min_len unless they are valid short fragments."""
-    merged = []
+    return list(iter_merge_short_chunks(chunks, min_len, debug))
+
+
+def iter_merge_short_chunks(chunks, min_len=3, debug=False):
+    """Generator version of `merge_short_chunks`. A short chunk waits for
+    the next chunk, so the output is one chunk behind the input at most."""
     buffer = ""
     for chunk in chunks:
         stripped = chunk.strip()
@@ -488,10 +839,10 @@ def merge_short_chunks(chunks, min_len=3, debug=False):
                 buffer = stripped
         else:
             if buffer:
-                merged.append((buffer + " " + stripped).strip())
+                yield (buffer + " " + stripped).strip()
                 buffer = ""
             else:
-                merged.append(chunk)
+                yield chunk
             if debug and len(stripped) < min_len:
                 print(
                     "[DEBUG] Keeping short chunk '{}' as valid fragment".format(
@@ -499,8 +850,7 @@ def merge_short_chunks(chunks, min_len=3, debug=False):
                     )
                 )
     if buffer:
-        merged.append(buffer)
-    return merged
+        yield buffer
 
 
 def split_text_for_tts(
@@ -531,3 +881,213 @@ def split_text_for_tts(
     )
     chunks = merge_short_chunks(chunks, min_chunk_len, debug=debug)
     return chunks
+
+
+def split_text_iter(
+    text,
+    symbols_file_path="",
+    default_max_chars=250,
+    cjk_max_chars=85,
+    min_chunk_len=4,
+    debug=False,
+    strip=False,
+    block_size=4096,
+):
+    """
+    Generator version of `split_text_for_tts` that reads `text` a block at a
+    time and yields each chunk when it is ready. The chunks are the same as
+    the list that `split_text_for_tts` returns for the whole text.
+
+    Args:
+        text (str, file object or iterable of str): Input text to split.
+        symbols_file_path (str): Path to Speech Dispatcher symbols.dic file.
+        default_max_chars (int): Max chars for non-CJK sentences.
+        cjk_max_chars (int): Max chars for CJK sentences.
+        strip (bool): Ignore white space at the start and end of the text.
+        block_size (int): Characters to read from a file at a time.
+
+    Yields:
+        str: Each TTS-friendly text chunk.
+    """
+    patterns = extract_sentence_patterns(symbols_file_path)
+    splitter = SentenceSplitter(patterns)
+    sentences = splitter.iter_regsplit(text, strip, block_size)
+    chunks = iter_enforce_length(
+        sentences, default_max_chars, cjk_max_chars, debug=debug
+    )
+    for chunk in iter_merge_short_chunks(chunks, min_chunk_len, debug=debug):
+        yield chunk
+
+
+class ChunkPlanner(object):
+    """
+    Plan chunk sizes for a quick start. The first chunks are short, so the
+    first audio arrives quickly, and later chunks grow toward the largest
+    size that an engine handles well, so there are fewer requests.
+
+    Example:
+        _planner = ChunkPlanner(400, 60)
+        for _item in _planner.plan(LocalHandler().iter_play_list(_text)):
+            ...
+    """
+
+    def __init__(
+        self,
+        max_chars=250,
+        first_chars=60,
+        lead_chunks=2,
+        growth=2.0,
+        max_bytes=250,
+        cjk_ratio=0.34,
+    ):
+        """
+        Args:
+            max_chars (int): Largest chunk, in Roman characters.
+            first_chars (int): Size of the first chunk.
+            lead_chunks (int): Number of short chunks that are cut at
+                phrase delimiters before chunks can grow.
+            growth (float): How much the limit grows for each chunk.
+            max_bytes (int): Hard limit of bytes per chunk when UTF-8
+                encoded.
+            cjk_ratio (float): CJK limit as a part of the Roman limit;
+                85 / 250 by default, like `split_text_for_tts`.
+        """
+        self.max_chars = max(1, max_chars)
+        self.first_chars = max(1, min(first_chars, self.max_chars))
+        self.lead_chunks = lead_chunks
+        self.growth = max(1.0, growth)
+        self.max_bytes = max_bytes
+        self.cjk_ratio = cjk_ratio
+
+    def limit(self, index=0, text=""):  # -> int
+        """Return the character limit for chunk number `index`."""
+        chars = self.max_chars
+        if index < 32:
+            chars = min(chars, int(self.first_chars * self.growth**index))
+        if contains_cjk(text):
+            chars = int(chars * self.cjk_ratio)
+        return max(1, chars)
+
+    def _fits(self, text="", index=0):  # -> bool
+        """Can `text` be chunk number `index`?"""
+        return len(text) <= self.limit(index, text) and (
+            len(text.encode("utf-8", "replace")) <= self.max_bytes
+        )
+
+    def plan(self, chunks):
+        """
+        Yield new chunks from the `chunks` of a splitter, such as
+        `split_text_iter`, in the same order and with the same words.
+        The first `lead_chunks` are cut at phrase delimiters if they are
+        too long for their position. After that, short chunks are joined
+        while the result fits in the limit for its position.
+
+        Args:
+            chunks (iterable of str): TTS-ready chunks.
+
+        Yields:
+            str: Each planned chunk.
+        """
+        index = 0
+        pending = ""
+        for chunk in chunks:
+            while index < self.lead_chunks and chunk:
+                if self._fits(chunk, index):
+                    break
+                split_point = phrase_split_point(chunk, self.limit(index, chunk))[0]
+                head = chunk[:split_point].strip()
+                chunk = chunk[split_point:].lstrip()
+                if head:
+                    yield head
+                    index += 1
+            if not chunk:
+                continue
+            if index < self.lead_chunks:
+                yield chunk
+                index += 1
+                continue
+            if pending:
+                joined = " ".join([pending, chunk])
+                if self._fits(joined, index):
+                    pending = joined
+                    continue
+                yield pending
+                index += 1
+            pending = chunk
+        if pending:
+            yield pending
+
+
+def _quadratic_byte_split(sentence="", max_bytes=250):  # -> list
+    """The byte limit loop that `split_at_byte_limit` replaced. It tries
+    every prefix from the longest down. Only `benchmark` uses it."""
+    result = []
+    while len(sentence.encode("utf-8")) > max_bytes:
+        for i in range(len(sentence), 0, -1):
+            if len(sentence[:i].encode("utf-8")) <= max_bytes:
+                result.append(sentence[:i].strip())
+                sentence = sentence[i:].lstrip()
+                break
+    if sentence:
+        result.append(sentence)
+    return result
+
+
+def benchmark(repeat=3):  # -> None
+    """Compare `split_at_byte_limit` with the old quadratic byte limit loop
+    on long sentences without delimiters."""
+    import timeit
+
+    cases = [
+        ("CJK, 4,000 characters", "漢字かなカナ한국어" * 500),
+        ("Emoji, 2,000 characters", "😀🎉🚀👍" * 500),
+        ("Mixed with spaces, 8,000 characters", "データ test 😀 " * 800),
+        ("ASCII, 20,000 characters", "abcdefghij" * 2000),
+    ]
+    print("Byte limit split (250 bytes), best of {0}\n".format(repeat))
+    for label, text in cases:
+        new = list(split_at_byte_limit(text, 250))
+        old = _quadratic_byte_split(text, 250)
+        if new != old:
+            print("* {0}: results differ!".format(label))
+            continue
+        t_new = min(
+            timeit.repeat(
+                lambda: list(split_at_byte_limit(text, 250)), number=1, repeat=repeat
+            )
+        )
+        t_old = min(
+            timeit.repeat(
+                lambda: _quadratic_byte_split(text, 250), number=1, repeat=repeat
+            )
+        )
+        print(
+            "* {0}: {1:.4f} s -> {2:.4f} s ({3:.0f}x), {4} pieces".format(
+                label, t_old, t_new, t_old / max(t_new, 1e-9), len(new)
+            )
+        )
+
+
+def main():  # -> None
+    """Print info, or run the splitter benchmark with `--benchmark`."""
+    import sys
+
+    if "--benchmark" in sys.argv[1:]:
+        benchmark()
+        return
+    print(
+        """Text splitter for network speech engines
+========================================
+
+* Split text into chunks using `LocalHandler().create_play_list()`
+* Run `python3 netsplit.py --benchmark` to time the byte limit splitter
+
+{0}
+""".format(
+            os.path.abspath(__file__)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
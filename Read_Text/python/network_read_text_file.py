@@ -186,7 +186,15 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import os
 import sys
+import time
 
+try:
+    import queue
+    import threading
+
+    THREADS_OK = True
+except (AttributeError, ImportError):
+    THREADS_OK = False
 try:
     import getopt
 except (ImportError, AssertionError, AttributeError):
@@ -230,10 +238,168 @@ try:
     import netcommon
 except (AttributeError, ImportError):
     pass
+try:
+    import netsplit
+except (AttributeError, ImportError, SyntaxError, TypeError):
+    pass
 
 
 ENGINE_IDS = ["gtts", "mary", "mimic3", "opentts", "piper", "rhvoice"]
 
+# Adaptive chunk sizes for speaking aloud: `[first chunk, largest chunk,
+# largest chunk in bytes]`. Engines that send the text in the url keep
+# the byte limit of the splitter. An engine that is not listed uses the
+# splitter chunks as they are. Set `READTEXTCHUNKPLAN=0` to turn it off.
+CHUNK_PLANS = {
+    "piper": [60, 400, 1000],
+    "mimic3": [60, 360, 250],
+    "rhvoice": [60, 250, 250],
+    "opentts": [60, 360, 250],
+    "mary": [60, 180, 250],
+}
+
+
+def chunk_planner(engine=""):  # -> netsplit.ChunkPlanner | None
+    """Return a chunk planner that starts `engine` with a short chunk,
+    or `None` to keep the fixed chunk sizes."""
+    if os.getenv("READTEXTCHUNKPLAN", "1") == "0":
+        return None
+    if engine not in CHUNK_PLANS:
+        return None
+    _first, _largest, _bytes = CHUNK_PLANS[engine]
+    try:
+        return netsplit.ChunkPlanner(_largest, _first, 2, 2.0, _bytes)
+    except NameError:
+        return None
+
+
+# Local speech servers in the order that `network_main` prefers them.
+PROBE_ORDER = ["piper", "mimic3", "rhvoice", "opentts", "mary"]
+# Seconds to wait for all of the local servers together.
+PROBE_DEADLINE = 8.0
+# Clients that `network_ok` found, kept for the next `network_main` call.
+_PROBED = {}
+
+
+def clean_vox(_vox=""):  # -> str
+    """Remove quotes and spaces from a `--voice` argument, and use lower
+    case for a speech-dispatcher voice id."""
+    _vox = str(_vox).strip("'\" \t\n")
+    try:
+        if netcommon.is_voice_id_formatted_for_speechd(_vox):
+            _vox = _vox.lower()
+    except NameError:
+        pass
+    return _vox
+
+
+def probe_engine(engine="", _iso_lang="en-US", _local_url="", _vox=""):
+    # -> object | None
+    """Create the client for `engine` and check that its server answers
+    and supports the language or voice, the same way that `network_main`
+    does. Returns the ready client, or `None`."""
+    try:
+        if engine == "piper":
+            _client = netpiper.GPLPiperClass()
+            _ok = _client.language_supported(_iso_lang, _local_url, _vox)
+        elif engine == "mimic3":
+            _client = netmimic3.Mimic3Class()
+            _ok = _client.language_supported(
+                _iso_lang, _local_url, normalize_vox(_vox)
+            )
+        elif engine == "rhvoice":
+            _client = netrhvoice.RhvoiceLocalHost()
+            _ok = _client.language_supported(_iso_lang, _local_url)
+        elif engine == "opentts":
+            _client = netopentts.OpenTTSClass()
+            _ok = _client.language_supported(_iso_lang, _local_url)
+        elif engine == "mary":
+            _client = netmary.MaryTtsClass()
+            _ok = _client.language_supported(_iso_lang, _local_url)
+        else:
+            return None
+    except NameError:
+        return None
+    if _ok:
+        return _client
+    return None
+
+
+def probe_engines(
+    _iso_lang="en-US", _local_url="", _vox="", deadline=PROBE_DEADLINE
+):  # -> dict
+    """
+    Check the local speech servers that `_vox` allows at the same time,
+    so a server that is down only costs time once, not once for each
+    engine before it.
+
+    Returns a dictionary of `engine: client` for engines up to the first
+    one in `PROBE_ORDER` that answered. The client is ready to `read`, or
+    `None` if the server did not answer, did not support the language or
+    did not answer within `deadline` seconds. Lower priority engines that
+    were not needed are not in the dictionary.
+    """
+    _vox = clean_vox(_vox)
+    _key = (_iso_lang, _local_url, _vox)
+    if _key in _PROBED:
+        # Found by `network_ok`. A client is only used for one reading.
+        return _PROBED.pop(_key)
+    _engines = [_engine for _engine in PROBE_ORDER if use_engine(_engine, _vox)]
+    _results = {}
+    if not _engines:
+        return _results
+    if not THREADS_OK:
+        for _engine in _engines:
+            _results[_engine] = probe_engine(_engine, _iso_lang, _local_url, _vox)
+            if _results[_engine]:
+                break
+        return _results
+    _end = time.time() + deadline
+    _answers = queue.Queue()
+
+    def _probe(_engine):  # -> None
+        try:
+            _answers.put(
+                (_engine, probe_engine(_engine, _iso_lang, _local_url, _vox), None)
+            )
+        except Exception as e:
+            _answers.put((_engine, None, e))
+
+    # Daemon threads, so a server that is still timing out does not keep
+    # the process running after the deadline.
+    for _engine in _engines:
+        threading.Thread(target=_probe, args=(_engine,), daemon=True).start()
+    _answered = {}
+    for _engine in _engines:
+        while _engine not in _answered:
+            try:
+                _name, _client, _error = _answers.get(
+                    timeout=max(0, _end - time.time())
+                )
+            except queue.Empty:
+                break
+            _answered[_name] = (_client, _error)
+        if _engine not in _answered:
+            print("[>] `{0}` did not answer in time".format(_engine))
+            _results[_engine] = None
+            continue
+        _client, _error = _answered[_engine]
+        if _error is not None:
+            raise _error
+        _results[_engine] = _client
+        if _client:
+            break
+    return _results
+
+
+def probed_client(_probes=None, engine="", _iso_lang="en-US", _local_url="", _vox=""):
+    # -> object | None
+    """Return the client that `probe_engines` found for `engine`. If the
+    probe did not get as far as `engine`, check it now."""
+    if _probes is not None and engine in _probes:
+        return _probes[engine]
+    return probe_engine(engine, _iso_lang, _local_url, _vox)
+
 
 def usage():  # -> None
     """
@@ -295,40 +461,11 @@ def network_problem(voice="default"):  # -> str
 
 def network_ok(_iso_lang="en-US", _local_url="", requested_voice=""):  # -> bool
     """Do at least one of the classes support an on-line speech library?"""
-    _continue = False
-    if not _continue:
-        try:
-            _piper = netpiper.GPLPiperClass()
-            _continue = _piper.language_supported(
-                _iso_lang, _local_url, requested_voice
-            )
-        except NameError:
-            pass
-    if not _continue:
-        try:
-            _mimic3 = netmimic3.Mimic3Class()
-            _continue = _mimic3.language_supported(_iso_lang, _local_url)
-        except NameError:
-            pass
-    if not _continue:
-        try:
-            _rhvoice_rest = netrhvoice.RhvoiceLocalHost()
-            _continue = _rhvoice_rest.language_supported(_iso_lang, _local_url)
-        except NameError:
-            pass
-    if not _continue:
-        try:
-            _opentts = netopentts.OpenTTSClass()
-            if _opentts.language_supported(_iso_lang, _local_url):
-                _continue = True
-        except NameError:
-            pass
-    if not _continue:
-        try:
-            _mary_tts = netmary.MaryTtsClass()
-            _continue = _mary_tts.language_supported(_iso_lang, _local_url)
-        except NameError:
-            pass
+    _probes = probe_engines(_iso_lang, _local_url, requested_voice)
+    _continue = any(_probes.values())
+    if _continue:
+        # Let the next `network_main` call use the client that answered.
+        _PROBED[(_iso_lang, _local_url, clean_vox(requested_voice))] = _probes
     if not _continue:
         try:
             _gtts_class = netgtts.GoogleTranslateClass()
@@ -496,10 +633,9 @@ def network_main(
         "process_audio_media",
         "process_stream_media",  # Look for best streaming option.
     ]
-    _vox = _vox.strip("'\" \t\n")
-
-    if netcommon.is_voice_id_formatted_for_speechd(_vox):
-        _vox = _vox.lower()
+    _vox = clean_vox(_vox)
+    # Check every local server at once, then use the clients that answered.
+    _probes = probe_engines(_iso_lang, _local_url, _vox)
     # Prioritize speech engines that use json to communicate data
     # because text tables can use ambiguous labels (i. e.: `NA`)
     # Prioritize engines where everything can be achieved using `urllib`
@@ -511,9 +647,10 @@ def network_main(
     _g_class_ok = True
     if use_engine("piper", _vox):
         try:
-            _piper = netpiper.GPLPiperClass()
+            _piper = probed_client(_probes, "piper", _iso_lang, _local_url, _vox)
             _ssml = False
-            if _piper.language_supported(_iso_lang, _local_url, _vox):
+            if _piper:
+                _piper.chunk_planner = chunk_planner("piper")
                 _vox = normalize_vox(_vox)
                 _piper.read(
                     _text.strip(),
@@ -537,9 +674,10 @@ def network_main(
 
     if use_engine("mimic3", _vox):
         try:
-            _mimic3 = netmimic3.Mimic3Class()
+            _mimic3 = probed_client(_probes, "mimic3", _iso_lang, _local_url, _vox)
             _vox = normalize_vox(_vox)
-            if _mimic3.language_supported(_iso_lang, _local_url, _vox):
+            if _mimic3:
+                _mimic3.chunk_planner = chunk_planner("mimic3")
                 if not _mimic3.spd_voice_to_mimic3_voice(_iso_lang, _local_url, _vox):
                     # Check the returned value:
                     # - *str* language/model#speaker: e.g.: `en_US/cmu-arctic_low#lnh` (`True`)
@@ -579,8 +717,11 @@ Could not match a Mimic3 model with `{0}`.
     if use_engine("rhvoice", _vox):
         _vox = normalize_vox(_vox)
         try:
-            _rhvoice_rest = netrhvoice.RhvoiceLocalHost()
-            if _rhvoice_rest.language_supported(_iso_lang, _local_url):
+            _rhvoice_rest = probed_client(
+                _probes, "rhvoice", _iso_lang, _local_url, _vox
+            )
+            if _rhvoice_rest:
+                _rhvoice_rest.chunk_planner = chunk_planner("rhvoice")
                 _rhvoice_rest.read(
                     _text,
                     _iso_lang,
@@ -604,8 +745,9 @@ Could not match a Mimic3 model with `{0}`.
     if use_engine("opentts", _vox):
         _vox = normalize_vox(_vox)
         try:
-            _opentts = netopentts.OpenTTSClass()
-            if _opentts.language_supported(_iso_lang, _local_url):
+            _opentts = probed_client(_probes, "opentts", _iso_lang, _local_url, _vox)
+            if _opentts:
+                _opentts.chunk_planner = chunk_planner("opentts")
                 _ssml = is_ssml(_text)
                 _opentts.spd_voice_to_opentts_voice(_vox, _iso_lang)
                 _opentts.read(
@@ -631,8 +773,9 @@ Could not match a Mimic3 model with `{0}`.
     if use_engine("mary", _vox):
         _vox = normalize_vox(_vox)
         try:
-            _marytts = netmary.MaryTtsClass()
-            if _marytts.language_supported(_iso_lang, _local_url):
+            _marytts = probed_client(_probes, "mary", _iso_lang, _local_url, _vox)
+            if _marytts:
+                _marytts.chunk_planner = chunk_planner("mary")
                 _ssml = is_ssml(_text)
                 if REQUESTS_OK:
                     if int(requests.__version__[0] == 1):
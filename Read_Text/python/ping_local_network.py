@@ -1,11 +1,29 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import os
 import subprocess
 import socket
 import platform
 import sys
+import tempfile
+import time
 import netcommon
+import readtexttools
+
+try:
+    import asyncio
+
+    ASYNCIO_OK = True
+except (ImportError, AssertionError):
+    ASYNCIO_OK = False
 
 import piper_read_text
+
+# Default ports of local speech servers: piper-server, MaryTTS and
+# mimic3-server, rhvoice-rest, OpenTTS.
+TTS_PORTS = [5000, 59125, 8080, 5500]
+
+
 class PingLocals(object):
     """"""
 
@@ -14,6 +32,13 @@ class PingLocals(object):
         Discover live hosts on a local IPv4 network.
         """
         self.active_hosts = None
+        self.max_connections = 256
+        self.connect_timeout = 0.6
+        self.scan_deadline = 4.0
+        try:
+            self.scan_ttl = float(os.getenv("READTEXTSCANTTL", "3600"))
+        except ValueError:
+            self.scan_ttl = 3600.0
 
     def ping(self, ip):
         system = platform.system()
@@ -73,6 +98,148 @@ class PingLocals(object):
         self.active_hosts = active_hosts
         return active_hosts
 
+    async def _connect(self, ip, port, limit):  # -> tuple | None
+        """Return `(ip, port)` if `ip` accepts a TCP connection on `port`
+        within `self.connect_timeout` seconds, otherwise `None`."""
+        async with limit:
+            try:
+                _reader, _writer = await asyncio.wait_for(
+                    asyncio.open_connection(ip, port), self.connect_timeout
+                )
+            except (OSError, asyncio.TimeoutError):
+                return None
+            _writer.close()
+            try:
+                await _writer.wait_closed()
+            except (OSError, AttributeError):
+                pass
+            return ip, port
+
+    async def _scan(self, ip_list, ports):  # -> dict
+        """Try every port on every address at the same time, at most
+        `self.max_connections` at once, and stop at `self.scan_deadline`."""
+        _limit = asyncio.Semaphore(self.max_connections)
+        _tasks = [
+            asyncio.ensure_future(self._connect(ip, port, _limit))
+            for ip in ip_list
+            for port in ports
+        ]
+        if not _tasks:
+            return {}
+        _done, _pending = await asyncio.wait(_tasks, timeout=self.scan_deadline)
+        for _task in _pending:
+            _task.cancel()
+        if _pending:
+            await asyncio.wait(_pending)
+        _found = {}
+        for _task in _done:
+            if _task.cancelled() or _task.exception() or not _task.result():
+                continue
+            _ip, _port = _task.result()
+            _found.setdefault(_ip, []).append(_port)
+        for _ip in _found:
+            _found[_ip].sort()
+        return _found
+
+    def scan_hosts(self, ip_list, ports=None):  # -> dict
+        """Return a dictionary of the addresses in `ip_list` that accept TCP
+        connections, with a sorted list of the open `ports` for each. Does
+        not start a process or look up host names for each address."""
+        if ports is None:
+            ports = TTS_PORTS
+        if not ASYNCIO_OK:
+            return {}
+        try:
+            return asyncio.run(self._scan(ip_list, ports))
+        except (OSError, RuntimeError):
+            return {}
+
+    def scan_services(self, ip_base="192.168.1", start=1, end=254, ports=None):
+        """
+        Look for local speech servers over the specified IP range by opening
+        TCP connections to their usual ports, and save the result.
+
+        Args:
+            ip_base (str): The first three octets of the network.
+            start (int): The starting value for the last octet (inclusive).
+            end (int): The ending value for the last octet (inclusive).
+            ports (list): Ports to try. The default is `TTS_PORTS`.
+
+        Returns:
+            Dictionary of `{ip: [port, ...]}` for the hosts that are serving.
+        """
+        _found = self.scan_hosts(
+            [f"{ip_base}.{i}" for i in range(start, end + 1)], ports
+        )
+        self.save_services(ip_base, _found)
+        return _found
+
+    def services_file(self):  # -> str
+        """Return the path of the saved scan results, or `""`."""
+        _dir = readtexttools.user_cache_dir("network")
+        if not _dir:
+            return ""
+        return os.path.join(_dir, "tts_services.json")
+
+    def load_services(self, ip_base=""):  # -> dict | None
+        """Return the saved scan results for `ip_base` if they are newer
+        than `self.scan_ttl` seconds, otherwise `None`."""
+        _path = self.services_file()
+        if not _path or self.scan_ttl <= 0:
+            return None
+        try:
+            with open(_path, "r", encoding="utf-8") as _file:
+                _saved = json.load(_file)
+            if _saved.get("network") != ip_base:
+                return None
+            if time.time() - _saved.get("time", 0) > self.scan_ttl:
+                return None
+            return dict(_saved["hosts"])
+        except (IOError, OSError, ValueError, KeyError, AttributeError, TypeError):
+            return None
+
+    def save_services(self, ip_base="", hosts=None):  # -> bool
+        """Save the scan results for `ip_base`, replacing the file in one
+        step."""
+        _path = self.services_file()
+        if not _path:
+            return False
+        try:
+            _handle, _temp = tempfile.mkstemp(
+                prefix=".part-", dir=os.path.dirname(_path)
+            )
+            with os.fdopen(_handle, "w", encoding="utf-8") as _file:
+                json.dump(
+                    {"network": ip_base, "time": time.time(), "hosts": hosts or {}},
+                    _file,
+                )
+            os.replace(_temp, _path)
+        except (IOError, OSError, ValueError):
+            return False
+        return True
+
+    def serving_hosts(self, port=5000, _ignore=None):  # -> list
+        """Return a sorted list of the other machines on the local LAN that
+        accept connections on `port`. Saved scan results are checked with
+        one connection per remembered host before scanning the subnet. If
+        no remembered host served `port`, scan again, because a server might
+        have started since the last scan."""
+        if not _ignore:
+            _ignore = ["127.0.0.1", netcommon.get_host_ip()]
+        ip_base, _start = self.guess_range_min()
+        _saved = self.load_services(ip_base)
+        _found = {}
+        if _saved is not None:
+            _remembered = [_ip for _ip in _saved if port in _saved[_ip]]
+            if _remembered:
+                _found = self.scan_hosts(_remembered, [port])
+        if not _found:
+            _found = self.scan_services(ip_base)
+        return sorted(
+            [_ip for _ip in _found if port in _found[_ip] and _ip not in _ignore],
+            key=lambda _ip: [int(_part) for _part in _ip.split(".")],
+        )
+
     def guess_range_min(self):  # -> Tuple[str, int]:
         """
         Determine the network prefix and the lowest IP within
@@ -306,10 +306,13 @@ Copyright (c) 2025 James Holgate
 
 
 import glob
+import hashlib
 import os
 import random
+import re
 import stat
 import sys
+import tempfile
 import time
 import urllib
 import warnings
@@ -337,6 +340,28 @@ try:
 except (ImportError, AssertionError):
     pass
 
+try:
+    import subprocess
+    import wave
+except (ImportError, AssertionError):
+    pass
+
+try:
+    import collections
+    import concurrent.futures
+    import importlib
+    import importlib.util
+    import itertools
+    import threading
+
+    # Only look for the packages here. Importing `onnxruntime` is slow, so
+    # `InProcessPiper` imports them the first time that it loads a model.
+    PIPER_MODULE_OK = all(
+        importlib.util.find_spec(_name) for _name in ["piper", "onnxruntime"]
+    )
+except (ImportError, AssertionError, ValueError):
+    PIPER_MODULE_OK = False
+
 try:
     import requests
 
@@ -348,6 +373,8 @@ except (ImportError, AssertionError, ModuleNotFoundError):
 import build_extension
 import find_replace_phonemes
 import netcommon
+import netsplit
+import piper_worker
 import readtexttools
 
 VLC_WINDOWS_INFO = """
@@ -370,6 +397,283 @@ To enable fast and free audio streaming for Windows Piper TTS, use
 VideoLAN [VLC Media Player Desktop](https://www.videolan.org)"""
 
 
+class InProcessPiper(object):
+    """Speak with piper models inside this Python process using the `piper`
+    package and `onnxruntime`, without starting a program or writing a
+    temporary file.
+
+    Loaded voices stay in memory (up to `max_voices`, least recently used
+    first out), so the next chunk or the next reading with the same model
+    starts at once. Set the `READTEXTPIPERINPROCESS` environment variable
+    to `0` to use the `piper` program instead."""
+
+    def __init__(self, max_voices: int = 2) -> None:
+        self.max_voices = max_voices
+        self.voices = collections.OrderedDict() if PIPER_MODULE_OK else None
+        self.lock = threading.Lock() if PIPER_MODULE_OK else None
+        self.module = None
+
+    def available(self) -> bool:
+        """Can this process load piper models?"""
+        return PIPER_MODULE_OK and os.getenv("READTEXTPIPERINPROCESS", "1") != "0"
+
+    def voice(self, _model: str = "", _config: str = "", use_cuda: bool = False):
+        """Return the loaded `PiperVoice` for `_model`, loading it if needed."""
+        _key = (_model, _config, use_cuda)
+        with self.lock:
+            if _key in self.voices:
+                self.voices.move_to_end(_key)
+                return self.voices[_key]
+            if self.module is None:
+                self.module = importlib.import_module("piper")
+            _voice = self.module.PiperVoice.load(
+                _model, config_path=_config or None, use_cuda=use_cuda
+            )
+            self.voices[_key] = _voice
+            while len(self.voices) > self.max_voices:
+                self.voices.popitem(last=False)
+            return _voice
+
+    def iter_pcm(
+        self,
+        _text: str = "",
+        _model: str = "",
+        _config: str = "",
+        speaker_id=None,
+        length_scale: float = 1,
+        noise_scale: float = 0.667,
+        noise_w: float = 0.8,
+        use_cuda: bool = False,
+    ):
+        """Phonemize and speak `_text` one sentence at a time, yielding the
+        16 bit mono audio of each sentence as soon as it is ready."""
+        _voice = self.voice(_model, _config, use_cuda)
+        if hasattr(_voice, "synthesize_stream_raw"):
+            # piper-tts 1.2
+            for _audio in _voice.synthesize_stream_raw(
+                _text,
+                speaker_id=speaker_id,
+                length_scale=length_scale,
+                noise_scale=noise_scale,
+                noise_w=noise_w,
+            ):
+                yield _audio
+            return
+        # piper-tts 1.3 and later (OHF-Voice/piper1-gpl)
+        _syn_config = self.module.SynthesisConfig(
+            speaker_id=speaker_id,
+            length_scale=length_scale,
+            noise_scale=noise_scale,
+            noise_w_scale=noise_w,
+        )
+        for _chunk in _voice.synthesize(_text, syn_config=_syn_config):
+            yield _chunk.audio_int16_bytes
+
+    def sample_rate(self, _model: str = "", _config: str = "") -> int:
+        """Return the sample rate of a loaded voice."""
+        for (_loaded, _loaded_config, _cuda), _voice in self.voices.items():
+            if _loaded == _model and _loaded_config == _config:
+                return int(_voice.config.sample_rate)
+        return 22050
+
+
+IN_PROCESS_PIPER = InProcessPiper()
+
+
+class VoicesCatalogue(object):
+    """Read records from a large piper `voices.json` file on demand.
+
+    The first use writes an index next to `voices.json` (or in the user
+    cache directory if that folder is read only) with the byte range of
+    each voice record and tables by language family, language code and
+    English language name. Later processes read the index and then only
+    the records that they ask for, instead of parsing the whole file.
+
+    The catalogue works like a read only dictionary of voice records:
+    `catalogue["en_GB-jenny_dioco-medium"]["language"]["code"]`."""
+
+    index_version = 1
+
+    def __init__(self, json_file: str = "", cache_size: int = 64) -> None:
+        self.json_file = json_file
+        self.cache_size = cache_size
+        self.records = collections.OrderedDict()
+        self.index = None
+
+    def _index_paths(self) -> list:
+        """Return the places to keep the index, in order of preference."""
+        _paths = [f"{self.json_file}.idx"]
+        _dir = readtexttools.user_cache_dir("piper")
+        if _dir:
+            _name = hashlib.sha256(self.json_file.encode("utf-8")).hexdigest()[:16]
+            _paths.append(os.path.join(_dir, f"voices_{_name}.idx"))
+        return _paths
+
+    def _stamp(self) -> list:
+        """Return the version, size and time of `voices.json`."""
+        _stat = os.stat(self.json_file)
+        return [self.index_version, _stat.st_size, _stat.st_mtime_ns]
+
+    def load(self) -> bool:
+        """Read the index, writing a new one if `voices.json` changed.
+        Returns `False` if there is no readable `voices.json`."""
+        if self.index is not None:
+            return True
+        try:
+            _stamp = self._stamp()
+        except (OSError, TypeError):
+            return False
+        for _path in self._index_paths():
+            try:
+                with open(_path, "r", encoding="utf-8") as _file:
+                    _index = json.load(_file)
+                if _index.get("stamp") == _stamp:
+                    self.index = _index
+                    break
+            except (IOError, OSError, ValueError, AttributeError):
+                continue
+        if self.index is None:
+            self.index = self.build(_stamp)
+        self.index["positions"] = dict(
+            (_key, _position) for _position, _key in enumerate(self.index["keys"])
+        )
+        return bool(self.index["keys"])
+
+    def build(self, _stamp=None) -> dict:
+        """Parse `voices.json` once and save an index of its records."""
+        _index = {
+            "stamp": _stamp,
+            "keys": [],
+            "offsets": [],
+            "families": {},
+            "codes": {},
+            "english_names": {},
+            "lookup": {},
+        }
+        try:
+            with open(self.json_file, "rb") as _file:
+                _raw = _file.read()
+            _text = _raw.decode("utf-8", "replace")
+        except (IOError, OSError):
+            return _index
+        _decoder = json.JSONDecoder()
+        _space = re.compile(r"[ \t\n\r,:]*")
+        _char = 0
+        _byte = 0
+
+        def _skip(_at: int) -> int:
+            return _space.match(_text, _at).end()
+
+        try:
+            _at = _skip(_text.index("{") + 1)
+            while _at < len(_text) and _text[_at] != "}":
+                _key, _at = _decoder.raw_decode(_text, _at)
+                _at = _skip(_at)
+                _record, _end = _decoder.raw_decode(_text, _at)
+                # Count the bytes of the text between the last record and
+                # this one, so that multi-byte characters keep their size.
+                _byte += len(_text[_char:_at].encode("utf-8"))
+                _size = len(_text[_at:_end].encode("utf-8"))
+                _char = _end
+                _index["keys"].append(_key)
+                _index["offsets"].append([_byte, _size])
+                _byte += _size
+                _at = _skip(_end)
+                self._add_to_tables(_index, _key, _record)
+        except (ValueError, IndexError, KeyError, TypeError, AttributeError):
+            pass
+        for _path in self._index_paths():
+            try:
+                _handle, _temp = tempfile.mkstemp(
+                    prefix=".part-", dir=os.path.dirname(_path)
+                )
+                with os.fdopen(_handle, "w", encoding="utf-8") as _file:
+                    json.dump(_index, _file)
+                os.replace(_temp, _path)
+                break
+            except (IOError, OSError, ValueError):
+                continue
+        return _index
+
+    def _add_to_tables(self, _index=None, _key: str = "", _record=None) -> None:
+        """Add the language and name fields of one record to the tables."""
+        _language = _record.get("language", {})
+        _index["families"].setdefault(_language.get("family", ""), []).append(_key)
+        _index["codes"].setdefault(_language.get("code", ""), []).append(_key)
+        _index["english_names"].setdefault(
+            _language.get("name_english", ""), _language.get("family", "")
+        )
+        _alias = "-".join([_record.get("name", ""), _record.get("quality", "")])
+        if _record.get("aliases"):
+            _alias = _record["aliases"][0]
+        for _field in [_record.get("key", _key), _alias, _record.get("name", "")]:
+            _index["lookup"].setdefault(_field, _key)
+
+    def __getitem__(self, _key: str):  # -> dict
+        if _key in self.records:
+            self.records.move_to_end(_key)
+            return self.records[_key]
+        if not self.load() or _key not in self.index["positions"]:
+            raise KeyError(_key)
+        _start, _size = self.index["offsets"][self.index["positions"][_key]]
+        with open(self.json_file, "rb") as _file:
+            _file.seek(_start)
+            _record = json.loads(_file.read(_size).decode("utf-8", "replace"))
+        self.records[_key] = _record
+        while len(self.records) > self.cache_size:
+            self.records.popitem(last=False)
+        return _record
+
+    def get(self, _key: str = "", default=None):  # -> dict | None
+        try:
+            return self[_key]
+        except KeyError:
+            return default
+
+    def __contains__(self, _key) -> bool:
+        return self.load() and _key in self.index["positions"]
+
+    def __iter__(self):
+        if self.load():
+            yield from self.index["keys"]
+
+    def __len__(self) -> int:
+        return len(self.index["keys"]) if self.load() else 0
+
+    def keys(self) -> list:
+        return list(self)
+
+    def values(self):
+        for _key in self:
+            yield self[_key]
+
+    def items(self):
+        for _key in self:
+            yield _key, self[_key]
+
+    def keys_for_family(self, _family: str = "") -> list:
+        """Return the keys of the voices for a language family like `en`."""
+        return list(self.index["families"].get(_family, [])) if self.load() else []
+
+    def keys_for_code(self, _code: str = "") -> list:
+        """Return the keys of the voices for a language code like `en_GB`."""
+        return list(self.index["codes"].get(_code, [])) if self.load() else []
+
+    def find(self, _query: str = ""):  # -> str
+        """Return the key of the first voice with the key, first alias or
+        name `_query`, or `""`."""
+        return self.index["lookup"].get(_query, "") if self.load() else ""
+
+    def family_for_english_name(self, _name: str = "") -> str:
+        """Return the language family of the first English language name
+        that starts `_name`, like `de` for `German (Germany)`, or `""`."""
+        if self.load():
+            for _english, _family in self.index["english_names"].items():
+                if _english and _name.startswith(_english):
+                    return _family
+        return ""
+
+
 class PiperTTSClass(object):
     """Piper TTS class"""
 
@@ -730,6 +1034,14 @@ user directory that you specify:
 
     {cmd} --voice='</path/to/myvoice.onnx>#4' {_file}
 
+To save the speech as an audio file instead of playing it, use:
+
+    {cmd} --language en-GB --output '<speech.ogg>' {_file}
+
+An export speaks several sentences at the same time using one `piper`
+process for each processor core. To use fewer processes, set the
+`READTEXTPIPERJOBS` environment variable.
+
 To update the configuration data to include the current list of
 online voice models and configuration files, use:
 
@@ -903,28 +1215,23 @@ not work with the python version.
         if file_data not in ["md5_digest", "size_bytes"]:
             file_data = "md5_digest"
         data = self._get_piper_dict()
-        for item in data.values():
-            _alias = "-".join([item["name"], item["quality"]])
-            if item["aliases"]:
-                _alias = item["aliases"][0]
-            for field in [item["key"], _alias, item["name"]]:
-                if _query == field:
-                    # Construct the ONNX path and fetch the MD5 digest
-                    _onnx_path = "/".join(
-                        [
-                            item["language"]["family"],
-                            item["language"]["code"],
-                            item["name"],
-                            item["quality"],
-                        ]
-                    )
-                    _onnx_file = f"{item['key']}.onnx"
-                    return (
-                        item["files"]
-                        .get(f"{_onnx_path}/{_onnx_file}", {})
-                        .get(file_data, "")
-                    )
-        return ""
+        if not data:
+            return ""
+        # The first voice with a matching key, first alias or name.
+        item = data.get(data.find(_query))
+        if not item:
+            return ""
+        # Construct the ONNX path and fetch the MD5 digest
+        _onnx_path = "/".join(
+            [
+                item["language"]["family"],
+                item["language"]["code"],
+                item["name"],
+                item["quality"],
+            ]
+        )
+        _onnx_file = f"{item['key']}.onnx"
+        return item["files"].get(f"{_onnx_path}/{_onnx_file}", {}).get(file_data, "")
 
     def link_home_dir_list(self, all_dir_list=None, _iso_lang: str = "en-US") -> bool:
         """Where onnx.json files exist in a posix home directory and files
@@ -966,9 +1273,33 @@ not work with the python version.
         data = self._get_piper_dict()
         if not data:
             return False
+        # Only read the records of the voices that have files in the list.
+        _home_items = [
+            _item
+            for _item in data
+            if any(_item in _file_path for _file_path in self.flat_list)
+        ]
+        # Check the models that need a new link at the same time. The loop
+        # below gets the remembered checksums.
+        _unlinked = []
+        for _item in _home_items:
+            _dest = os.path.join(
+                self.piper_voice_dir,
+                data[_item]["language"]["family"],
+                data[_item]["language"]["code"],
+                data[_item]["name"],
+                data[_item]["quality"],
+                f"{_item}.onnx",
+            )
+            if os.path.isfile(_dest):
+                continue
+            for _file_path in self.flat_list:
+                if _item in _file_path and os.path.isfile(f"{_file_path}.onnx"):
+                    _unlinked.append(os.path.realpath(f"{_file_path}.onnx"))
+        build_extension.calculate_md5s(_unlinked)
         for _extension in [".onnx.json", ".onnx", ""]:
             try:
-                for _item in data:
+                for _item in _home_items:
                     for _file_path in self.flat_list:
                         _key = data[_item]["key"]
                         if _key in _file_path:
@@ -1086,10 +1417,21 @@ Symbolic link created from `{_source}` to `{_dest}`"""
 
         return ""
 
-    def download_file(self, url: str, file_path: str) -> bool:
-        """Download a file. If the `requests` library is available, then the
-        function features resume support, a progress report and specific error
-        reports."""
+    def download_file(
+        self, url: str, file_path: str, expected_size: int = 0, expected_md5: str = ""
+    ) -> bool:
+        """Download a file. Large files download in parallel segments that
+        resume after an interruption, and the result must match the
+        `expected_size` and `expected_md5` when they are known. If the
+        `requests` library is available, then the fallback features resume
+        support, a progress report and specific error reports."""
+        if netcommon.HTTP_CLIENT_OK:
+            try:
+                return netcommon.SegmentedDownloader().download(
+                    url, file_path, expected_size, expected_md5
+                )
+            except (OSError, ValueError, urllib.error.URLError) as e:
+                print(f"Segmented download error: {e}")
         if not REQUESTS_OKAY:
             try:
                 urllib.request.urlretrieve(
@@ -1244,8 +1586,12 @@ that includes the `--update True` option.
         # current version of piper, or whether the files' checksums match.
         _model_paths = []
         _common = netcommon.LocalCommons()
+        _index = None
+        data = None
         if os.path.exists(self.json_file):
-            data = self._get_piper_dict()
+            _index = self._load_model_index(extension)
+            if not _index:
+                data = self._get_piper_dict()
         else:
             try:
                 _common.set_urllib_timeout(4)
@@ -1262,7 +1608,8 @@ that includes the `--update True` option.
                 )
                 self.ok = False
                 sys.exit(0)
-        if not self.pretty_json_write(data, self.json_file, iso_lang):
+            self.pretty_json_write(data, self.json_file, iso_lang)
+        if not _index and not data:
             _warning = f"WARNING: Missing {self.help_heading} File!"
             underline = len(_warning) * "="
             print(
@@ -1280,6 +1627,8 @@ voice models, then the generic json configuration will not recognize them.
 
 <{self.json_url}>"""
             )
+        if not _index:
+            _index = self._build_model_index(data, extension)
         # Use an English voice if a voice model is not available. This
         # is a common best practice for internationalization. The
         # client communicates that the program works, but you can tell
@@ -1292,73 +1641,45 @@ voice models, then the generic json configuration will not recognize them.
             "zzy_AQ",
         ]
         available_language = ""
-        model_max_voice = "0"
+        _entries = _index["entries"]
+        for _entry in _entries:
+            if _entry["key"] not in self.j_key_list:
+                self.j_key_list.append(_entry["key"])
+        # The first model with a matching key or name wins.
+        _match = _index["names"].get(_vox)
+        _found = set()
         for description in _description_list:
-            try:
-                for _item in data:
-                    if description == "zzy_AQ" and len(_model_paths) == 0:
-                        _description = "en"
-                        available_language = data[_item]["language"]["name_english"]
-                    else:
-                        _description = description
-                    # de_DE-thorsten_emotional-medium
-                    self.j_key = data[_item]["key"]
-                    self.j_key_list.append(self.j_key)
-                    self.j_lang = data[_item]["language"]["code"]  # de_DE
-                    # de
-                    self.j_concise_lang = data[_item]["language"]["family"]
-                    self.j_model = data[_item]["name"]  # thorsten_emotional
-                    self.j_quality = data[_item]["quality"]  # medium
-                    model_max_voice = str(max(0, data[_item]["num_speakers"] - 1))
-                    for self.j_path in [
-                        os.path.join(
-                            self.piper_voice_dir,
-                            self.j_concise_lang,
-                            self.j_lang,
-                            self.j_model,
-                            self.j_quality,
-                            f"{self.j_key}.{extension}",
-                        ),
-                        os.path.join(self.piper_voice_dir, f"{self.j_key}.{extension}"),
-                    ]:
-                        if _vox in [self.j_key, self.j_model]:
-                            return [self.j_path]
-                        elif self.j_lang.startswith(_description):
-                            if self.j_path not in _model_paths:
-                                if len(self.sample_uri) == 0:
-                                    self.untested_model = self.j_key
-                                    self.sample_uri = "/".join(
-                                        [
-                                            self.sample_webpage,
-                                            self.j_concise_lang,
-                                            self.j_lang,
-                                            self.j_model,
-                                            self.j_quality,
-                                            "sample.txt",
-                                        ]
-                                    )
-                                filter_qualities = False
-                                # There is no need to know the unlink result.
-                                self.unlink_bad_posix_symbolic_link(
-                                    self.j_path, filter_qualities
-                                )
-                                # We need to confirm that items are not
-                                # onnx placeholders that only contain
-                                # brief ASCII text.
-                                if self.j_path not in _model_paths and os.path.isfile(
-                                    self.j_path
-                                ):
-                                    if (
-                                        os.path.getsize(os.path.realpath(self.j_path))
-                                        > 1000
-                                    ):
-                                        _model_paths.append(self.j_path)
-                                        self.working_models.append(
-                                            f"{self.j_key}#{os.path.realpath(self.j_path)}#{model_max_voice}"
-                                        )
-                self._update_model_doc()
-            except IndexError:
-                pass
+            for _position, _entry in enumerate(_entries):
+                if _position == _match:
+                    return [_entry["paths"][0]]
+                if description == "zzy_AQ" and len(_model_paths) == 0:
+                    _description = "en"
+                    available_language = _entry["name_english"]
+                else:
+                    _description = description
+                if not _entry["code"].startswith(_description):
+                    continue
+                if len(self.sample_uri) == 0:
+                    self.untested_model = _entry["key"]
+                    self.sample_uri = "/".join(
+                        [
+                            self.sample_webpage,
+                            _entry["family"],
+                            _entry["code"],
+                            _entry["name"],
+                            _entry["quality"],
+                            "sample.txt",
+                        ]
+                    )
+                # Only models that were larger than an onnx placeholder
+                # when the index was built are in `installed`.
+                for _path, _real_path in _entry["installed"]:
+                    if _path not in _found:
+                        _found.add(_path)
+                        _model_paths.append(_path)
+                        self.working_models.append(
+                            f"{_entry['key']}#{_real_path}#{_entry['max_voice']}"
+                        )
         if len(available_language) != 0:
             _download_msg = readtexttools.translate_ui_element(
                 iso_lang, "Download a compatible voice model"
@@ -1380,6 +1701,142 @@ voice models, then the generic json configuration will not recognize them.
 
         return _model_paths
 
+    def _model_index_file(self, extension: str = "onnx") -> str:
+        """Return the path of the model index for `extension`, or `""`."""
+        _dir = readtexttools.user_cache_dir("piper")
+        if not _dir:
+            return ""
+        _name = hashlib.sha256(
+            f"{self.piper_voice_dir}\0{extension}".encode("utf-8")
+        ).hexdigest()[:16]
+        return os.path.join(_dir, f"model_index_{_name}.json")
+
+    def _model_index_signature(self) -> list:
+        """Return values that change when `voices.json` or the directories
+        that hold the models change: the size and time of `voices.json`,
+        and the time of each directory up to the depth of
+        `family/lang/name/quality`."""
+        try:
+            _stat = os.stat(self.json_file)
+            _signature = [self.json_file, _stat.st_size, _stat.st_mtime_ns]
+        except OSError:
+            return []
+        _dirs = [(self.piper_voice_dir, 0)]
+        while _dirs:
+            _dir, _depth = _dirs.pop()
+            try:
+                _signature.append([_dir, os.stat(_dir).st_mtime_ns])
+                if _depth < 4:
+                    with os.scandir(_dir) as _scan:
+                        for _item in _scan:
+                            if _item.is_dir(follow_symlinks=False):
+                                _dirs.append((_item.path, _depth + 1))
+            except OSError:
+                continue
+        return sorted(_signature[3:]) + _signature[:3]
+
+    def _load_model_index(self, extension: str = "onnx"):  # -> dict | None
+        """Return the saved model index if `voices.json` and the model
+        directories have not changed, otherwise `None`."""
+        _path = self._model_index_file(extension)
+        if not _path or not os.path.isfile(_path):
+            return None
+        try:
+            with open(_path, "r", encoding="utf-8") as _file:
+                _index = json.load(_file)
+            if _index.get("signature") != self._model_index_signature():
+                return None
+            for _entry in _index["entries"]:
+                for _installed, _real_path in _entry["installed"]:
+                    if not os.path.isfile(_real_path):
+                        # A linked model went away.
+                        return None
+            return _index
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _build_model_index(self, data=None, extension: str = "onnx") -> dict:
+        """Check every model in the voices dictionary `data` once, save
+        the result and return it. The index lists the model files that are
+        installed with their speaker counts and sample rates, and maps each
+        model key and name to the first entry that has it."""
+        _index = {"signature": [], "entries": [], "names": {}}
+        try:
+            for _item in data or {}:
+                _voice = data[_item]
+                _key = _voice["key"]
+                _entry = {
+                    "key": _key,  # de_DE-thorsten_emotional-medium
+                    "code": _voice["language"]["code"],  # de_DE
+                    "family": _voice["language"]["family"],  # de
+                    "name": _voice["name"],  # thorsten_emotional
+                    "quality": _voice["quality"],  # medium
+                    "name_english": _voice["language"]["name_english"],
+                    "max_voice": str(max(0, _voice["num_speakers"] - 1)),
+                    "num_speakers": _voice["num_speakers"],
+                    "paths": [
+                        os.path.join(
+                            self.piper_voice_dir,
+                            _voice["language"]["family"],
+                            _voice["language"]["code"],
+                            _voice["name"],
+                            _voice["quality"],
+                            f"{_key}.{extension}",
+                        ),
+                        os.path.join(self.piper_voice_dir, f"{_key}.{extension}"),
+                    ],
+                    "installed": [],
+                    "sample_rate": 0,
+                }
+                for _path in _entry["paths"]:
+                    # There is no need to know the unlink result.
+                    self.unlink_bad_posix_symbolic_link(_path, False)
+                    # We need to confirm that items are not onnx
+                    # placeholders that only contain brief ASCII text.
+                    if os.path.isfile(_path):
+                        _real_path = os.path.realpath(_path)
+                        if os.path.getsize(_real_path) > 1000:
+                            _entry["installed"].append([_path, _real_path])
+                if _entry["installed"]:
+                    try:
+                        with open(
+                            f"{_entry['installed'][0][1]}.json", "r", encoding="utf-8"
+                        ) as _file:
+                            _entry["sample_rate"] = json.load(_file)["audio"][
+                                "sample_rate"
+                            ]
+                    except (IOError, OSError, ValueError, KeyError, TypeError):
+                        pass
+                for _name in [_key, _voice["name"]]:
+                    _index["names"].setdefault(_name, len(_index["entries"]))
+                _index["entries"].append(_entry)
+        except (KeyError, TypeError, AttributeError, IndexError):
+            pass
+        self._update_model_doc()
+        _index["signature"] = self._model_index_signature()
+        _path = self._model_index_file(extension)
+        if _path and _index["signature"]:
+            try:
+                _handle, _temp = tempfile.mkstemp(
+                    prefix=".part-", dir=os.path.dirname(_path)
+                )
+                with os.fdopen(_handle, "w", encoding="utf-8") as _file:
+                    json.dump(_index, _file)
+                os.replace(_temp, _path)
+            except (IOError, OSError, ValueError):
+                pass
+        return _index
+
+    def indexed_model(self, _key: str = "", extension: str = "onnx"):
+        """Return the model index entry for a model key or name, with the
+        `installed` paths, `num_speakers` and `sample_rate`, or `None`."""
+        _index = self._load_model_index(extension)
+        if not _index:
+            _index = self._build_model_index(self._get_piper_dict(), extension)
+        if _key in _index["names"]:
+            return _index["entries"][_index["names"][_key]]
+        return None
+
     def model_path(self, _extension: str = "onnx") -> str:
         """piper-tts models usually have two essential files with `.json` and
         `.onnx` extensions. If `model.[json | .onnx]` is in an expected
@@ -1442,9 +1899,9 @@ INFO: Piper TTS cannot find `{self.lang}` `.json` and `.onnx` files.
             try:
                 test_locale = locale.getlocale()[0].split("(")[0].strip()
                 data = self._get_piper_dict()
-                for _item in data:
-                    if test_locale.startswith(data[_item]["language"]["name_english"]):
-                        return data[_item]["language"]["family"]
+                _family = data.family_for_english_name(test_locale)
+                if _family:
+                    return _family
             except Exception as e:
                 print(f"Error reading file: {e}")
         else:
@@ -1607,8 +2064,10 @@ INFO: Piper TTS cannot find `{self.lang}` `.json` and `.onnx` files.
         return os.path.isfile(self.model_file)
 
 
-    def _get_piper_dict(self):  # -> dict | None
-        """Read the Piper `voices.json` file to get a dictionary of voice models."""
+    def _get_piper_dict(self):  # -> VoicesCatalogue | None
+        """Return a read only dictionary of the voice models in the Piper
+        `voices.json` file. Records are read from the file when they are
+        used. See `VoicesCatalogue`."""
         if self.local_voices_dictionary:
             return self.local_voices_dictionary
 
@@ -1616,12 +2075,11 @@ INFO: Piper TTS cannot find `{self.lang}` `.json` and `.onnx` files.
             return None
 
         try:
-            with open(self.json_file, mode="r", encoding="utf-8", errors="replace") as file_obj:
-                data = json.load(file_obj)
-                if data:
-                    self.local_voices_dictionary = data
-                    return data
-        except (OSError, json.JSONDecodeError) as e:
+            data = VoicesCatalogue(self.json_file)
+            if data:
+                self.local_voices_dictionary = data
+                return data
+        except (OSError, ValueError) as e:
             self.local_voices_dictionary = None
             print(f"Unexpected error reading `voices.json`: {e}")
 
@@ -1812,7 +2270,15 @@ remote_file = {remote_file}
                     continue
                 print(f"Requesting `{piper_file}`")
 
-                if not self.download_file(remote_file, home_file):
+                _size = 0
+                _md5 = ""
+                if _end == ".onnx":
+                    _key = os.path.splitext(piper_file)[0]
+                    _size = self.onnx_file_data_from_voices_json(_key, "size_bytes")
+                    _md5 = self.onnx_file_data_from_voices_json(_key, "md5_digest")
+                if not self.download_file(
+                    remote_file, home_file, int(_size or 0), _md5
+                ):
                     return ""
                 print(f"Retrieved `{piper_file}`")
                 if do_pop_message:
@@ -1873,7 +2339,7 @@ remote_file = {remote_file}
         )
         try:
             # If system command `killall` is available, then hide the player window UI.
-            if os.system("command -v killall > /dev/null") == 0:
+            if netcommon.which("killall"):
                 _ffplay_out = f"-f s16le -ar {self.sample_rate} {_commons} -nodisp -i -"
                 _vlc_out = f"""--intf dummy --demux=rawaud --rawaud-channels 1 --rawaud-samplerate {self.sample_rate} - vlc://quit"""
         except (OSError, TypeError):
@@ -1925,7 +2391,7 @@ remote_file = {remote_file}
             ]
         for test_app, test_outer in _posix_play_apps:
             try:
-                if os.system(f"command -v {test_app} > /dev/null") == 0:
+                if netcommon.which(test_app):
                     _outer = f" --output-raw < {_text_file} | {test_app} {test_outer}"
                     break
             except (OSError, TypeError):
@@ -2066,6 +2532,338 @@ remote_file = {remote_file}
         ]
         return norm_dir in updated_dirs
 
+    def _audio_cache_key(
+        self,
+        _text_file: str = "",
+        _model: str = "",
+        voice_no: int = 0,
+        _length_scale: float = 1,
+    ) -> str:
+        """Return the audio cache key for speaking `_text_file` with the
+        model settings, or `""` if the cache is off."""
+        if not self.common.audio_cache.enabled():
+            return ""
+        try:
+            with open(_text_file, "rb") as _handle:
+                _content = _handle.read()
+        except (IOError, OSError):
+            return ""
+        return self.common.audio_cache.key(
+            "piper-local",
+            _model,
+            voice_no,
+            _length_scale,
+            self.noise_scale,
+            self.noise_w,
+            self.sample_rate,
+            _content,
+        )
+
+    def _play_cached_audio(self, _key: str = "", _outer: str = "") -> int:
+        """If the audio cache has `_key`, send the raw audio to the player
+        in the `_outer` pipe and return the exit code of the command, else
+        return `-1`."""
+        _cache = self.common.audio_cache
+        if not _key or " | " not in _outer:
+            return -1
+        _cached = self.work_file.replace(".wav", "-cached.wav")
+        _raw = self.work_file.replace(".wav", "-cached.raw")
+        if not _cache.fetch(_key, _cached):
+            return -1
+        try:
+            with wave.open(_cached, "rb") as _wav:
+                _frames = _wav.readframes(_wav.getnframes())
+            with open(_raw, "wb") as _handle:
+                _handle.write(_frames)
+        except (EOFError, IOError, OSError, wave.Error):
+            return -1
+        finally:
+            if os.path.isfile(_cached):
+                os.remove(_cached)
+        _player = _outer.split(" | ", 1)[1]
+        print(f"{_cache.report()}\n\n    cat {_raw} | {_player}")
+        _response = os.system(f"cat {_raw} | {_player}")
+        if os.path.isfile(_raw):
+            os.remove(_raw)
+        return _response
+
+    def _store_raw_audio(self, _key: str = "", _raw: str = "") -> bool:
+        """Wrap the 16 bit mono audio stream `_raw` in a `.wav` container and
+        save it in the audio cache."""
+        _done = False
+        _cached = self.work_file.replace(".wav", "-store.wav")
+        try:
+            if _key and os.path.getsize(_raw) != 0:
+                with open(_raw, "rb") as _handle:
+                    _frames = _handle.read()
+                with wave.open(_cached, "wb") as _wav:
+                    _wav.setnchannels(1)
+                    _wav.setsampwidth(2)
+                    _wav.setframerate(self.sample_rate)
+                    _wav.writeframes(_frames)
+                _done = self.common.audio_cache.store(_key, _cached)
+        except (IOError, OSError, wave.Error):
+            _done = False
+        for _path in [_raw, _cached]:
+            if os.path.isfile(_path):
+                os.remove(_path)
+        return _done
+
+    def _play_in_process(
+        self,
+        _text_file: str = "",
+        _model: str = "",
+        _config: str = "",
+        voice_no: int = 0,
+        _length_scale: float = 1,
+        _cache_key: str = "",
+    ) -> int:
+        """If this process can load piper models, speak `_text_file` with
+        `IN_PROCESS_PIPER` and send each sentence to the playback sink as
+        soon as it is ready. Returns `0` if it played, `1` if it failed after
+        some of the audio played, or `-1` if the caller should use the
+        `piper` program."""
+        if not IN_PROCESS_PIPER.available():
+            return -1
+        try:
+            with open(_text_file, "r", encoding="utf-8") as _handle:
+                _text = _handle.read()
+            _blocks = IN_PROCESS_PIPER.iter_pcm(
+                _text,
+                _model,
+                _config,
+                voice_no if self.num_speakers > 1 else None,
+                _length_scale,
+                self.noise_scale,
+                self.noise_w,
+                netcommon.have_gpu("nvidia"),
+            )
+            # Load the model and speak the first sentence before choosing
+            # the sample rate of the player.
+            _first = next(_blocks, b"")
+        except Exception as e:
+            print(f"[In-process Piper] {e}")
+            return -1
+        _rate = IN_PROCESS_PIPER.sample_rate(_model, _config)
+        _raw = self.work_file.replace(".wav", ".raw") if _cache_key else ""
+        _lock = readtexttools.get_my_lock(self.locker)
+        # Number of blocks that the player has taken.
+        _written = [0]
+
+        def _tee():
+            _copy = open(_raw, "wb") if _raw else None
+            try:
+                for _block in itertools.chain([_first], _blocks):
+                    if _copy:
+                        _copy.write(_block)
+                    yield _block
+                    _written[0] += 1
+            finally:
+                if _copy:
+                    _copy.close()
+
+        print(f"[In-process Piper] {os.path.basename(_model)} : {_rate} Hz")
+        _sink = netcommon.playback_sink()
+        _failed = False
+        try:
+            _played = _sink.play_pcm(_tee(), _rate, 1, _lock)
+        except Exception as e:
+            # A later sentence failed to synthesize.
+            print(f"[In-process Piper] {e}")
+            _played = False
+            _failed = True
+        _sink.close()
+        if _raw:
+            if _played and os.path.isfile(_lock):
+                self._store_raw_audio(_cache_key, _raw)
+            elif os.path.isfile(_raw):
+                os.remove(_raw)
+        if _played:
+            return 0
+        if _written[0]:
+            # Do not speak the text again from the start.
+            return 1 if _failed else 0
+        return -1
+
+    def _play_with_worker(
+        self,
+        _text_file: str = "",
+        _model: str = "",
+        _config: str = "",
+        voice_no: int = 0,
+        _length_scale: float = 1,
+        _outer: str = "",
+        _cache_key: str = "",
+    ) -> int:
+        """If a `piper_worker` is running, ask it to speak `_text_file` with
+        the model that it keeps loaded, and pipe the audio to the player in
+        the `_outer` pipe. Returns the exit code of the player, or `-1` if
+        the worker could not start speaking."""
+        if " | " not in _outer or not piper_worker.worker_running():
+            return -1
+        try:
+            with open(_text_file, "r", encoding="utf-8") as _handle:
+                _text = _handle.read()
+        except (IOError, OSError, UnicodeDecodeError):
+            return -1
+        _request = {
+            "app": self.app,
+            "model": _model,
+            "config": _config,
+            "text": _text,
+            "speaker_id": voice_no if self.num_speakers > 1 else None,
+            "length_scale": _length_scale,
+            "noise_scale": self.noise_scale,
+            "noise_w": self.noise_w,
+            "espeak_data": self.espeak_ng_dir if self._use_espeak_data_dir() else "",
+            "cuda": netcommon.have_gpu("nvidia"),
+        }
+        _blocks = piper_worker.stream(_request)
+        try:
+            next(_blocks)
+        except (OSError, ValueError, StopIteration) as e:
+            print(f"[Piper worker] {e}")
+            return -1
+        _player = _outer.split(" | ", 1)[1]
+        print(f"[Piper worker] {piper_worker.socket_path()}\n\n    {_player}")
+        _raw = self.work_file.replace(".wav", ".raw") if _cache_key else ""
+        _lock = readtexttools.get_my_lock(self.locker)
+        _stopped = False
+        _process = subprocess.Popen(_player, shell=True, stdin=subprocess.PIPE)
+        _copy = open(_raw, "wb") if _raw else None
+        try:
+            for _block in _blocks:
+                if not os.path.isfile(_lock):
+                    _stopped = True
+                    _process.kill()
+                    break
+                _process.stdin.write(_block)
+                if _copy:
+                    _copy.write(_block)
+        except (BrokenPipeError, OSError, ValueError):
+            _stopped = True
+        finally:
+            _blocks.close()
+            if _copy:
+                _copy.close()
+            try:
+                _process.stdin.close()
+            except OSError:
+                pass
+        _response = _process.wait()
+        if _raw:
+            if not _stopped and _response == 0 and os.path.isfile(_lock):
+                self._store_raw_audio(_cache_key, _raw)
+            elif os.path.isfile(_raw):
+                os.remove(_raw)
+        return 0 if _stopped else _response
+
+    def export_jobs(self) -> int:
+        """Return the number of `piper` processes to use for an export. Set
+        the `READTEXTPIPERJOBS` environment variable to use fewer processes
+        than the computer has processor cores."""
+        try:
+            _jobs = int(os.getenv("READTEXTPIPERJOBS", "0"))
+        except ValueError:
+            _jobs = 0
+        return max(1, _jobs or os.cpu_count() or 1)
+
+    def export_audio(
+        self,
+        _text_file: str = "",
+        _model: str = "",
+        _config: str = "",
+        voice_no: int = 0,
+        _length_scale: float = 1,
+        _out_file: str = "",
+        _iso_lang: str = "en-GB",
+    ) -> bool:
+        """Speak `_text_file` to `_out_file`. `netsplit` splits the text into
+        sentences, and a pool of `piper --json-input` processes speaks them
+        at the same time. The audio is joined in the order of the text into
+        one `.wav` file, and `process_wav_media` converts it once."""
+        _request = {
+            "app": self.app,
+            "model": _model,
+            "config": _config,
+            "length_scale": _length_scale,
+            "noise_scale": self.noise_scale,
+            "noise_w": self.noise_w,
+            "espeak_data": self.espeak_ng_dir if self._use_espeak_data_dir() else "",
+            "cuda": netcommon.have_gpu("nvidia"),
+        }
+        _command = piper_worker.piper_command(_request)
+        _speaker = voice_no if self.num_speakers > 1 else None
+        _jobs = self.export_jobs()
+        _work_dir = tempfile.mkdtemp(prefix="read_text_piper_")
+        _local = threading.local()
+        _processes = []
+
+        def _speak(_line: str = "") -> bytes:
+            # Each thread of the pool keeps its own `piper` process, so the
+            # model loads once for each thread.
+            if getattr(_local, "process", None) is None:
+                _local.process = piper_worker.PiperProcess(_command, _work_dir)
+                _processes.append(_local.process)
+            return _local.process.synthesize(_line, _speaker)
+
+        _out = readtexttools.get_work_file_path(_out_file, "", "OUT")
+        _work = readtexttools.get_work_file_path(_out_file, "", "TEMP")
+        _pending = collections.deque()
+        _ok = False
+        try:
+            with open(
+                _text_file, "r", encoding="utf-8", errors="replace"
+            ) as _handle, wave.open(_work, "wb") as _wav:
+                _wav.setnchannels(1)
+                _wav.setsampwidth(2)
+                _wav.setframerate(int(self.sample_rate))
+                with concurrent.futures.ThreadPoolExecutor(_jobs) as executor:
+                    try:
+                        for _line in netsplit.LocalHandler().iter_play_list(
+                            _handle, _iso_lang, False
+                        ):
+                            if not _line.strip():
+                                continue
+                            _pending.append(executor.submit(_speak, _line))
+                            # Keep a few sentences ahead of the file, but not
+                            # the whole book in memory.
+                            if len(_pending) >= 2 * _jobs:
+                                _wav.writeframes(_pending.popleft().result())
+                        while _pending:
+                            _wav.writeframes(_pending.popleft().result())
+                    finally:
+                        for _future in _pending:
+                            _future.cancel()
+            _ok = True
+        except (IOError, OSError, ValueError, wave.Error) as e:
+            print(f"Exception in `export_audio`: {e}")
+        finally:
+            for _process in _processes:
+                _process.close()
+            try:
+                os.rmdir(_work_dir)
+            except OSError:
+                pass
+        if not _ok:
+            if os.path.isfile(_work):
+                os.remove(_work)
+            return False
+        if not _out:
+            # The `.wav` file is the export.
+            return True
+        return bool(
+            readtexttools.process_wav_media(
+                readtexttools.check_title("", "piper"),
+                _work,
+                "",
+                _out,
+                "false",
+                "false",
+                readtexttools.check_artist(""),
+            )
+        )
+
     def read(
         self,
         _text_file: str = "",
@@ -2073,8 +2871,10 @@ remote_file = {remote_file}
         _config: str = "",
         _speech_rate: int = 160,
         _player: int = 1,
+        _out_file: str = "",
     ) -> bool:
-        """Read speech aloud"""
+        """Read speech aloud, or if `_out_file` is not empty, then save the
+        speech as an audio file."""
         _extension_table = readtexttools.ExtensionTable()
         _meta = readtexttools.ImportedMetaData()
 
@@ -2111,6 +2911,23 @@ remote_file = {remote_file}
         except (ValueError, IndexError):
             voice_no = 0
         voice_no = self._check_voice_request(voice_no, self._model_voice_info(_model))
+        if _out_file:
+            _model = _model.split("#")[0]
+            if not os.path.isfile(_model):
+                return False
+            if voice_no > self.num_speakers - 1:
+                voice_no = 0
+            if not os.path.isfile(_config):
+                _config = f"{_model}.json"
+            return self.export_audio(
+                _text_file,
+                _model,
+                _config,
+                voice_no,
+                _length_scale,
+                _out_file,
+                _iso_lang,
+            )
         _vlc = ""
         _force_player = False
         _vlc_vis = "--audio-visual visualizer --effect-list "
@@ -2317,7 +3134,51 @@ Piper TTS
                 print(_command)
 
             if os.name in ["posix"]:
+                # Streaming to a player: play the cached audio if there is
+                # any, otherwise `tee` a copy of the stream to the cache.
+                _cache_key = ""
+                _raw = ""
+                if _outer.startswith(" --output-raw < ") and " | " in _outer:
+                    _cache_key = self._audio_cache_key(
+                        _text_file, _model, voice_no, _length_scale
+                    )
+                _response = self._play_cached_audio(_cache_key, _outer)
+                if _response == -1 and not _vlc:
+                    _response = self._play_in_process(
+                        _text_file,
+                        _model,
+                        _json_c,
+                        voice_no,
+                        _length_scale,
+                        _cache_key,
+                    )
+                if _response == -1 and _outer.startswith(" --output-raw < "):
+                    # A resident worker has the model loaded already.
+                    _response = self._play_with_worker(
+                        _text_file,
+                        _model,
+                        _json_c,
+                        voice_no,
+                        _length_scale,
+                        _outer,
+                        _cache_key,
+                    )
+                if _response != -1:
+                    readtexttools.unlock_my_lock(self.locker)
+                    return _response == 0
+                if _cache_key:
+                    _raw = self.work_file.replace(".wav", ".raw")
+                    _command = _command.replace(" | ", f" | tee {_raw} | ", 1)
                 _response = os.system(_command)
+                if _raw:
+                    # A user who stops the speech removes the lock, so the
+                    # stream might not be complete.
+                    if _response == 0 and os.path.isfile(
+                        readtexttools.get_my_lock(self.locker)
+                    ):
+                        self._store_raw_audio(_cache_key, _raw)
+                    elif os.path.isfile(_raw):
+                        os.remove(_raw)
             elif os.name in ["nt"]:
                 _response = 1
                 if _vlc and self.debug in [0]:
@@ -2855,6 +3716,7 @@ Links
         _player: int = 0,
         _percent_rate: str = "100%",
         _voice: str = "AUTO0#0",
+        _out_file: str = "",
     ) -> bool:
         """Execute Piper TTS speech synthesis for supported languages
         and return `True` if successful."""
@@ -2936,6 +3798,7 @@ Links
             _config,
             netcommon.speech_wpm(_percent_rate),
             _player,
+            _out_file,
         )
         if self.debug != 0:
             print(self.load_instructions(True))
@@ -2958,12 +3821,22 @@ def main() -> None:
     _player = 0
     if os.name == "nt":
         _player = 0
+    _out_file = ""
     _text_file_in = sys.argv[-1]
     try:
         opts, args = getopt.getopt(
             sys.argv[1:],
-            "uclprvh",
-            ["update=", "config=", "language=", "player=", "rate=", "voice=", "help"],
+            "uoclprvh",
+            [
+                "update=",
+                "output=",
+                "config=",
+                "language=",
+                "player=",
+                "rate=",
+                "voice=",
+                "help",
+            ],
         )
     except getopt.GetoptError:
         # Show help information and exit
@@ -2974,6 +3847,10 @@ def main() -> None:
         if o in ("-u, --update"):
             if readtexttools.lax_bool(a):
                 _do_update = True
+        elif o in ("-o", "--output"):
+            if a.startswith("~"):
+                a = os.path.expanduser(a)
+            _out_file = a
         elif o in ("-l", "--language"):
             _iso_lang = a
             if _iso_lang.startswith("zxx"):
@@ -3004,7 +3881,14 @@ def main() -> None:
         else:
             assert False, "unhandled option"
     _piper_tts.piper_main(
-        _text_file_in, _do_update, _iso_lang, _config, _player, _percent_rate, _voice
+        _text_file_in,
+        _do_update,
+        _iso_lang,
+        _config,
+        _player,
+        _percent_rate,
+        _voice,
+        _out_file,
     )
 
 
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8-*-
+"""A resident Piper TTS worker that keeps voice models loaded.
+
+Starting the `piper` program loads and initializes the ONNX model, which
+can take seconds with a large model before the first sample plays. The
+worker starts `piper --json-input` once for each model and keeps the most
+recently used ones running. Clients send a request over a Unix domain
+socket and receive raw 16 bit PCM audio as each line is ready.
+
+Start the worker in the background:
+
+    python3 piper_worker.py --serve &
+
+Stop it:
+
+    python3 piper_worker.py --stop
+
+`piper_read_text.py` uses the worker automatically when it is running,
+and starts the `piper` program itself when it is not.
+
+Protocol
+--------
+
+The client sends one line of JSON with `model`, `config`, `text` and the
+optional `app`, `speaker_id`, `length_scale`, `noise_scale`, `noise_w`,
+`espeak_data` and `cuda` settings. The worker answers with one line of
+JSON, `{"ok": true, "sample_rate": 22050, "channels": 1, "sample_width": 2}`
+followed by the audio until it closes the connection, or
+`{"ok": false, "error": "..."}`."""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+try:
+    import collections
+    import socket
+    import socketserver
+    import subprocess
+    import threading
+    import wave
+
+    WORKER_OK = hasattr(socket, "AF_UNIX")
+except (ImportError, AssertionError):
+    WORKER_OK = False
+
+# Read the worker answer in blocks of this many bytes.
+BLOCK_SIZE = 8192
+
+
+def socket_path() -> str:
+    """Return the path of the worker socket. Use the `READTEXTPIPERSOCKET`
+    environment variable to choose a different path."""
+    _path = os.getenv("READTEXTPIPERSOCKET")
+    if _path:
+        return _path
+    _dir = os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    _user = str(os.getuid()) if hasattr(os, "getuid") else "user"
+    return os.path.join(_dir, f"read_text_piper_{_user}.sock")
+
+
+def piper_command(request=None) -> list:
+    """Return the `piper --json-input` command line for the settings in
+    `request`."""
+    _command = [
+        request.get("app") or "piper",
+        "--json-input",
+        "--model",
+        request["model"],
+        "--config",
+        request.get("config") or f"{request['model']}.json",
+    ]
+    for _name in ["length_scale", "noise_scale", "noise_w"]:
+        if request.get(_name) is not None:
+            _command.extend([f"--{_name}", str(request[_name])])
+    if request.get("espeak_data"):
+        _command.extend(["--espeak_data", request["espeak_data"]])
+    if request.get("cuda"):
+        _command.append("--cuda")
+    return _command
+
+
+class PiperProcess(object):
+    """A `piper --json-input` process for one model and one set of speech
+    settings. Each line of input names the `.wav` file to write, and
+    `piper` prints the file name when the audio is complete."""
+
+    def __init__(self, command=None, work_dir: str = "") -> None:
+        self.command = command or []
+        self.work_dir = work_dir
+        self.lock = threading.Lock()
+        self.count = 0
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            bufsize=1,
+        )
+
+    def running(self) -> bool:
+        """Is the `piper` process still running?"""
+        return self.process.poll() is None
+
+    def synthesize(self, line: str = "", speaker_id=None) -> bytes:
+        """Return the audio frames for one line of text."""
+        self.count += 1
+        _wav = os.path.join(self.work_dir, f"{id(self)}-{self.count}.wav")
+        _request = {"text": line, "output_file": _wav}
+        if speaker_id is not None:
+            _request["speaker_id"] = speaker_id
+        try:
+            self.process.stdin.write(json.dumps(_request) + "\n")
+            self.process.stdin.flush()
+            if not self.process.stdout.readline():
+                raise OSError("`piper` stopped")
+            with wave.open(_wav, "rb") as _file:
+                return _file.readframes(_file.getnframes())
+        finally:
+            if os.path.isfile(_wav):
+                os.remove(_wav)
+
+    def close(self) -> None:
+        """Stop the `piper` process."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+class PiperWorker(object):
+    """Keep up to `max_models` `PiperProcess` objects running, dropping the
+    least recently used one when a new model is requested."""
+
+    def __init__(self, max_models: int = 2, idle_seconds: float = 900) -> None:
+        self.max_models = max(1, max_models)
+        self.idle_seconds = idle_seconds
+        self.last_used = time.time()
+        self.processes = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.work_dir = tempfile.mkdtemp(prefix="read_text_piper_")
+
+    def command(self, request=None) -> list:
+        """Return the `piper` command line for the settings in `request`."""
+        return piper_command(request)
+
+    def process(self, request=None) -> PiperProcess:
+        """Return a running process for `request`, starting it if needed."""
+        _command = self.command(request)
+        _key = "\0".join(_command)
+        with self.lock:
+            self.last_used = time.time()
+            _process = self.processes.pop(_key, None)
+            if _process is not None and not _process.running():
+                _process = None
+            if _process is None:
+                _process = PiperProcess(_command, self.work_dir)
+            self.processes[_key] = _process
+            while len(self.processes) > self.max_models:
+                _key, _oldest = self.processes.popitem(last=False)
+                _oldest.close()
+            return _process
+
+    def sample_rate(self, request=None) -> int:
+        """Return the sample rate in the model configuration file."""
+        try:
+            with open(
+                request.get("config") or f"{request['model']}.json",
+                "r",
+                encoding="utf-8",
+            ) as _file:
+                return int(json.load(_file)["audio"]["sample_rate"])
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return 22050
+
+    def serve(self, request=None, connection=None) -> None:
+        """Speak each line of `request["text"]` and send the audio to
+        `connection` as soon as the line is ready."""
+        if not request.get("model") or not os.path.isfile(request["model"]):
+            raise ValueError("The request does not name a model file.")
+        _process = self.process(request)
+        connection.sendall(
+            (
+                json.dumps(
+                    {
+                        "ok": True,
+                        "sample_rate": self.sample_rate(request),
+                        "channels": 1,
+                        "sample_width": 2,
+                    }
+                )
+                + "\n"
+            ).encode("utf-8")
+        )
+        for _line in str(request.get("text", "")).splitlines():
+            if not _line.strip():
+                continue
+            # One `piper` process speaks one line at a time.
+            with _process.lock:
+                _frames = _process.synthesize(_line, request.get("speaker_id"))
+            connection.sendall(_frames)
+            self.last_used = time.time()
+
+    def idle(self) -> bool:
+        """Has the worker waited longer than `idle_seconds`?"""
+        return 0 < self.idle_seconds < time.time() - self.last_used
+
+    def close(self) -> None:
+        """Stop every `piper` process and remove the work directory."""
+        with self.lock:
+            for _process in self.processes.values():
+                _process.close()
+            self.processes.clear()
+        try:
+            os.rmdir(self.work_dir)
+        except OSError:
+            pass
+
+
+if WORKER_OK:
+
+    class _RequestHandler(socketserver.StreamRequestHandler):
+        """Answer one client request."""
+
+        def handle(self) -> None:
+            try:
+                _request = json.loads(self.rfile.readline().decode("utf-8"))
+                if _request.get("stop"):
+                    threading.Thread(target=self.server.shutdown).start()
+                    return
+                self.server.worker.serve(_request, self.connection)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            except (OSError, ValueError, KeyError, AttributeError, wave.Error) as e:
+                try:
+                    self.connection.sendall(
+                        (json.dumps({"ok": False, "error": str(e)}) + "\n").encode(
+                            "utf-8"
+                        )
+                    )
+                except OSError:
+                    pass
+
+    class _WorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """A threaded Unix socket server that owns a `PiperWorker`."""
+
+        daemon_threads = True
+
+
+def serve(path: str = "", max_models: int = 2, idle_seconds: float = 900) -> bool:
+    """Run the worker until a client sends `{"stop": true}` or until it is
+    idle for `idle_seconds`."""
+    if not WORKER_OK:
+        return False
+    path = path or socket_path()
+    if worker_running(path):
+        print(f"A Piper worker is already listening at `{path}`.")
+        return False
+    if os.path.exists(path):
+        os.remove(path)
+    _old_mask = os.umask(0o077)
+    try:
+        _server = _WorkerServer(path, _RequestHandler)
+    finally:
+        os.umask(_old_mask)
+    _server.worker = PiperWorker(max_models, idle_seconds)
+
+    def _watch_idle() -> None:
+        while not _server.worker.idle():
+            time.sleep(5)
+        _server.shutdown()
+
+    threading.Thread(target=_watch_idle, daemon=True).start()
+    print(f"Piper worker listening at `{path}`")
+    try:
+        _server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _server.server_close()
+        _server.worker.close()
+        if os.path.exists(path):
+            os.remove(path)
+    return True
+
+
+def connect(path: str = "", timeout: float = 0.5):  # -> socket.socket | None
+    """Return a socket connected to the worker, or `None` if it is not
+    running."""
+    if not WORKER_OK:
+        return None
+    path = path or socket_path()
+    if not os.path.exists(path):
+        return None
+    _client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    _client.settimeout(timeout)
+    try:
+        _client.connect(path)
+    except OSError:
+        _client.close()
+        return None
+    return _client
+
+
+def worker_running(path: str = "") -> bool:
+    """Does a worker accept connections at `path`?"""
+    _client = connect(path)
+    if _client is None:
+        return False
+    _client.close()
+    return True
+
+
+def stream(request=None, path: str = "", timeout: float = 120):
+    """Send `request` to the worker and yield the audio in blocks. The first
+    item is the answer header as a dictionary. Raises `OSError` if the
+    worker is not running or cannot speak the text."""
+    _client = connect(path)
+    if _client is None:
+        raise OSError("The Piper worker is not running.")
+    try:
+        _client.settimeout(timeout)
+        _client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        _reader = _client.makefile("rb")
+        _header = json.loads(_reader.readline().decode("utf-8") or "{}")
+        if not _header.get("ok"):
+            raise OSError(_header.get("error", "The Piper worker did not answer."))
+        yield _header
+        while True:
+            _block = _reader.read1(BLOCK_SIZE)
+            if not _block:
+                return
+            yield _block
+    finally:
+        _client.close()
+
+
+def main() -> None:
+    """Start or stop the worker from the command line."""
+    _args = sys.argv[1:]
+    _path = ""
+    if "--socket" in _args[:-1]:
+        _path = _args[_args.index("--socket") + 1]
+    if "--stop" in _args:
+        _client = connect(_path)
+        if _client is None:
+            print("No Piper worker is running.")
+            return
+        _client.sendall(b'{"stop": true}\n')
+        _client.close()
+        return
+    if "--serve" in _args:
+        _models = 2
+        if "--models" in _args[:-1]:
+            _models = int(_args[_args.index("--models") + 1])
+        serve(_path, _models)
+        return
+    print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -54,20 +54,19 @@ Copyright (c) 2011 - 2025 James Holgate
 
 
 from __future__ import absolute_import, division, print_function, unicode_literals
+import hashlib
+import importlib
 import io
+import marshal
 import math
 import os
+import re
 
 import string
 import sys
 import time
 import unicodedata
 
-try:
-    import dbus
-except ImportError:
-    pass
-
 try:
     import getopt
 except (ImportError, AssertionError, AttributeError):
@@ -94,20 +93,10 @@ except (ImportError, AssertionError):
     pass
 
 try:
-    import mimetypes
+    import shutil
 except (ImportError, AssertionError):
     pass
 
-try:
-    import platform
-except (ImportError, AssertionError):
-    pass
-
-try:
-    import psutil
-except (ImportError, AssertionError):
-    psutil = False
-
 try:
     import site
 except (ImportError, AssertionError):
@@ -128,21 +117,11 @@ try:
 except (AttributeError, ImportError, AssertionError):
     pass
 
-try:
-    import check_dialog
-except (ImportError, AssertionError):
-    pass
-
 try:
     import wave
 except (ImportError, AssertionError):
     pass
 
-try:
-    import webbrowser
-except (ImportError, AssertionError):
-    pass
-
 try:
     import winsound
 except (ImportError, AssertionError):
@@ -150,11 +129,9 @@ except (ImportError, AssertionError):
 
 try:
     import urllib.parse as urlparse
-    import urllib.request as urllib
 except (ImportError, AssertionError):
     try:
         import urlparse
-        import urllib
     except ImportError:
         pass
 
@@ -166,41 +143,57 @@ except ImportError:
     except (ImportError, AssertionError):
         pass
 
-try:
-    import gi
-
-    gi.require_version("Gst", "1.0")
-    from gi.repository import Gst
-except (ImportError, ValueError, AssertionError):
-    pass
-
-try:
-    from html.parser import HTMLParser
-except AssertionError:
-    pass
-except ImportError:
-    try:
-        from HTMLParser import HTMLParser
-    except NameError:
-        pass
-
 
 try:
     import pathlib
 except (ImportError, AssertionError):
     pass
 
-try:
-    import webbrowser
-except (ImportError, AssertionError):
-    pass
+LOOK_UPS = 0
 
-try:
-    import l10n
-except (ImportError, AssertionError, SyntaxError):
-    pass
+# Optional or slow modules like `gi`, `dbus`, `psutil`, `webbrowser`,
+# `check_dialog` and `l10n` load the first time that a function needs them,
+# so a client that only plays a sound does not wait for them. Run
+# `python3 readtexttools.py --importtime` to check the start up time.
+_LAZY_MODULES = {}
 
-LOOK_UPS = 0
+# The largest time in milliseconds that `import readtexttools` should take
+# in `import_time_benchmark`.
+IMPORT_TIME_BUDGET_MS = 60.0
+
+
+def lazy_module(name=""):  # -> module | None
+    """Import the module `name` the first time that a function asks for it,
+    and return it, or `None` if it is not available.
+    Example:
+        lazy_module("webbrowser").open_new_tab(url)
+    """
+    try:
+        return _LAZY_MODULES[name]
+    except KeyError:
+        pass
+    try:
+        _module = importlib.import_module(name)
+    except (ImportError, AssertionError, SyntaxError, ValueError):
+        _module = None
+    _LAZY_MODULES[name] = _module
+    return _module
+
+
+def gst_module():  # -> module | None
+    """Return the GStreamer `Gst` module, or `None` if PyGObject or
+    GStreamer 1.0 is not available."""
+    if "Gst" not in _LAZY_MODULES:
+        _gst = None
+        _gi = lazy_module("gi")
+        if _gi is not None:
+            try:
+                _gi.require_version("Gst", "1.0")
+                _gst = importlib.import_module("gi.repository.Gst")
+            except (ImportError, ValueError, AssertionError):
+                _gst = None
+        _LAZY_MODULES["Gst"] = _gst
+    return _LAZY_MODULES["Gst"]
 
 
 # Shim: define subprocess.run if missing (Python < 3.5)
@@ -233,7 +226,7 @@ def killall_process(process_name=""):  # -> bool
         bool: True if at least one process was stopped, False otherwise.
     """
     success = False
-
+    psutil = lazy_module("psutil")
     if psutil:
         for proc in psutil.process_iter(attrs=["name"]):
             if proc.info["name"] == process_name:
@@ -296,6 +289,38 @@ def get_temp_prefix():  # -> str
     return tempfile.gettempdir()
 
 
+def user_cache_dir(_subdir=""):  # -> str
+    """
+    Returns a per-user directory for files that the extension can
+    rebuild at any time, like synthesized audio or indexes, creating
+    it if necessary. Use the `READTEXTCACHE` environment variable to
+    choose a different directory. Returns `""` if no directory is
+    writable.
+    Example:
+        user_cache_dir("audio")
+    """
+    _base = os.getenv("READTEXTCACHE")
+    if not _base:
+        if os.name == "nt":
+            _base = os.getenv("LOCALAPPDATA") or os.getenv("TEMP") or ""
+        elif sys.platform == "darwin":
+            _base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+        else:
+            _base = os.getenv("XDG_CACHE_HOME") or os.path.join(
+                os.path.expanduser("~"), ".cache"
+            )
+        _base = os.path.join(_base, app_signature())
+    _dir = os.path.join(_base, _subdir) if _subdir else _base
+    try:
+        if not os.path.isdir(_dir):
+            os.makedirs(_dir)
+    except (IOError, OSError):
+        return ""
+    if not os.access(_dir, os.W_OK):
+        return ""
+    return _dir
+
+
 def using_container(check_exec=False):  # ->bool
     """Check whether the extension is in a known container resource
     directory (snap, flatpack) or optionally if the application is
@@ -309,6 +334,209 @@ def using_container(check_exec=False):  # ->bool
     return False
 
 
+# Programs that the clients look for. `ToolRegistry` finds all of them in
+# one pass the first time that a client asks for any program.
+KNOWN_TOOLS = [
+    "afconvert",
+    "afplay",
+    "aplay",
+    "avconv",
+    "esdplay",
+    "espeak",
+    "espeak-ng",
+    "faac",
+    "festival",
+    "ffmpeg",
+    "ffplay",
+    "flatpak",
+    "flite",
+    "gst-discoverer-1.0",
+    "gst-launch-1.0",
+    "killall",
+    "lame",
+    "lspci",
+    "notify-send",
+    "osascript",
+    "paplay",
+    "pico2wave",
+    "piper",
+    "piper-cli",
+    "play",
+    "pw-cat",
+    "say",
+    "snap",
+    "sox",
+    "spd-say",
+    "text2wave",
+    "twolame",
+    "vlc",
+    "xdg-open",
+]
+
+
+class ToolRegistry(object):
+    """Find the programs that the clients use once and remember them.
+
+    A test like `command -v vlc` starts a new shell each time, and one
+    request to read text can ask about the same players and converters
+    dozens of times. The registry looks for every program in `KNOWN_TOOLS`
+    with `shutil.which`, keeps the answers for the life of the process, and
+    saves them in `user_cache_dir("tools")` for the next client. A saved
+    snapshot only applies to the same `PATH` and expires after
+    `READTEXTTOOLSTTL` seconds (default 3600). Use `0` to look for the
+    programs in every new process.
+    Example:
+        TOOLS.which("vlc")
+    """
+
+    def __init__(self, tools=None):  # -> None
+        self.tools = list(tools or KNOWN_TOOLS)
+        self.paths = None
+        self.probes = {}
+        self.path_key = ""
+        self.found_time = 0.0
+        self.lock = threading.RLock()
+        try:
+            self.ttl = float(os.getenv("READTEXTTOOLSTTL", "3600"))
+        except ValueError:
+            self.ttl = 3600.0
+
+    def _key(self):  # -> str
+        """Return a key for the current `PATH` setting."""
+        return hashlib.sha256(
+            os.getenv("PATH", "").encode("utf-8", "replace")
+        ).hexdigest()
+
+    def snapshot_file(self):  # -> str
+        """Return the path of the saved snapshot, or `""` if the registry
+        does not save snapshots."""
+        if self.ttl <= 0:
+            return ""
+        _dir = user_cache_dir("tools")
+        if not _dir:
+            return ""
+        return os.path.join(_dir, "tools.json")
+
+    def _load(self):  # -> dict
+        """Return the saved paths if the snapshot is for this `PATH` and is
+        not too old, otherwise an empty dictionary."""
+        _file = self.snapshot_file()
+        if not os.path.isfile(_file):
+            return {}
+        try:
+            with io.open(_file, "r", encoding="utf-8") as _handle:
+                _data = json.load(_handle)
+            _age = time.time() - float(_data["time"])
+            if _data["path"] != self.path_key or not 0 <= _age < self.ttl:
+                return {}
+            self.found_time = float(_data["time"])
+            # Look again for a program that was removed since the snapshot.
+            return dict(
+                (_name, _path)
+                for _name, _path in _data["tools"].items()
+                if not _path or os.path.isfile(_path)
+            )
+        except (IOError, OSError, KeyError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def _save(self):  # -> bool
+        """Save the paths to the snapshot file."""
+        _file = self.snapshot_file()
+        if not _file:
+            return False
+        _data = {"path": self.path_key, "time": self.found_time, "tools": self.paths}
+        try:
+            _handle, _temp = tempfile.mkstemp(
+                prefix=".part-", dir=os.path.dirname(_file)
+            )
+            with os.fdopen(_handle, "w") as _out:
+                json.dump(_data, _out, indent=0, sort_keys=True)
+            os.replace(_temp, _file)
+            return True
+        except (IOError, OSError, TypeError, ValueError):
+            return False
+
+    def _find(self, name=""):  # -> str
+        try:
+            return shutil.which(name) or ""
+        except (AttributeError, OSError, TypeError, ValueError):
+            return ""
+
+    def _ready(self):  # -> None
+        """Load the snapshot, or look for every known program, the first
+        time and whenever `PATH` changes."""
+        _key = self._key()
+        if self.paths is not None and _key == self.path_key:
+            return
+        self.path_key = _key
+        self.probes = {}
+        _paths = self._load()
+        _missing = [_name for _name in self.tools if _name not in _paths]
+        if _missing and not _paths:
+            self.found_time = time.time()
+        for _name in _missing:
+            _paths[_name] = self._find(_name)
+        self.paths = _paths
+        if _missing:
+            self._save()
+
+    def which(self, name=""):  # -> str
+        """Return the path of the program `name`, or `""` if it is not in
+        `PATH`."""
+        if not name:
+            return ""
+        if os.path.dirname(name):
+            if os.path.isfile(name) and os.access(name, os.X_OK):
+                return name
+            return ""
+        with self.lock:
+            self._ready()
+            if name not in self.paths:
+                self.paths[name] = self._find(name)
+                self._save()
+            return self.paths[name]
+
+    def probe(self, name="", test=None):  # -> bool
+        """Return the result of `test(name)`, running `test` only once for
+        each `name` in this process."""
+        with self.lock:
+            self._ready()
+            if name not in self.probes:
+                self.probes[name] = bool(test(name))
+            return self.probes[name]
+
+    def refresh(self):  # -> None
+        """Forget the saved answers, so the next question looks again."""
+        with self.lock:
+            self.paths = None
+            _file = self.snapshot_file()
+            if os.path.isfile(_file):
+                try:
+                    os.remove(_file)
+                except OSError:
+                    pass
+
+
+TOOLS = ToolRegistry()
+
+
+def _posix_app_answers(posix_app=""):  # -> bool
+    """Does `posix_app` have a manual, or answer a `--version` or `--help`
+    switch?"""
+    os_sep = os.sep
+    mute_response = "&> {0}dev{0}null &".format(os_sep)
+    if os_sep in posix_app:
+        posix_app = os.path.basename(posix_app)
+    if my_os_system("man -w {0} {1}".format(posix_app, mute_response)):
+        return True
+    for tester in ["--version", "--help", "-h", "-?"]:
+        app_switch = tester
+        if my_os_system("{0} {1} {2}".format(posix_app, app_switch, mute_response)):
+            # No error
+            return True
+    return False
+
+
 def have_posix_app(posix_app="vlc", do_test=True):  # -> bool
     """if the app exists and understands a `--version` or `--help` switch,
     then returns `True`, otherwise returns `False`.
@@ -322,27 +550,10 @@ def have_posix_app(posix_app="vlc", do_test=True):  # -> bool
         return False
     if not bool(posix_app):
         return False
-    if not do_test:
-        try:
-            if os.system("command -v {0} > /dev/null".format(posix_app)) == 0:
-                return True
-        except (OSError, SyntaxError, TypeError):
-            pass
-    for _base_path in os.environ["PATH"].split(os.sep):
-        if os.path.isfile(os.path.join(_base_path, posix_app)):
-            return True
+    if TOOLS.which(posix_app):
+        return True
     if bool(do_test):
-        os_sep = os.sep
-        mute_response = "&> {0}dev{0}null &".format(os_sep)
-        if os_sep in posix_app:
-            posix_app = os.path.basename(posix_app)
-        if my_os_system("man -w {0} {1}".format(posix_app, mute_response)):
-            return True
-        for tester in ["--version", "--help", "-h", "-?"]:
-            app_switch = tester
-            if my_os_system("{0} {1} {2}".format(posix_app, app_switch, mute_response)):
-                # No error
-                return True
+        return TOOLS.probe(posix_app, _posix_app_answers)
     return False
 
 
@@ -486,26 +697,37 @@ class XmlTransform(object):
         return test_text
 
 
-try:
+# `remove_xml_parser` defines the class the first time that it is needed.
+ClassRemoveXML = None
 
-    class ClassRemoveXML(HTMLParser):
-        """Remove XML using python HTML parsing."""
 
-        def __init__(self):
-            self.reset()
-            self.fed = []
-            self.convert_charrefs = []
+def remove_xml_parser():  # -> ClassRemoveXML
+    """Return a new parser that removes XML markup. The `html.parser`
+    module loads the first time."""
+    global ClassRemoveXML
+    if ClassRemoveXML is None:
+        try:
+            from html.parser import HTMLParser
+        except ImportError:
+            from HTMLParser import HTMLParser
 
-        def handle_data(self, d):
-            """Handle string data."""
-            self.fed.append(d)
+        class ClassRemoveXML(HTMLParser):
+            """Remove XML using python HTML parsing."""
 
-        def get_fed_data(self):
-            """Return fed data."""
-            return "".join(self.fed)
+            def __init__(self):
+                self.reset()
+                self.fed = []
+                self.convert_charrefs = []
 
-except NameError:
-    pass
+            def handle_data(self, d):
+                """Handle string data."""
+                self.fed.append(d)
+
+            def get_fed_data(self):
+                """Return fed data."""
+                return "".join(self.fed)
+
+    return ClassRemoveXML()
 
 
 def safechars(_test_string="", _allowed="1234567890,"):  # -> string
@@ -656,7 +878,7 @@ def strip_xml(str1):  # -> str
     from the local `html.py` file.
     """
     try:
-        mydata = ClassRemoveXML()
+        mydata = remove_xml_parser()
         mydata.feed(str1)
         retval = mydata.get_fed_data()
     except Exception:
@@ -696,6 +918,12 @@ Makes an audio with a poster image.  Uses `avconv` or `ffmpeg`.
       --output="xxx.webm"
       {0} --visible="true" --audible="true" --image="x.png" \\
        --sound="x.wav"--title="Title" --output="x.webm"
+
+### Start up time:
+
+Check that a module imports within a budget in milliseconds.
+
+      {0} --importtime [readtexttools] [60]
 """.format(
             sa1
         )
@@ -786,7 +1014,7 @@ def sys_machine_paths():  # list(str)
         "/opt/",
     ]
     try:
-        machine_type = platform.uname().machine
+        machine_type = lazy_module("platform").uname().machine
     except (AttributeError, NameError, TypeError):
         _meta = ImportedMetaData()
         machine_type = _meta.execute_command("uname -m")
@@ -981,6 +1209,7 @@ class ExtensionTable(object):
         if not _ext.startswith("."):
             _ext = ".{0}".format(_ext)
         try:
+            mimetypes = lazy_module("mimetypes")
             mimetypes.init()
             return mimetypes.types_map[_ext]
         except (IndexError, KeyError):
@@ -1293,7 +1522,7 @@ def is_container_instance():  # -> bool
     desktop paths and user interactions. It might have limited access to
     the system and data from other applications."""
     try:
-        if int(platform.python_version_tuple()[0]) < 3:
+        if int(lazy_module("platform").python_version_tuple()[0]) < 3:
             return True
     except NameError:
         pass
@@ -1349,8 +1578,8 @@ def local_host_pop(
     installed programs like `wscript`, `mshta`, `osascript`, `dbus`
     `speech-dispatcher` etc."""
     try:
-        _local_server = check_dialog.MyServer()
-    except OSError:
+        _local_server = lazy_module("check_dialog").MyServer()
+    except (AttributeError, OSError):
         return False
     # You cannot act on a message with a URL in this popup menu, so we
     # only provide general information. Specifically, if you are using
@@ -1385,7 +1614,7 @@ def local_host_pop(
         _msg, _msg_h1, _dialog_title, s_icon, _stime, lang_region
     )
     try:
-        if webbrowser.open_new_tab("{0}{1}".format(local_url, _args)):
+        if lazy_module("webbrowser").open_new_tab("{0}{1}".format(local_url, _args)):
             time.sleep(5 + m_sec / 1000)
             _local_server.stop()
             return True
@@ -1507,7 +1736,7 @@ setTimeout(function(){{window.close();}}, {_stime});
         command = ["mshta.exe", os.path.realpath(out_file)]
         subprocess.Popen(command)
     except (AttributeError, FileNotFoundError, NameError, TypeError):
-        webbrowser.open_new_tab(
+        lazy_module("webbrowser").open_new_tab(
             "file://" + os.path.realpath(out_file).replace(os.sep, "/")
         )
     try:
@@ -1524,7 +1753,7 @@ def translate_ui_element(iso_lang="en-US", msg=""):  # -> str
     """If a literal translation is available, then return the translated
     version of the string."""
     try:
-        _translator = l10n.Translator()
+        _translator = lazy_module("l10n").Translator()
         return _translator.get_translation(iso_lang, msg)
     except:
         pass
@@ -1562,6 +1791,7 @@ def pop_message(
     msg = translate_ui_element(iso_lang, msg)
     if not using_container(False):
         try:
+            dbus = lazy_module("dbus")
             if bool(dbus):
                 item = "org.freedesktop.Notifications"
                 _interface = dbus.Interface(
@@ -1634,6 +1864,7 @@ def lax_mime_match(_wanted="", _testing=""):  # -> bool
         return False
     if not _testing:
         return False
+    mimetypes = lazy_module("mimetypes")
     mimetypes.init()
     try:
         return mimetypes.types_map[_wanted] == mimetypes.types_map[_testing]
@@ -1699,6 +1930,7 @@ def get_work_file_path(_work="", _image="", _type=""):  # -> str
     _work_ext = os.path.splitext(_work)[1].lower()
     _wanted_ext = _work_ext
     _image_ext = os.path.splitext(_image)[1].lower()
+    mimetypes = lazy_module("mimetypes")
     mimetypes.init()
     _mime = "xxz/xxz-do-not-match"
     if len(_work_ext) != 0:
@@ -1863,11 +2095,7 @@ def media_converter_installed():  # -> bool
     elif bool(_extension_table.win_search("vlc", "vlc")):
         return True
     elif sys.version_info[0] > 2:
-        try:
-            dummy = bool(Gst)
-            return dummy
-        except NameError:
-            pass
+        return bool(gst_module())
     return False
 
 
@@ -2057,6 +2285,7 @@ def do_gst_parse_launch(_pipe=""):  # -> bool
     filesink_location = ""
     if "filesink location=" in _pipe:
         filesink_location = _pipe.rsplit("=", 1)[-1].replace('"', "")
+    Gst = gst_module()
     try:
         Gst.init(None)
         _player = Gst.parse_launch("{0}".format(_pipe))
@@ -2113,13 +2342,13 @@ def web_info_translate(
     """Opens a web browser with the text of the message and a local translation.
     Users of a sandboxed program can get a message."""
     try:
-        _web_text = urllib.parse.quote(_msg)
+        _web_text = urlparse.quote(_msg)
     except (AttributeError, NameError):
         _web_text = path2url(_msg).replace("file:///", "")
     try:
         if _language[:2] in ["en"]:
             _language = "es"
-        webbrowser.open_new(
+        lazy_module("webbrowser").open_new(
             "https://translate.google.com/?sl=auto&tl={0}&text={1}&op=translate".format(
                 _language, _web_text
             )
@@ -2273,6 +2502,7 @@ def sound_length_seconds(_work):  # -> int
     """
     _work_ext = os.path.splitext(_work)[1].lower()
     _return_value = 0
+    mimetypes = lazy_module("mimetypes")
     mimetypes.init()
     _mime = "xxz-xzz-no-match"
     if len(_work_ext) != 0:
@@ -3317,6 +3547,7 @@ def wav_to_media(
     if len(_dimensions) == 0:
         _dimensions = "600x600"
     # Check for mimetype extensions like `.aif` and `.aiff.`
+    mimetypes = lazy_module("mimetypes")
     mimetypes.init()
     try:
         _meta_data = ""
@@ -3792,8 +4023,10 @@ def path2url(_file_path):  # -> str
             return path.as_uri()
         return ""
     try:
-        return urlparse.urljoin("file:", urllib.pathname2url(abs_path))
-    except NameError:
+        return urlparse.urljoin(
+            "file:", lazy_module("urllib.request").pathname2url(abs_path)
+        )
+    except (AttributeError, NameError):
         # Fall back works on Posix
         return "file://{0}".format(abs_path.replace(" ", "%20"))
 
@@ -3871,6 +4104,238 @@ def uses_international_phonetic_alphabet(_str_test=""):  # -> bool
     return False
 
 
+class LexiconMatcher(object):
+    """
+    Replace the graphemes of a `*_lexicon.json` lexicon with their phonemes
+    or aliases in one pass over the text.
+
+    Like the lexicon rules, a grapheme matches its exact spelling or its
+    lower case spelling. Where graphemes overlap, the longest one at the
+    first position wins, and a replacement is not searched again.
+
+    The graphemes compile into one regular expression shaped like a trie,
+    so the search does not try each grapheme in turn at every position.
+    Example:
+        LexiconMatcher(data).sub("Read the XML file.")
+    """
+
+    def __init__(self, data=None):  # -> None
+        self.table = {}
+        for _item in data or {}:
+            _grapheme = data[_item]["g"]
+            if len(_grapheme) == 0 or any(
+                _skip in _grapheme
+                for _skip in [
+                    "$[LOCALE]",
+                    "$[REVISION]",
+                    "\\u0024[LOCALE]",
+                    "\\u0024[REVISION]",
+                ]
+            ):
+                continue
+            # The first rule for a spelling wins, like a replacement that
+            # leaves nothing for the later rules to find.
+            self.table.setdefault(_grapheme, data[_item]["p"])
+            self.table.setdefault(_grapheme.lower(), data[_item]["p"])
+        self.pattern = None
+        if self.table:
+            _trie = {}
+            for _grapheme in self.table:
+                _node = _trie
+                for _letter in _grapheme:
+                    _node = _node.setdefault(_letter, {})
+                _node[""] = True
+            self.pattern = re.compile(self._trie_pattern(_trie))
+
+    def _trie_pattern(self, node=None):  # -> str
+        """Return a pattern that matches the longest key in the trie `node`
+        first."""
+        _branches = [
+            re.escape(_letter) + self._trie_pattern(node[_letter])
+            for _letter in sorted(node)
+            if _letter
+        ]
+        if not _branches:
+            return ""
+        if len(_branches) == 1:
+            _pattern = _branches[0]
+            if "" in node:
+                return "(?:{0})?".format(_pattern)
+            return _pattern
+        _pattern = "(?:{0})".format("|".join(_branches))
+        if "" in node:
+            return "{0}?".format(_pattern)
+        return _pattern
+
+    def _replacement(self, match):  # -> str
+        return self.table[match.group(0)]
+
+    def sub(self, text=""):  # -> str
+        """Return `text` with every grapheme replaced."""
+        if self.pattern is None or len(text) == 0:
+            return text
+        return self.pattern.sub(self._replacement, text)
+
+
+class LexiconStore(object):
+    """
+    Find, read and compile `*_lexicon.json` files once for all the speech
+    engines in a process.
+
+    + `find` resolves the lexicon for an engine directory and a language
+      the first time, then remembers the answer.
+    + `load` keeps the text, the parsed lexicon and its `LexiconMatcher`
+      in memory. It also saves them in a compiled binary file next to the
+      lexicon, or in `user_cache_dir("lexicons")` if that directory is
+      read only, so the next process does not parse the JSON again. A
+      change in the size or modification time of the lexicon replaces
+      the compiled file.
+    + `stats` returns the hit and miss counters.
+    Example:
+        LEXICONS.load(LEXICONS.find("en-CA", "default")[0])
+    """
+
+    # Change the version when the compiled format changes.
+    version = 1
+
+    def __init__(self):  # -> None
+        self.paths = {}
+        self.lexicons = {}
+        self.counters = {
+            "find_hits": 0,
+            "find_misses": 0,
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+        }
+
+    def find(
+        self, iso_lang="en-CA", my_dir="default", my_env="SPEECH_USER_DIRECTORY"
+    ):  # -> list
+        """Return `[json_file, lang]` for the lexicon that applies to
+        `iso_lang` and the engine directory `my_dir`. `json_file` is `""`
+        if there is no lexicon, and `lang` is the language or the short
+        language code of the last file name tested."""
+        _user_dir = os.getenv(my_env) if my_env in os.environ else ""
+        _key = (iso_lang, my_dir, my_env, _user_dir)
+        _found = self.paths.get(_key)
+        if _found and (not _found[0] or os.path.isfile(_found[0])):
+            self.counters["find_hits"] += 1
+            return _found
+        self.counters["find_misses"] += 1
+        _imported_meta = ImportedMetaData()
+        if not _user_dir:
+            _user_dir = os.path.join(office_user_dir(), "config", "lexicons", my_dir)
+        _json_file = ""
+        for _lang in [iso_lang, iso_lang.split("-")[0].split("_")[0]]:
+            _test = _lang
+            _os_sep = os.sep
+            _json_search1 = app_icon_image(
+                "{0}_lexicon.json".format(_test), "po{0}{1}".format(_os_sep, my_dir)
+            )
+            _json_search2 = os.path.join(_user_dir, "{0}_lexicon.json".format(_test))
+            _json_search3 = os.path.join(
+                _imported_meta.custom_lexicon_path(),
+                my_dir,
+                "{0}_lexicon.json".format(_test),
+            )
+            for _json_search in [_json_search3, _json_search2, _json_search1]:
+                if len(_json_search) != 0 and os.path.isfile(_json_search):
+                    _json_file = _json_search
+                    break
+            if len(_json_file) != 0:
+                break
+        self.paths[_key] = [_json_file, _test]
+        return self.paths[_key]
+
+    def compiled_file(self, json_file=""):  # -> str
+        """Return the path of the compiled copy of `json_file`. A user
+        lexicon keeps it in the same directory. The extension directory is
+        read only, so its lexicons use the cache directory."""
+        _dir, _name = os.path.split(os.path.realpath(json_file))
+        _app_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+        if _dir.startswith(_app_dir + os.sep) or not os.access(_dir, os.W_OK):
+            _dir = user_cache_dir("lexicons")
+            if not _dir:
+                return ""
+            _name = "{0}-{1}".format(
+                hashlib.sha1(json_file.encode("utf-8", "replace")).hexdigest()[:16],
+                _name,
+            )
+        return os.path.join(_dir, ".{0}.bin".format(_name))
+
+    def _read_compiled(self, json_file="", stamp=None):  # -> list
+        _compiled = self.compiled_file(json_file)
+        if not _compiled or not os.path.isfile(_compiled):
+            return []
+        try:
+            with open(_compiled, "rb") as _handle:
+                _saved = marshal.load(_handle)
+            if _saved["header"] != [self.version, sys.hexversion, json_file] + stamp:
+                return []
+            _matcher = LexiconMatcher()
+            _matcher.table = _saved["table"]
+            if _saved["pattern"]:
+                _matcher.pattern = re.compile(_saved["pattern"])
+            return [_saved["content"], _saved["data"], _matcher]
+        except (EOFError, IOError, OSError, KeyError, TypeError, ValueError, re.error):
+            return []
+
+    def _write_compiled(self, json_file="", stamp=None, entry=None):  # -> bool
+        _compiled = self.compiled_file(json_file)
+        if not _compiled:
+            return False
+        _content, data, _matcher = entry
+        _saved = {
+            "header": [self.version, sys.hexversion, json_file] + stamp,
+            "content": _content,
+            "data": data,
+            "table": _matcher.table,
+            "pattern": _matcher.pattern.pattern if _matcher.pattern else "",
+        }
+        try:
+            _handle, _temp = tempfile.mkstemp(
+                prefix=".part-", dir=os.path.dirname(_compiled)
+            )
+            with os.fdopen(_handle, "wb") as _out:
+                marshal.dump(_saved, _out)
+            os.replace(_temp, _compiled)
+            return True
+        except (IOError, OSError, ValueError):
+            return False
+
+    def load(self, json_file=""):  # -> list
+        """Return `[content, data, matcher]` for a `*_lexicon.json` file: the
+        text, the parsed lexicon and a `LexiconMatcher`."""
+        _stat = os.stat(json_file)
+        _stamp = [_stat.st_size, _stat.st_mtime_ns]
+        _cached = self.lexicons.get(json_file)
+        if _cached and _cached[0] == _stamp:
+            self.counters["hits"] += 1
+            return _cached[1:]
+        _entry = self._read_compiled(json_file, _stamp)
+        if _entry:
+            self.counters["disk_hits"] += 1
+        else:
+            self.counters["misses"] += 1
+            with io.open(
+                json_file, mode="r", encoding="utf-8", errors="replace"
+            ) as file_obj:
+                _content = file_obj.read()
+            data = json.loads(_content)
+            _entry = [_content, data, LexiconMatcher(data)]
+            self._write_compiled(json_file, _stamp, _entry)
+        self.lexicons[json_file] = [_stamp] + _entry
+        return _entry
+
+    def stats(self):  # -> dict
+        """Return a copy of the hit and miss counters."""
+        return dict(self.counters)
+
+
+LEXICONS = LexiconStore()
+
+
 def local_pronunciation(
     iso_lang="en-CA",
     text="",
@@ -3886,34 +4351,12 @@ def local_pronunciation(
     transliterations with a correct and concise format, otherwise returns
     `''`. It's normally `False` to reduce extra processing.
     """
-    _json_file = ""
     _json_text = ""
     _pls_text = ""
     _json_tools = JsonTools()
-    _imported_meta = ImportedMetaData()
     _used_graphemes = [""]
     _good_list = []
-    _user_dir = os.path.join(office_user_dir(), "config", "lexicons", my_dir)
-    if my_env in os.environ:
-        _user_dir = os.getenv(my_env)
-    for _lang in [iso_lang, iso_lang.split("-")[0].split("_")[0]]:
-        _test = _lang
-        _os_sep = os.sep
-        _json_search1 = app_icon_image(
-            "{0}_lexicon.json".format(_test), "po{0}{1}".format(_os_sep, my_dir)
-        )
-        _json_search2 = os.path.join(_user_dir, "{0}_lexicon.json".format(_test))
-        _json_search3 = os.path.join(
-            _imported_meta.custom_lexicon_path(),
-            my_dir,
-            "{0}_lexicon.json".format(_test),
-        )
-        for _json_search in [_json_search3, _json_search2, _json_search1]:
-            if len(_json_search) != 0 and os.path.isfile(_json_search):
-                _json_file = _json_search
-                break
-        if len(_json_file) != 0:
-            break
+    _json_file, _test = LEXICONS.find(iso_lang, my_dir, my_env)
     if len(_json_file) == 0:
         print(
             """NOTE: Did not edit the text because no `{0}_lexicon.json`
@@ -3924,40 +4367,34 @@ file for `{1}` was found.""".format(
         return [text, _json_text]
     _date = time.strftime("%Y-%m-%d_%H:%M:%S")
     try:
-        data = None
-        with io.open(
-            _json_file, mode="r", encoding="utf-8", errors="replace"
-        ) as file_obj:
-            _content = file_obj.read()
-            data = json.loads(_content)
-            l_text = text.lower()
-            if data:
-                if is_dev:
-                    # return json with standard formatting and
-                    # removing duplicate graphemes in list item
-                    _xml_transform = XmlTransform()
-                    _count_j = 0
-                    _json_text = "{\n"
-                    _footnotes = [
-                        '    "{0}_99998":{{"g":"$[LOCALE]","p":"{1}"}},'.format(
-                            _test, _test
-                        ),
-                        '    "{0}_99999":{{"g":"$[REVISION]","p":"{1}"}}'.format(
-                            _test, _date
-                        ),
-                        "}",
-                        "",
-                    ]
-                    do_ipa_test = uses_international_phonetic_alphabet(_content)
-                    _note = "Phonemic alphabet: {0}".format(_phonemic_alphabet)
-                    if len(_phonemic_alphabet) == 0:
-                        if do_ipa_test:
-                            _note = "https://en.wikipedia.org/wiki/International_Phonetic_Alphabet"
-                            _phonemic_alphabet = "ipa"
-                        else:
-                            _note = "https://en.wikipedia.org/wiki/X-SAMPA"
-                            _phonemic_alphabet = "x-sampa"
-                    _pls_text = """<?xml version="1.0" encoding="UTF-8"?>
+        _content, data, _matcher = LEXICONS.load(_json_file)
+        if data:
+            if is_dev:
+                # return json with standard formatting and
+                # removing duplicate graphemes in list item
+                _xml_transform = XmlTransform()
+                _count_j = 0
+                _json_text = "{\n"
+                _footnotes = [
+                    '    "{0}_99998":{{"g":"$[LOCALE]","p":"{1}"}},'.format(
+                        _test, _test
+                    ),
+                    '    "{0}_99999":{{"g":"$[REVISION]","p":"{1}"}}'.format(
+                        _test, _date
+                    ),
+                    "}",
+                    "",
+                ]
+                do_ipa_test = uses_international_phonetic_alphabet(_content)
+                _note = "Phonemic alphabet: {0}".format(_phonemic_alphabet)
+                if len(_phonemic_alphabet) == 0:
+                    if do_ipa_test:
+                        _note = "https://en.wikipedia.org/wiki/International_Phonetic_Alphabet"
+                        _phonemic_alphabet = "ipa"
+                    else:
+                        _note = "https://en.wikipedia.org/wiki/X-SAMPA"
+                        _phonemic_alphabet = "x-sampa"
+                _pls_text = """<?xml version="1.0" encoding="UTF-8"?>
 <lexicon version="1.0"
 \txmlns="http://www.w3.org/2005/01/pronunciation-lexicon"
 \txmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
@@ -3965,118 +4402,93 @@ file for `{1}` was found.""".format(
 \talphabet="{0}" xml:lang="{1}">
 <!-- REVISION: {2}
 {3} -->""".format(
-                        _phonemic_alphabet, iso_lang, _date, _note
+                    _phonemic_alphabet, iso_lang, _date, _note
+                )
+                _u007b = "{"
+                _u0070 = "}"
+                for _item in data:
+                    _grapheme = _json_tools.sanitize_json(data[_item]["g"])
+                    _phoneme = _json_tools.sanitize_json(data[_item]["p"])
+                    if len(_grapheme) == 0:
+                        continue
+                    if data[_item]["g"] in [
+                        data[_item]["g"].upper(),
+                        data[_item]["g"].capitalize(),
+                    ]:
+                        test_item = data[_item]["g"]
+                    else:
+                        # Where possible, avoid invisible duplications
+                        # <https://docs.python.org/3/howto/unicode.htmls>
+                        try:
+                            test_item = data[_item]["g"].casefold()
+                        except (AttributeError, SyntaxError):
+                            test_item = data[_item]["g"].lower()
+                    if (
+                        "$[" in _grapheme
+                        or "\\u0024[" in _grapheme
+                        or test_item in _used_graphemes
+                        or len(_phoneme) == 0
+                    ):
+                        continue
+                    _used_graphemes.append(test_item)
+                    _good_list.append(
+                        '":{0}"g":"{1}","p":"{2}"{3},'.format(
+                            _u007b, _grapheme, _phoneme, _u0070
+                        )
                     )
-                    _u007b = "{"
-                    _u0070 = "}"
-                    for _item in data:
-                        _grapheme = _json_tools.sanitize_json(data[_item]["g"])
-                        _phoneme = _json_tools.sanitize_json(data[_item]["p"])
-                        if len(_grapheme) == 0:
-                            continue
-                        if data[_item]["g"] in [
-                            data[_item]["g"].upper(),
-                            data[_item]["g"].capitalize(),
-                        ]:
-                            test_item = data[_item]["g"]
-                        else:
-                            # Where possible, avoid invisible duplications
-                            # <https://docs.python.org/3/howto/unicode.htmls>
-                            try:
-                                test_item = data[_item]["g"].casefold()
-                            except (AttributeError, SyntaxError):
-                                test_item = data[_item]["g"].lower()
-                        if (
-                            "$[" in _grapheme
-                            or "\\u0024[" in _grapheme
-                            or test_item in _used_graphemes
-                            or len(_phoneme) == 0
+                    _grapheme = _xml_transform.clean_for_xml(data[_item]["g"])
+                    _alias = _xml_transform.clean_for_xml(data[_item]["p"])
+                    # W3C -> World Wide Web Consortium
+                    _apre = "</grapheme>\n\t\t<alias>"
+                    _apost = "</alias>\n\t</lexeme>"
+                    if do_ipa_test:
+                        if (_alias.startswith("[") and _alias.endswith("]")) or (
+                            _alias.startswith("/") and _alias.endswith("/")
                         ):
-                            continue
-                        _used_graphemes.append(test_item)
-                        _good_list.append(
-                            '":{0}"g":"{1}","p":"{2}"{3},'.format(
-                                _u007b, _grapheme, _phoneme, _u0070
-                            )
-                        )
-                        _grapheme = _xml_transform.clean_for_xml(data[_item]["g"])
-                        _alias = _xml_transform.clean_for_xml(data[_item]["p"])
-                        # W3C -> World Wide Web Consortium
-                        _apre = "</grapheme>\n\t\t<alias>"
-                        _apost = "</alias>\n\t</lexeme>"
-                        if do_ipa_test:
-                            if (_alias.startswith("[") and _alias.endswith("]")) or (
-                                _alias.startswith("/") and _alias.endswith("/")
-                            ):
-                                # IPA or X-SAMPA
-                                # said -> [sed] or said -> /sed/
-                                _alias = _alias[:-1][1:]
-                                _apre = "</grapheme>\n\t\t<phoneme>"
-                                _apost = "</phoneme>\n\t</lexeme>"
-                                do_ipa_test = False
-                        if do_ipa_test:
-                            if any(
-                                uses_international_phonetic_alphabet(_letter)
-                                for _letter in _alias
-                            ):
-                                # W3C -> wɝːld waɪd web kənˈsɔːr.ʃəm
-                                _apre = "</grapheme>\n\t\t<phoneme>"
-                                _apost = "</phoneme>\n\t</lexeme>"
-                        _pls_text = "{0}{1}{2}{3}{4}{5}".format(
-                            _pls_text,
-                            "\n\t<lexeme>\n\t\t<grapheme>",
-                            _grapheme,
-                            _apre,
-                            _alias,
-                            _apost,
-                        )
-                    _good_list = sorted(sorted(_good_list), key=len)
-                    _pls_text = "{0}{1}".format(_pls_text, "\n</lexicon>\n")
-                    for _item in _good_list:
-                        _count_j += 1
-                        _json_text = "{0}{1}{2}{3}{4}{5}{6}".format(
-                            _json_text,
-                            '    "',
-                            _test,
-                            "_",
-                            prefix_ohs(_count_j, 5, "0"),
-                            _item,
-                            "\n",
-                        )
-                    for _addenda in _footnotes:
-                        _json_text = "{0}{1}{2}".format(_json_text, _addenda, "\n")
-                        if _verbose:
-                            try:
-                                print("\n{0}".format(_json_text))
-                            except UnicodeEncodeError:
-                                pass
-            _len_text3 = len(text) * 3
-            try:
-                if _len_text3 > sys.maxsize / 2:
-                    _len_text3 = sys.maxsize / 2
-            except [AttributeError, NameError]:
-                _len_text3 = 1073741823
-            for _item in data:
-                if len(data[_item]["g"]) == 0:
-                    continue
-                elif len(text) == 0:
-                    break
-                elif len(text) > _len_text3:
-                    print(memory_warning())
-                    break
-                for _skip in [
-                    "$[LOCALE]",
-                    "$[REVISION]",
-                    "\\u0024[LOCALE]",
-                    "\\u0024[REVISION]",
-                ]:
-                    if _skip in data[_item]["g"]:
-                        continue
-                grapheme = data[_item]["g"].lower()
-                if l_text.count(grapheme) != 0 or "]" in grapheme:
-                    text = text.replace(data[_item]["g"], data[_item]["p"]).replace(
-                        grapheme, data[_item]["p"]
+                            # IPA or X-SAMPA
+                            # said -> [sed] or said -> /sed/
+                            _alias = _alias[:-1][1:]
+                            _apre = "</grapheme>\n\t\t<phoneme>"
+                            _apost = "</phoneme>\n\t</lexeme>"
+                            do_ipa_test = False
+                    if do_ipa_test:
+                        if any(
+                            uses_international_phonetic_alphabet(_letter)
+                            for _letter in _alias
+                        ):
+                            # W3C -> wɝːld waɪd web kənˈsɔːr.ʃəm
+                            _apre = "</grapheme>\n\t\t<phoneme>"
+                            _apost = "</phoneme>\n\t</lexeme>"
+                    _pls_text = "{0}{1}{2}{3}{4}{5}".format(
+                        _pls_text,
+                        "\n\t<lexeme>\n\t\t<grapheme>",
+                        _grapheme,
+                        _apre,
+                        _alias,
+                        _apost,
+                    )
+                _good_list = sorted(sorted(_good_list), key=len)
+                _pls_text = "{0}{1}".format(_pls_text, "\n</lexicon>\n")
+                for _item in _good_list:
+                    _count_j += 1
+                    _json_text = "{0}{1}{2}{3}{4}{5}{6}".format(
+                        _json_text,
+                        '    "',
+                        _test,
+                        "_",
+                        prefix_ohs(_count_j, 5, "0"),
+                        _item,
+                        "\n",
                     )
+                for _addenda in _footnotes:
+                    _json_text = "{0}{1}{2}".format(_json_text, _addenda, "\n")
+                    if _verbose:
+                        try:
+                            print("\n{0}".format(_json_text))
+                        except UnicodeEncodeError:
+                            pass
+        # One pass replaces every grapheme in the lexicon.
+        text = _matcher.sub(text)
     except KeyError as e:
         _pls_text = ""
         print(
@@ -4119,7 +4531,7 @@ def pipewire_supported():  # -> bool
     # Check that the distribution works with .mp3 before adding to the list.
     if os.name != "posix":
         return False
-    if "/app/bin:/usr/bin" in os.environ["PATH"]:
+    if "/app/bin:/usr/bin" in os.getenv("PATH", ""):
         # 2025.05.18
         # LibreOffice (Flatpak) Version: 25.2.2.2 (X86_64) / LibreOffice Community
         # ...
@@ -4200,7 +4612,7 @@ class PosixAudioPlayers(object):
         _vlc_out = """ --meta-title "[ > ] vlc" --audio-visual visualizer --effect-list spectrometer %(uri_path)s vlc://quit """
         try:
             # If system command `killall` is available, then hide the player window UI.
-            if os.system("command -v killall > /dev/null") == 0:
+            if have_posix_app("killall", False):
                 if not "/app/bin:/usr/bin" in os.environ["PATH"]:
                     _ffplay_out = """ -autoexit -hide_banner -loglevel info -nostats -nodisp "%(file_path)s" """
                 _vlc_out = " --intf dummy %(uri_path)s vlc://quit "
@@ -4277,6 +4689,197 @@ class PosixAudioPlayers(object):
         return ""
 
 
+class PcmPlaybackSink(object):
+    """Play successive `.wav` chunks through one long-lived player process
+    that reads raw PCM on `stdin`, so there are no gaps between chunks and
+    no new process for each sentence.
+
+    Example:
+        `_sink = PcmPlaybackSink()`
+        `for _chunk in _chunks:`
+        `    if not _sink.play_wav(_chunk, get_my_lock("lock")):`
+        `        play_wav_no_ui(_chunk)`
+        `_sink.close()`
+    """
+
+    def __init__(self):  # -> None
+        """Players that can read 16 bit signed little endian audio on
+        `stdin`, in order of preference."""
+        self.raw_players = [
+            [
+                "pw-cat",
+                "--playback --rate %(rate)s --channels %(channels)s --format s16 -",
+            ],
+            [
+                "paplay",
+                "--playback --raw --rate %(rate)s --channels %(channels)s --format s16le",
+            ],
+            ["aplay", "-q -t raw -f S16_LE -r %(rate)s -c %(channels)s -"],
+            [
+                "play",
+                "-q -t raw -r %(rate)s -c %(channels)s -b 16 -e signed-integer -",
+            ],
+            [
+                "ffplay",
+                " ".join(
+                    [
+                        "-autoexit -nodisp -hide_banner -loglevel quiet",
+                        "-f s16le -ar %(rate)s -ac %(channels)s -i -",
+                    ]
+                ),
+            ],
+        ]
+        # `pipewire_supported()` runs `pw-cat`, so wait until a player is
+        # needed.
+        self.pipewire_checked = False
+        self.process = None
+        self.rate = 0
+        self.channels = 0
+        self.app = ""
+        self.block_seconds = 0.25
+
+    def player_command(self, rate=22050, channels=1):  # -> list
+        """Return the arguments for the first raw audio player on the system,
+        or `[]` if there is none."""
+        if os.name != "posix":
+            return []
+        if not self.pipewire_checked:
+            self.pipewire_checked = True
+            if not pipewire_supported():
+                self.raw_players = self.raw_players[1:]
+        for _app, _args in self.raw_players:
+            if have_posix_app(_app, False):
+                self.app = _app
+                return [_app] + (_args % locals()).split()
+        return []
+
+    def running(self):  # -> bool
+        """Is the player process still accepting audio?"""
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, rate=22050, channels=1):  # -> bool
+        """Start a player for `rate` and `channels`. If a player is
+        running with other settings, let it finish and start a new one."""
+        if self.running() and (rate, channels) == (self.rate, self.channels):
+            return True
+        self.close()
+        _command = self.player_command(rate, channels)
+        if not _command:
+            return False
+        try:
+            self.process = subprocess.Popen(
+                _command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except (NameError, OSError, ValueError):
+            self.process = None
+            return False
+        self.rate = rate
+        self.channels = channels
+        return True
+
+    def play_wav(self, file_path="", lock_path=""):  # -> bool
+        """Send the frames of the 16 bit `.wav` file `file_path` to the
+        player. If `lock_path` is set and the file disappears, stop at once.
+        Returns `False` if the sink cannot play the file, so the caller can
+        use another player."""
+        try:
+            with wave.open(file_path, "rb") as _wav:
+                if _wav.getsampwidth() != 2 or _wav.getcomptype() != "NONE":
+                    return False
+                if not self.start(_wav.getframerate(), _wav.getnchannels()):
+                    return False
+                _block = max(1, int(self.rate * self.block_seconds))
+                print(
+                    "[>] {0} playing `{1}`".format(
+                        self.app, os.path.basename(file_path)
+                    )
+                )
+                return self.play_pcm(
+                    iter(lambda: _wav.readframes(_block), b""),
+                    self.rate,
+                    self.channels,
+                    lock_path,
+                )
+        except (EOFError, NameError, OSError, wave.Error):
+            return False
+
+    def play_pcm(self, blocks=None, rate=22050, channels=1, lock_path=""):  # -> bool
+        """Send each block of 16 bit signed little endian audio in the
+        iterable `blocks` to the player as soon as it arrives. If
+        `lock_path` is set and the file disappears, stop at once. Returns
+        `False` if the sink has no player for the audio."""
+        if not self.start(rate, channels):
+            return False
+        _writing = threading.Event()
+        _writing.set()
+        if lock_path:
+            # A write blocks while the pipe is full, so watch the lock
+            # from another thread and kill the player to stop at once.
+            threading.Thread(
+                target=self._watch_lock,
+                args=(lock_path, _writing, self.process),
+                daemon=True,
+            ).start()
+        try:
+            for _frames in blocks:
+                if lock_path and not os.path.isfile(lock_path):
+                    break
+                self.process.stdin.write(_frames)
+            self.process.stdin.flush()
+        except (AttributeError, BrokenPipeError, ValueError):
+            # The player quit. If someone stopped it, the audio is done.
+            self.stop()
+            return bool(lock_path) and not os.path.isfile(lock_path)
+        finally:
+            _writing.clear()
+        if lock_path and not os.path.isfile(lock_path):
+            self.stop()
+        return True
+
+    def _watch_lock(self, lock_path="", writing=None, process=None):  # -> None
+        """While `writing` is set, kill `process` if `lock_path` goes away."""
+        while writing.is_set():
+            if not os.path.isfile(lock_path):
+                try:
+                    process.kill()
+                except OSError:
+                    pass
+                return
+            time.sleep(0.1)
+
+    def stop(self):  # -> None
+        """Stop playing immediately and discard the buffered audio."""
+        _process = self.process
+        self.process = None
+        if _process is None:
+            return
+        try:
+            _process.kill()
+            _process.wait()
+        except OSError:
+            pass
+        try:
+            _process.stdin.close()
+        except (BrokenPipeError, OSError, ValueError):
+            pass
+
+    def close(self):  # -> None
+        """Let the player finish the audio that it has, then end it."""
+        _process = self.process
+        self.process = None
+        if _process is None:
+            return
+        try:
+            _process.stdin.close()
+            _process.wait()
+        except (BrokenPipeError, OSError, ValueError):
+            self.process = _process
+            self.stop()
+
+
 def show_and_play(_command="", a_app="", display_file="", file_path=""):  # -> bool
     """Print the play status and play an audio file"""
     if len(_command) != 0:
@@ -4373,7 +4976,7 @@ def play_wav_no_ui(file_path=""):  # -> bool
                 return False
             uri_path = path2url(file_path)
             try:
-                if bool(Gst):
+                if bool(gst_module()):
                     _pipe = 'playbin uri="{0}" '.format(uri_path)
                     do_gst_parse_launch(_pipe)
             except NameError:
@@ -4383,7 +4986,7 @@ def play_wav_no_ui(file_path=""):  # -> bool
                     print(
                         "[>] {0} (default) is playing `{1}`".format(a_app, display_file)
                     )
-                    webbrowser.open(uri_path)
+                    lazy_module("webbrowser").open(uri_path)
                     # Sleep to stop the player from closing midsentence.
                     calculated_pause = sound_length_seconds(file_path)
                     if calculated_pause < (1.5):
@@ -4432,12 +5035,85 @@ def handle_sound_playing(_media_work="", lock="lock"):  # -> bool
     return False
 
 
+def import_time_benchmark(
+    module_name="readtexttools", budget_ms=IMPORT_TIME_BUDGET_MS, runs=5
+):  # -> bool
+    """
+    Import `module_name` in `runs` new python processes with
+    `python -X importtime`, print the slowest imports of the fastest run,
+    and return `True` if the fastest run takes no more than `budget_ms`
+    milliseconds.
+    Example:
+        import_time_benchmark("network_read_text_file", 150)
+    """
+    _env = dict(os.environ)
+    # The first run writes the byte code, so the timed runs do not compile.
+    _env.pop("PYTHONDONTWRITEBYTECODE", None)
+    _command = [
+        sys.executable,
+        "-X",
+        "importtime",
+        "-c",
+        "import {0}".format(module_name),
+    ]
+    _best = None
+    _best_rows = []
+    for _run in range(runs + 1):
+        _result = subprocess.run(
+            _command,
+            cwd=os.path.dirname(os.path.realpath(__file__)),
+            env=_env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        _rows = []
+        for _line in _result.stderr.splitlines():
+            _parts = _line.split("|")
+            if len(_parts) != 3 or not _parts[0].startswith("import time:"):
+                continue
+            try:
+                _rows.append(
+                    (int(_parts[0].split(":")[1]), int(_parts[1]), _parts[2].strip())
+                )
+            except ValueError:
+                # Column headings
+                continue
+        if _run == 0 or not _rows or _result.returncode != 0:
+            continue
+        if _best is None or _rows[-1][1] < _best:
+            _best = _rows[-1][1]
+            _best_rows = _rows
+    if _best is None:
+        print("Could not import `{0}`".format(module_name))
+        return False
+    print("| Self (ms) | Total (ms) | Module |\n|----------:|-----------:|--------|")
+    for _self, _total, _name in sorted(_best_rows, reverse=True)[:12]:
+        print(
+            "| {0:9.1f} | {1:10.1f} | {2} |".format(_self / 1000, _total / 1000, _name)
+        )
+    _ms = _best / 1000.0
+    print(
+        "\n`import {0}`: {1:.1f} ms (budget {2:.1f} ms)".format(
+            module_name, _ms, budget_ms
+        )
+    )
+    return _ms <= budget_ms
+
+
 def main():  # -> NoReturn
     """
     Converts the input wav sound to another format.  Ffmpeg
     can include a still frame movie if you include an image.
     """
     print()
+    if "--importtime" in sys.argv[1:]:
+        _args = sys.argv[sys.argv.index("--importtime") + 1 :]
+        _budget = IMPORT_TIME_BUDGET_MS
+        if len(_args) > 1:
+            _budget = float(_args[1])
+        _module = _args[0] if _args else "readtexttools"
+        sys.exit(0 if import_time_benchmark(_module, _budget) else 1)
     if sys.argv[-1] == sys.argv[0]:
         usage()
         sys.exit(0)
@@ -633,13 +633,12 @@ class SpdFormats(object):
             self.client.close()
             readtexttools.unlock_my_lock()
             return ""
-        concise_lang = language.split("-")[0].split("_")[0].lower()
-        _txt = readtexttools.strip_xml(_txt)
-        _txt = readtexttools.strip_mojibake(concise_lang, _txt)
-        _txt = readtexttools.local_pronunciation(
-            language, _txt, "default", "SPEECH_USER_DIRECTORY", False
-        )[0]
-        return _txt
+        return netcommon.text_pipeline(
+            language,
+            ["xml", "mojibake", "lexicon"],
+            "default",
+            "SPEECH_USER_DIRECTORY",
+        ).run(_txt)
 
     def is_a_supported_language(self, _lang="en", experimental=False):  # -> Bool
         """Verify that your installed speech synthesisers are *registered* with